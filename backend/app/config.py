@@ -40,6 +40,11 @@ class Settings:
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    refresh_token_expire_days: int
+    jwt_cache_size: int  # verified tokens kept in memory (0 = disabled)
+    bcrypt_rounds: int  # work factor; older hashes are upgraded on login
+    bcrypt_workers: int  # dedicated hashing threads
+    bcrypt_queue: int  # hashes waiting for a thread before 503
     log_level: str  # NEW
 
 
@@ -64,5 +69,10 @@ settings = Settings(
     secret_key=_secret,
     algorithm=_env("ALGORITHM", "HS256") or "HS256",
     access_token_expire_minutes=_env_int("ACCESS_TOKEN_EXPIRE_MINUTES", 30),
+    refresh_token_expire_days=max(_env_int("REFRESH_TOKEN_EXPIRE_DAYS", 14), 1),
+    jwt_cache_size=max(_env_int("JWT_CACHE_SIZE", 1024), 0),
+    bcrypt_rounds=min(max(_env_int("BCRYPT_ROUNDS", 12), 4), 31),
+    bcrypt_workers=max(_env_int("BCRYPT_WORKERS", min(4, os.cpu_count() or 1)), 1),
+    bcrypt_queue=max(_env_int("BCRYPT_QUEUE", 16), 0),
     log_level=_effective_log_level,
 )
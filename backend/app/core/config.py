@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import re
+import tempfile
 from dataclasses import dataclass
 from functools import lru_cache
 from typing import Tuple
@@ -16,12 +18,134 @@ class Settings:
     env: str
     database_url: str
     allowed_origins: Tuple[str, ...]
+    # Public feeds (/feeds/*): frontend base URL used for item links, public URL of the
+    # feeds themselves (JSON Feed "feed_url", SITE_URL + "/feeds" by default), and max age
+    # of a generated feed (bounds staleness on workers that did not handle the write).
+    site_url: str = "http://localhost:5173"
+    feeds_url: str = "http://localhost:5173/feeds"
+    feeds_max_age_seconds: int = 300
+    # Async request path (DATABASE_ASYNC=1): AsyncSession on asyncpg / aiosqlite.
+    database_async: bool = False
+    # Read replicas (optional): GET routes read from these, writes go to DATABASE_URL.
+    database_read_urls: Tuple[str, ...] = ()
+    replica_selection: str = "round_robin"  # round_robin | least_connections
+    replica_retry_seconds: int = 30  # a failed replica is skipped for this long
+    read_your_writes_seconds: int = 10  # reads pinned to the primary after a write
+    # Connection pool (per engine, per worker process)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a connection before failing
+    db_pool_recycle: int = 1800  # seconds; replace connections older than this
+    db_pool_pre_ping: bool = False  # ping on every checkout (one extra round trip)
+    db_pool_idle_check_seconds: int = 30  # otherwise ping only connections idle longer than this
+    # Per-request SQL instrumentation: warn when a request runs more than SQL_QUERY_BUDGET
+    # statements (0 = no budget), or fail it in strict mode (tests); warn when one statement
+    # repeats SQL_REPEAT_THRESHOLD times in a request (N+1).
+    sql_query_budget: int = 0
+    sql_query_budget_strict: bool = False
+    sql_repeat_threshold: int = 10
+    # GET /metrics (Prometheus): with several workers, each one writes its snapshot to
+    # METRICS_DIR every METRICS_FLUSH_SECONDS and a scrape merges them. Empty: single process.
+    metrics_dir: str = ""
+    metrics_flush_seconds: int = 5
+    # Bearer token required by GET /metrics (Prometheus `authorization`). Empty: endpoint disabled.
+    metrics_token: str = ""
+    # Slow-query log (GET /admin/slow-queries): statements slower than SLOW_QUERY_MS are stored
+    # with redacted parameters and their EXPLAIN plan, keeping the last SLOW_QUERY_KEEP. 0: off.
+    slow_query_ms: int = 0
+    slow_query_explain: bool = True
+    slow_query_keep: int = 10000
+    # Response cache of public GET lists (app.utils.response_cache): memory | redis | off
+    cache_backend: str = "memory"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_ttl_seconds: int = 300
+    cache_max_bytes: int = 64 * 1024 * 1024  # in-process backend, per worker
+    cache_max_entry_bytes: int = 1024 * 1024
+    # Cross-node invalidation of in-process caches (Postgres LISTEN/NOTIFY on this channel)
+    cache_notify: bool = True
+    cache_notify_channel: str = "cache_invalidation"
+    # Response compression (gzip, br): bodies of at least COMPRESSION_MIN_BYTES; from
+    # COMPRESSION_OFFLOAD_BYTES on, compressed in the threadpool instead of the event loop.
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_offload_bytes: int = 64 * 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    # POST /batch: max GET sub-requests per batch
+    batch_max_requests: int = 10
+    # Login rate limiter state: memory (per process) | mmap (same-host workers) | postgres | redis
+    login_limiter_backend: str = "memory"
+    login_limiter_max_keys: int = 100_000
+    login_limiter_mmap_path: str = ""
+    login_limiter_mmap_slots: int = 65536
+    login_limiter_redis_url: str = "redis://localhost:6379/0"
+    # Token buckets on public reads, per client IP and route class (0 = disabled)
+    rate_limit_per_minute: int = 0
+    rate_limit_burst: int = 60
+    rate_limit_costs: Tuple[Tuple[str, int], ...] = (("search", 5), ("list", 2), ("item", 1))
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    v = (os.getenv(name, "") or "").strip().lower()
+    if not v:
+        return default
+    return v in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _parse_list(value: str) -> Tuple[str, ...]:
+    items = [s.strip() for s in (value or "").split(",")]
+    return tuple([s for s in items if s])
 
 
 def _parse_origins(value: str) -> Tuple[str, ...]:
     # Comma-separated list: "http://localhost:3000,http://127.0.0.1:3000"
-    items = [s.strip() for s in (value or "").split(",")]
-    return tuple([s for s in items if s])
+    return _parse_list(value)
+
+
+def _parse_replica_selection(value: str) -> str:
+    v = (value or "round_robin").strip().lower()
+    if v not in {"round_robin", "least_connections"}:
+        raise RuntimeError("REPLICA_SELECTION must be 'round_robin' or 'least_connections'")
+    return v
+
+
+def _parse_cache_backend(value: str) -> str:
+    v = (value or "memory").strip().lower()
+    if v not in {"memory", "redis", "off"}:
+        raise RuntimeError("CACHE_BACKEND must be 'memory', 'redis' or 'off'")
+    return v
+
+
+def _parse_login_limiter_backend(value: str) -> str:
+    v = (value or "memory").strip().lower()
+    if v not in {"memory", "mmap", "postgres", "redis"}:
+        raise RuntimeError("LOGIN_LIMITER_BACKEND must be 'memory', 'mmap', 'postgres' or 'redis'")
+    return v
+
+
+def _parse_rate_limit_costs(value: str) -> Tuple[Tuple[str, int], ...]:
+    costs = {"search": 5, "list": 2, "item": 1}
+    for part in _parse_list(value):
+        name, _, cost = part.partition("=")
+        name = name.strip().lower()
+        if name not in costs or not cost.strip().isdigit() or int(cost) < 1:
+            raise RuntimeError("RATE_LIMIT_COSTS must look like 'search=5,list=2,item=1'")
+        costs[name] = int(cost)
+    return tuple(costs.items())
+
+
+def _parse_channel(value: str) -> str:
+    v = (value or "cache_invalidation").strip()
+    if not re.fullmatch(r"[a-z_][a-z0-9_]{0,62}", v):
+        raise RuntimeError("CACHE_NOTIFY_CHANNEL must be a lowercase SQL identifier")
+    return v
 
 
 def _is_production(env: str) -> bool:
@@ -64,4 +188,53 @@ def get_settings() -> Settings:
     )
     _validate_origins(env, origins)
 
-    return Settings(env=env, database_url=database_url, allowed_origins=origins)
+    site_url = (os.getenv("SITE_URL", "") or "http://localhost:5173").strip().rstrip("/")
+    return Settings(
+        env=env,
+        database_url=database_url,
+        allowed_origins=origins,
+        site_url=site_url,
+        feeds_url=(os.getenv("FEEDS_URL", "") or f"{site_url}/feeds").strip().rstrip("/"),
+        feeds_max_age_seconds=_env_int("FEEDS_MAX_AGE_SECONDS", 300),
+        database_async=_env_bool("DATABASE_ASYNC"),
+        database_read_urls=_parse_list(os.getenv("DATABASE_READ_URLS", "")),
+        replica_selection=_parse_replica_selection(os.getenv("REPLICA_SELECTION", "")),
+        replica_retry_seconds=_env_int("REPLICA_RETRY_SECONDS", 30),
+        read_your_writes_seconds=_env_int("READ_YOUR_WRITES_SECONDS", 10),
+        db_pool_size=_env_int("DB_POOL_SIZE", 5),
+        db_max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        db_pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        db_pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING"),
+        db_pool_idle_check_seconds=_env_int("DB_POOL_IDLE_CHECK_SECONDS", 30),
+        sql_query_budget=_env_int("SQL_QUERY_BUDGET", 0),
+        sql_query_budget_strict=_env_bool("SQL_QUERY_BUDGET_STRICT"),
+        sql_repeat_threshold=_env_int("SQL_REPEAT_THRESHOLD", 10),
+        metrics_dir=(os.getenv("METRICS_DIR", "") or "").strip(),
+        metrics_flush_seconds=_env_int("METRICS_FLUSH_SECONDS", 5),
+        metrics_token=(os.getenv("METRICS_TOKEN", "") or "").strip(),
+        slow_query_ms=_env_int("SLOW_QUERY_MS", 0),
+        slow_query_explain=_env_bool("SLOW_QUERY_EXPLAIN", True),
+        slow_query_keep=_env_int("SLOW_QUERY_KEEP", 10000),
+        cache_backend=_parse_cache_backend(os.getenv("CACHE_BACKEND", "")),
+        cache_redis_url=(os.getenv("CACHE_REDIS_URL", "") or "redis://localhost:6379/0").strip(),
+        cache_ttl_seconds=_env_int("CACHE_TTL_SECONDS", 300),
+        cache_max_bytes=_env_int("CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        cache_max_entry_bytes=_env_int("CACHE_MAX_ENTRY_BYTES", 1024 * 1024),
+        cache_notify=_env_bool("CACHE_NOTIFY", True),
+        cache_notify_channel=_parse_channel(os.getenv("CACHE_NOTIFY_CHANNEL", "")),
+        compression_enabled=_env_bool("COMPRESSION_ENABLED", True),
+        compression_min_bytes=_env_int("COMPRESSION_MIN_BYTES", 1024),
+        compression_offload_bytes=_env_int("COMPRESSION_OFFLOAD_BYTES", 64 * 1024),
+        compression_gzip_level=min(max(_env_int("COMPRESSION_GZIP_LEVEL", 6), 1), 9),
+        compression_brotli_quality=min(max(_env_int("COMPRESSION_BROTLI_QUALITY", 5), 0), 11),
+        batch_max_requests=max(_env_int("BATCH_MAX_REQUESTS", 10), 1),
+        login_limiter_backend=_parse_login_limiter_backend(os.getenv("LOGIN_LIMITER_BACKEND", "")),
+        login_limiter_max_keys=max(_env_int("LOGIN_LIMITER_MAX_KEYS", 100_000), 1),
+        login_limiter_mmap_path=(os.getenv("LOGIN_LIMITER_MMAP_PATH", "") or os.path.join(tempfile.gettempdir(), "login_limiter.bin")).strip(),
+        login_limiter_mmap_slots=max(_env_int("LOGIN_LIMITER_MMAP_SLOTS", 65536), 64),
+        login_limiter_redis_url=(os.getenv("LOGIN_LIMITER_REDIS_URL", "") or os.getenv("CACHE_REDIS_URL", "") or "redis://localhost:6379/0").strip(),
+        rate_limit_per_minute=max(_env_int("RATE_LIMIT_PER_MINUTE", 0), 0),
+        rate_limit_burst=max(_env_int("RATE_LIMIT_BURST", 60), 1),
+        rate_limit_costs=_parse_rate_limit_costs(os.getenv("RATE_LIMIT_COSTS", "")),
+    )
@@ -1,12 +1,44 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from app.models import Article
 
 
-def list_articles(db: Session, *, skip: int, limit: int) -> list[Article]:
-    return db.query(Article).offset(skip).limit(limit).all()
+def list_articles(db: Session, *, skip: int, limit: int, columns: Sequence | None = None) -> list:
+    # columns: select only these (read-only rows instead of ORM objects)
+    query = db.query(*columns) if columns else db.query(Article)
+    return query.offset(skip).limit(limit).all()
+
+
+def list_articles_changed_since(
+    db: Session,
+    *,
+    since: datetime | None,
+    after: tuple[datetime, int] | None,
+    limit: int,
+) -> list[Article]:
+    # Keyset pagination on (updated_at, id): stable order, served by ix_articles_updated_at.
+    query = db.query(Article)
+    if since is not None:
+        query = query.filter(Article.updated_at > since)
+    if after is not None:
+        after_ts, after_id = after
+        query = query.filter(
+            or_(
+                Article.updated_at > after_ts,
+                and_(Article.updated_at == after_ts, Article.id > after_id),
+            )
+        )
+    return query.order_by(Article.updated_at.asc(), Article.id.asc()).limit(limit).all()
+
+
+def list_recent_articles(db: Session, *, limit: int) -> list[Article]:
+    return db.query(Article).order_by(Article.updated_at.desc(), Article.id.desc()).limit(limit).all()
 
 
 def get_article_by_id(db: Session, *, article_id: int) -> Article | None:
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 
 from app.models import Carte
 
 
-def list_cartes(db: Session, *, skip: int = 0, limit: int = 100) -> list[Carte]:
-    return db.query(Carte).order_by(Carte.id.asc()).offset(skip).limit(limit).all()
+def list_cartes(db: Session, *, skip: int = 0, limit: int = 100, columns: Sequence | None = None) -> list:
+    # columns: select only these (read-only rows instead of ORM objects)
+    query = db.query(*columns) if columns else db.query(Carte)
+    return query.order_by(Carte.id.asc()).offset(skip).limit(limit).all()
 
 
 def get_carte_by_id(db: Session, *, carte_id: int) -> Carte | None:
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models import Change
+
+
+def list_changes(db: Session, *, after: int, limit: int) -> list[Change]:
+    return (
+        db.query(Change)
+        .filter(Change.revision > after)
+        .order_by(Change.revision.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def last_change_at(db: Session, *, resource: str) -> datetime | None:
+    # Compaction keeps the latest entry of every row, so the maximum survives it
+    return db.query(func.max(Change.changed_at)).filter(Change.resource == resource).scalar()
+
+
+def delete_superseded(db: Session, *, resource: str, resource_id: int) -> None:
+    db.query(Change).filter(Change.resource == resource, Change.resource_id == resource_id).delete(
+        synchronize_session=False
+    )
+
+
+def notify(db: Session, *, channel: str, payload: str) -> None:
+    """Postgres NOTIFY, delivered to listeners only if/when the current transaction commits."""
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+def create_change(db: Session, *, payload: dict) -> Change:
+    obj = Change(**payload)
+    db.add(obj)
+    return obj
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import ColumnElement
 
@@ -17,7 +19,9 @@ def list_mots(
     limit: int,
     sort_col: ColumnElement,
     desc_order: bool,
+    columns: Sequence | None = None,
 ) -> dict:
+    # columns: select only these (read-only rows instead of ORM objects)
     query = db.query(Dictionnaire)
 
     # Exclude entries with empty mots_francais
@@ -36,7 +40,8 @@ def list_mots(
     query = query.order_by(sort_col.desc() if desc_order else sort_col.asc())
     
     total = query.count()
-    items = query.offset((page - 1) * limit).limit(limit).all()
+    rows = query.with_entities(*columns) if columns else query
+    items = rows.offset((page - 1) * limit).limit(limit).all()
     pages = (total + limit - 1) // limit if limit > 0 else 0
     
     return {
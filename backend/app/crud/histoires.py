@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 
 from app.models import Histoire
 
 
-def list_histoires(db: Session, *, offset: int, limit: int) -> list[Histoire]:
-    return db.query(Histoire).offset(offset).limit(limit).all()
+def list_histoires(db: Session, *, offset: int, limit: int, columns: Sequence | None = None) -> list:
+    # columns: select only these (read-only rows instead of ORM objects)
+    query = db.query(*columns) if columns else db.query(Histoire)
+    return query.offset(offset).limit(limit).all()
+
+
+def list_recent_histoires(db: Session, *, limit: int) -> list[Histoire]:
+    return db.query(Histoire).order_by(Histoire.id.desc()).limit(limit).all()
 
 
-def list_all_histoires(db: Session) -> list[Histoire]:
-    return db.query(Histoire).all()
+def list_all_histoires(db: Session, *, columns: Sequence | None = None) -> list:
+    query = db.query(*columns) if columns else db.query(Histoire)
+    return query.all()
 
 
 def get_histoire_by_id(db: Session, *, histoire_id: int) -> Histoire | None:
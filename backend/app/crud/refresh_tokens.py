@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models import RefreshToken
+
+
+def get_refresh_token_by_hash(db: Session, *, token_hash: str) -> RefreshToken | None:
+    return db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+
+
+def create_refresh_token(
+    db: Session, *, token_hash: str, username: str, family: str, expires_at: datetime
+) -> RefreshToken:
+    obj = RefreshToken(token_hash=token_hash, username=username, family=family, expires_at=expires_at)
+    db.add(obj)
+    return obj
+
+
+def revoke_refresh_token(db: Session, *, token_id: int, now: datetime) -> bool:
+    """Revoke if still active; False when another request revoked it first."""
+    updated = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == token_id, RefreshToken.revoked_at.is_(None))
+        .update({RefreshToken.revoked_at: now}, synchronize_session=False)
+    )
+    return updated == 1
+
+
+def revoke_refresh_family(db: Session, *, family: str, now: datetime) -> None:
+    db.query(RefreshToken).filter(RefreshToken.family == family, RefreshToken.revoked_at.is_(None)).update(
+        {RefreshToken.revoked_at: now}, synchronize_session=False
+    )
+
+
+def delete_expired_refresh_tokens(db: Session, *, username: str, now: datetime) -> None:
+    db.query(RefreshToken).filter(RefreshToken.username == username, RefreshToken.expires_at < now).delete(
+        synchronize_session=False
+    )
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import Revision
+
+
+def get_revisions(db: Session, *, resources: tuple[str, ...]) -> dict[str, int]:
+    rows = db.query(Revision.resource, Revision.revision).filter(Revision.resource.in_(resources)).all()
+    found = {r: int(v) for r, v in rows}
+    return {r: found.get(r, 0) for r in resources}
+
+
+def bump_revision(db: Session, *, resource: str) -> int:
+    # The UPDATE row lock is held until commit: concurrent writers of the same resource
+    # are serialized, so revisions are handed out in commit order.
+    new_value = db.execute(
+        update(Revision)
+        .where(Revision.resource == resource)
+        .values(revision=Revision.revision + 1)
+        .returning(Revision.revision)
+    ).scalar()
+    if new_value is None:
+        db.add(Revision(resource=resource, revision=1))
+        db.flush()
+        return 1
+    return int(new_value)
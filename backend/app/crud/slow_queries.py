@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import SlowQuery
+
+
+def create_slow_query(db: Session, *, payload: dict) -> SlowQuery:
+    obj = SlowQuery(**payload)
+    db.add(obj)
+    return obj
+
+
+def prune_slow_queries(db: Session, *, keep: int) -> int:
+    """Keep only the `keep` most recent entries (ids are increasing)."""
+    newest = db.query(func.max(SlowQuery.id)).scalar()
+    if newest is None:
+        return 0
+    return db.query(SlowQuery).filter(SlowQuery.id <= newest - keep).delete(synchronize_session=False)
+
+
+def top_slow_queries(db: Session, *, limit: int, since: Optional[datetime] = None) -> list:
+    """Per fingerprint: count, total/max/avg duration, last capture. Sorted by total time."""
+    total = func.sum(SlowQuery.duration_ms).label("total_ms")
+    q = db.query(
+        SlowQuery.fingerprint,
+        func.count(SlowQuery.id).label("calls"),
+        total,
+        func.max(SlowQuery.duration_ms).label("max_ms"),
+        func.avg(SlowQuery.duration_ms).label("avg_ms"),
+        func.max(SlowQuery.captured_at).label("last_seen"),
+        func.max(SlowQuery.id).label("last_id"),
+    )
+    if since is not None:
+        q = q.filter(SlowQuery.captured_at >= since)
+    return q.group_by(SlowQuery.fingerprint).order_by(total.desc()).limit(limit).all()
+
+
+def get_slow_queries_by_ids(db: Session, *, ids: list[int]) -> list[SlowQuery]:
+    if not ids:
+        return []
+    return db.query(SlowQuery).filter(SlowQuery.id.in_(ids)).all()
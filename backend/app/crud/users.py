@@ -13,3 +13,8 @@ def create_user(db: Session, *, username: str, hashed_password: str) -> User:
     obj = User(username=username, password=hashed_password)
     db.add(obj)
     return obj
+
+
+def update_user_password(db: Session, *, user: User, hashed_password: str) -> User:
+    user.password = hashed_password
+    return user
@@ -1,22 +1,297 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from fastapi import Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from app.core.config import get_settings
+from app.utils.db_pool import PoolStats, instrument_engine, pool_kwargs, pool_metrics, pool_status
+from app.utils.metrics import REGISTRY
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Every engine (primary, async, replicas) is built here so pool sizing, the idle-only
+# liveness check and pool metrics apply uniformly.
+_pools: list[tuple[Any, PoolStats]] = []
+
+
+def _instrument(sync_engine, name: str) -> None:
+    stats = instrument_engine(
+        sync_engine,
+        name=name,
+        idle_check_seconds=settings.db_pool_idle_check_seconds,
+        pre_ping=settings.db_pool_pre_ping,
+    )
+    _pools.append((sync_engine, stats))
+
+
+def make_engine(url: str, *, name: str):
+    eng = create_engine(url, future=True, **pool_kwargs(url, settings, use_async=False))
+    _instrument(eng, name)
+    return eng
+
+
+def make_async_engine(url: str, *, name: str):
+    async_url = async_database_url(url)
+    eng = create_async_engine(async_url, **pool_kwargs(async_url, settings, use_async=True))
+    _instrument(eng.sync_engine, name)
+    return eng
+
+
+def pools_status() -> list[dict]:
+    """Pool gauges and counters for every engine of this process (see /health)."""
+    return [pool_status(eng, stats) for eng, stats in _pools]
+
+
+REGISTRY.register_collector(lambda: pool_metrics(_pools))
+
+
+# Async mode (DATABASE_ASYNC=1): same DATABASE_URL, async driver.
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise RuntimeError(f"DATABASE_ASYNC is not supported for '{backend}' databases")
+    return u.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    future=True,
-)
+
+engine = make_engine(settings.database_url, name="primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
-def get_db():
+async_engine = None
+AsyncSessionLocal = None
+if settings.database_async:
+    async_engine = make_async_engine(settings.database_url, name="primary_async")
+    # expire_on_commit=False: ORM objects are serialized after the session's greenlet has
+    # returned, where a lazy refresh would fail.
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+DbSession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
+
+# ==========================
+# Shared session (POST /batch)
+# ==========================
+# Sub-requests of a batch reuse the batch's session (one connection for all of them): get_db
+# and get_read_db yield it, and run_db serializes the work on it (a session is not safe for
+# concurrent use). Everything else (cache hits, serialization) still runs concurrently.
+class _SharedSession:
+    __slots__ = ("db", "lock")
+
+    def __init__(self, db: "DbSession"):
+        self.db = db
+        self.lock = asyncio.Lock()
+
+
+_shared_session: ContextVar[Optional[_SharedSession]] = ContextVar("shared_session", default=None)
+
+
+@contextmanager
+def shared_session(db: "DbSession"):
+    """Within this block (and the tasks it starts), get_db / get_read_db yield `db`."""
+    token = _shared_session.set(_SharedSession(db))
+    try:
+        yield
+    finally:
+        _shared_session.reset(token)
+
+
+async def get_db():
+    shared = _shared_session.get()
+    if shared is not None:
+        yield shared.db  # closed by its owner
+        return
+
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        # close() may roll back (a DB round trip): keep it off the event loop
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a (sync) service/crud function `fn(session, *args, **kwargs)` without blocking the loop.
+
+    - AsyncSession: `run_sync` drives the sync ORM code over the async driver (greenlet),
+      so no worker thread is held while waiting on the database.
+    - Session: fall back to AnyIO's threadpool, as sync `def` routes did.
+    """
+    shared = _shared_session.get()
+    if shared is not None and shared.db is db:
+        async with shared.lock:
+            return await _run_db(db, fn, *args, **kwargs)
+    return await _run_db(db, fn, *args, **kwargs)
+
+
+async def _run_db(db: DbSession, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+# ==========================
+# Read replicas (DATABASE_READ_URLS)
+# ==========================
+# Set after a successful write; while valid, that client's reads go to the primary
+# (read-your-writes despite replication lag).
+READ_PIN_COOKIE = "db_read_primary_until"
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# POST routes that change nothing read from replicas: /batch only reads, /auth writes users
+# and refresh tokens, always read on the primary. Pinning after them would send the client's
+# reads to the primary for nothing (every page load, every login and token refresh).
+UNPINNED_WRITE_PATHS = frozenset({"/batch", "/auth/register", "/auth/login", "/auth/refresh", "/auth/logout"})
+
+
+class _Replica:
+    __slots__ = ("url", "engine", "async_engine", "down_until")
+
+    def __init__(self, url: str, *, name: str, use_async: bool):
+        self.url = url
+        self.engine = None if use_async else make_engine(url, name=name)
+        self.async_engine = make_async_engine(url, name=name) if use_async else None
+        self.down_until = 0.0
+
+    def checked_out(self) -> int:
+        pool = (self.async_engine or self.engine).pool
+        return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+
+class ReplicaSet:
+    def __init__(self, urls: tuple[str, ...], *, selection: str, retry_seconds: int, use_async: bool):
+        self.replicas = [_Replica(u, name=f"replica{i}", use_async=use_async) for i, u in enumerate(urls, 1)]
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self._rr = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.replicas)
+
+    def candidates(self, now: float) -> list[_Replica]:
+        """Healthy replicas, most preferred first."""
+        healthy = [r for r in self.replicas if r.down_until <= now]
+        if not healthy:
+            return []
+        if self.selection == "least_connections":
+            return sorted(healthy, key=lambda r: r.checked_out())
+        with self._lock:
+            start = next(self._rr) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, replica: _Replica, now: float) -> None:
+        replica.down_until = now + self.retry_seconds
+
+
+replicas = ReplicaSet(
+    settings.database_read_urls,
+    selection=settings.replica_selection,
+    retry_seconds=settings.replica_retry_seconds,
+    use_async=settings.database_async,
+)
+
+
+def _pinned_to_primary(request: Request) -> bool:
+    raw = request.cookies.get(READ_PIN_COOKIE)
+    if not raw:
+        return False
+    try:
+        return float(raw) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request, primary: DbSession = Depends(get_db)):
+    """Read-only session for GET routes: a replica when configured, else the primary.
+
+    The replica connection is checked out up front so that an unreachable replica is
+    detected here, marked down for REPLICA_RETRY_SECONDS, and the request falls back to the
+    next replica or to the primary. The primary session is lazy: it costs nothing unless used.
+    """
+    if not replicas.configured or _pinned_to_primary(request) or _shared_session.get() is not None:
+        yield primary
+        return
+
+    for replica in replicas.candidates(time.monotonic()):
+        try:
+            if replica.async_engine is not None:
+                conn = await replica.async_engine.connect()
+            else:
+                conn = await run_in_threadpool(replica.engine.connect)
+        except (DBAPIError, OSError):
+            logger.warning("Read replica unreachable, skipping it for %ss", replicas.retry_seconds)
+            replicas.mark_down(replica, time.monotonic())
+            continue
+
+        if replica.async_engine is not None:
+            db = AsyncSession(bind=conn, autoflush=False, expire_on_commit=False)
+            try:
+                yield db
+            finally:
+                await db.close()
+                await conn.close()
+        else:
+            db = Session(bind=conn, autoflush=False, future=True)
+            try:
+                yield db
+            finally:
+                await run_in_threadpool(db.close)
+                await run_in_threadpool(conn.close)
+        return
+
+    yield primary
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware: after a successful write, pin the client's reads to the primary.
+
+    Requests to `exempt_paths` (writes invisible to replica reads) are never pinned.
+    """
+
+    def __init__(self, app, *, pin_seconds: int, exempt_paths: frozenset[str] = UNPINNED_WRITE_PATHS):
+        self.app = app
+        self.pin_seconds = pin_seconds
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in _WRITE_METHODS
+            or scope.get("path", "").rstrip("/") in self.exempt_paths
+            or not replicas.configured
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.pin_seconds
+                cookie = f"{READ_PIN_COOKIE}={until:.3f}; Max-Age={self.pin_seconds}; Path=/; HttpOnly; SameSite=lax"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,13 +1,28 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.engine import make_url
+from contextlib import asynccontextmanager
+import hmac
 import logging
 import time
 
 from app.core.config import get_settings
-from app.database import get_db
-from app.routes import auth, articles, dictionnaire, histoires, cartes
+from app.database import DbSession, ReadYourWritesMiddleware, SessionLocal, get_db, pools_status, run_db
+from app.utils.http_errors import http_error
+from app.utils.pg_listener import CacheInvalidationListener
+from app.utils.metrics import REGISTRY
+from app.utils.prometheus import CONTENT_TYPE as METRICS_CONTENT_TYPE, HttpMetricsMiddleware, render_metrics
+from app.utils.compression import Compression, CompressionMiddleware
+from app.utils.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.utils.response_cache import ResponseCacheMiddleware
+from app.utils.slow_queries import SlowQueryLog
+from app.utils.sql_stats import SqlTimingMiddleware
+from app.routes import auth, articles, dictionnaire, histoires, cartes, feeds, changes, admin, batch
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
+from app.services import slow_queries as slow_queries_service
 
 settings = get_settings()
 
@@ -17,7 +32,65 @@ _app_start_ts = time.time()
 def _is_production(env: str) -> bool:
     return env.lower() in {"prod", "production"}
 
-app = FastAPI(title="API Provençale", version="2.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Several API nodes: drop this node's cached reads when another node writes (Postgres NOTIFY)
+    listener = None
+    if settings.cache_notify and make_url(settings.database_url).get_backend_name() == "postgresql":
+        listener = CacheInvalidationListener(
+            settings.database_url,
+            channel=settings.cache_notify_channel,
+            node_id=changes_service.NODE_ID,
+            on_change=changes_service.invalidate_caches,
+            on_flush=changes_service.invalidate_all_caches,
+        )
+        listener.start()
+    yield
+    if listener is not None:
+        listener.stop()
+
+app = FastAPI(title="API Provençale", version="2.0", lifespan=lifespan)
+
+compression = (
+    Compression(
+        min_size=settings.compression_min_bytes,
+        offload_size=settings.compression_offload_bytes,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+    if settings.compression_enabled
+    else None
+)
+
+# Public lists served from the response cache; tags = resources the response is built from
+# (invalidated by the write services). Added first: must sit inside CORSMiddleware.
+CACHED_ROUTES = {
+    "/articles/": (revisions_service.ARTICLES,),
+    "/cartes/": (revisions_service.CARTES,),
+    "/dictionnaire/": (revisions_service.DICTIONNAIRE,),
+    "/dictionnaire/themes": (revisions_service.DICTIONNAIRE,),
+    "/dictionnaire/categories": (revisions_service.DICTIONNAIRE,),
+    "/histoires/menu": (revisions_service.HISTOIRES,),
+}
+app.add_middleware(
+    ResponseCacheMiddleware,
+    routes=CACHED_ROUTES,
+    ttl=settings.cache_ttl_seconds,
+    max_entry_bytes=settings.cache_max_entry_bytes,
+    compression=compression,
+    replica_lag_seconds=settings.read_your_writes_seconds,
+)
+
+# Token buckets per client IP / route class; inside CORS so that browsers can read the 429
+if settings.rate_limit_per_minute > 0:
+    rate_limiter = TokenBucketLimiter(rate=settings.rate_limit_per_minute / 60, burst=settings.rate_limit_burst)
+    REGISTRY.register_collector(rate_limiter.collect)
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        client_ip=auth._client_ip,
+        costs=dict(settings.rate_limit_costs),
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,22 +98,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"] if not _is_production(settings.env) else ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"] if not _is_production(settings.env) else ["Authorization", "Content-Type"],
-    expose_headers=["*"] if not _is_production(settings.env) else ["Retry-After"],
+    expose_headers=["*"] if not _is_production(settings.env) else ["Retry-After", "X-Next-Cursor", "ETag", "Last-Modified", "Server-Timing"],
+)
+
+# Outside CORS; cached responses arrive already encoded and are left as is
+if compression is not None:
+    app.add_middleware(CompressionMiddleware, compression=compression)
+
+app.add_middleware(ReadYourWritesMiddleware, pin_seconds=settings.read_your_writes_seconds)
+
+# Outermost: Server-Timing / query counts cover the whole request
+app.add_middleware(
+    SqlTimingMiddleware,
+    budget=settings.sql_query_budget,
+    strict=settings.sql_query_budget_strict,
+    repeat_threshold=settings.sql_repeat_threshold,
+)
+app.add_middleware(
+    HttpMetricsMiddleware,
+    metrics_dir=settings.metrics_dir,
+    flush_seconds=settings.metrics_flush_seconds,
+)
+
+def _store_slow_query(entry: dict) -> None:
+    with SessionLocal() as db:
+        slow_queries_service.record_slow_query_service(db, entry=entry, keep=settings.slow_query_keep)
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_ms,
+    store=_store_slow_query,
+    explain=settings.slow_query_explain,
 )
+if settings.slow_query_ms > 0:
+    slow_query_log.install()
 
 @app.get("/health", tags=["Health"])
-def health(db: Session = Depends(get_db)):
+async def health(db: DbSession = Depends(get_db)):
     """
     Healthcheck enrichi:
     - status: ok/degraded
     - db: ok/error
     - uptime_seconds
     - version
+    - pools: état des pools de connexions (taille, utilisées, overflow, attente, timeouts)
     """
     db_ok = True
     db_error = None
     try:
-        db.execute(text("SELECT 1"))
+        await run_db(db, lambda s: s.execute(text("SELECT 1")))
     except Exception:
         db_ok = False
         db_error = "db_unreachable"
@@ -53,11 +158,36 @@ def health(db: Session = Depends(get_db)):
         "db_error": db_error,
         "uptime_seconds": int(time.time() - _app_start_ts),
         "version": app.version,
+        "pools": pools_status(),
     }
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Métriques au format texte Prometheus (agrégées sur tous les workers si METRICS_DIR est défini):
+    requêtes/latences/tailles par route, requêtes en cours, pools DB, caches, limiteur de login.
+    Réservé au scraper: Authorization: Bearer METRICS_TOKEN (sans METRICS_TOKEN: 404).
+    """
+    if not settings.metrics_token:
+        raise http_error(status.HTTP_404_NOT_FOUND, code="not_found", message="Ressource introuvable")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), settings.metrics_token.encode()):
+        raise http_error(
+            status.HTTP_401_UNAUTHORIZED,
+            code="auth_required",
+            message="Authentification requise",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    body = await run_in_threadpool(render_metrics, settings.metrics_dir)
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
 # Monte tes routers (ne pas ajouter CORS dans les routers)
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(articles.router, prefix="/articles", tags=["Articles"])
 app.include_router(dictionnaire.router, prefix="/dictionnaire", tags=["Dictionnaire"])
 app.include_router(histoires.router, prefix="/histoires", tags=["Histoires"])
-app.include_router(cartes.router, prefix="/cartes", tags=["Cartes"])
\ No newline at end of file
+app.include_router(cartes.router, prefix="/cartes", tags=["Cartes"])
+app.include_router(feeds.router, prefix="/feeds", tags=["Feeds"])
+app.include_router(changes.router, prefix="/changes", tags=["Changes"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+app.include_router(batch.router, prefix="/batch", tags=["Batch"])
\ No newline at end of file
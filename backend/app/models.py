@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, LargeBinary, Date
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, LargeBinary, Date, DateTime, Index
 from app.database import Base
 
 class User(Base):
@@ -7,6 +7,19 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     password = Column(String, nullable=False)
 
+
+class RefreshToken(Base):
+    # Server-side refresh tokens (POST /auth/refresh). Only the SHA-256 of the token is stored.
+    # Each refresh revokes the token and issues a new one in the same `family`; a revoked token
+    # presented again means it leaked, and the whole family is revoked.
+    __tablename__ = "refresh_tokens"
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    username = Column(String, nullable=False, index=True)
+    family = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
 class Article(Base):
     __tablename__ = "articles"
     id = Column(Integer, primary_key=True, index=True)
@@ -14,7 +27,9 @@ class Article(Base):
     description = Column(Text, nullable=True)
     image_url = Column(String(200), nullable=True)
     source_url = Column(String(200), nullable=True)
-    date_ajout = Column(Date, nullable=False)
+    date_ajout = Column(Date, nullable=False, index=True)
+    # Maintained by services.articles on every write (delta sync via ?since=)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
     # Optional stored image (<=2MB enforced at API layer)
     image_data = Column(LargeBinary, nullable=True)
     image_mime = Column(String(100), nullable=True)
@@ -64,3 +79,58 @@ class Carte(Base):
     @property
     def image_stored(self) -> bool:
         return bool(self.image_data)
+
+
+class Revision(Base):
+    # One counter per content table, bumped in the same transaction as each write
+    # (services.revisions.mark_changed). Used to derive ETags without running list queries.
+    __tablename__ = "revisions"
+    resource = Column(String(50), primary_key=True)
+    revision = Column(BigInteger, nullable=False, default=0)
+
+
+class Change(Base):
+    # Change log for delta sync (GET /changes). `revision` comes from the global "changes"
+    # counter in `revisions`, so it is gap-free and follows commit order. Only the latest
+    # entry per (resource, resource_id) is kept (older ones are compacted on write).
+    __tablename__ = "changes"
+    revision = Column(BigInteger, primary_key=True, autoincrement=False)
+    resource = Column(String(50), nullable=False)
+    resource_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # create | update | delete
+    changed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_changes_resource_resource_id", "resource", "resource_id"),)
+
+class LoginLimiterEntry(Base):
+    # Login rate limiter state shared by all nodes (LOGIN_LIMITER_BACKEND=postgres). UNLOGGED on
+    # Postgres (see migration): no WAL, emptied after a crash, which is fine for throttling state.
+    __tablename__ = "login_limiter"
+    key = Column(String(64), primary_key=True)  # sha256 hex of "ip:<addr>" / "user:<name>"
+    fail_count = Column(Integer, nullable=False)
+    first_fail = Column(Float, nullable=False)  # epoch seconds
+    blocked_until = Column(Float, nullable=False)
+    last = Column(Float, nullable=False, index=True)
+
+
+class SeedChecksum(Base):
+    # Last loaded version of each seed source (seeds.loader): init_app skips a source whose
+    # checksum (file content + column mapping) has not changed since its last load.
+    __tablename__ = "seed_checksums"
+    source = Column(String(50), primary_key=True)
+    checksum = Column(String(64), nullable=False)
+    loaded_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class SlowQuery(Base):
+    # Slow-query log (SLOW_QUERY_MS), filled by a background thread (app.utils.slow_queries).
+    # Parameters are redacted; `plan` is the EXPLAIN output as JSON. Capped to SLOW_QUERY_KEEP rows.
+    __tablename__ = "slow_queries"
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    fingerprint = Column(String(16), nullable=False, index=True)
+    statement = Column(Text, nullable=False)
+    parameters = Column(Text, nullable=True)
+    duration_ms = Column(Float, nullable=False)
+    plan = Column(Text, nullable=True)
+    path = Column(String(200), nullable=True)
+    captured_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,31 @@
+"""
+Module: admin.py
+Description: Routes d'administration (authentification requise): journal des requêtes SQL lentes.
+Stack: FastAPI + SQLAlchemy + Pydantic
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.database import DbSession, get_db, run_db
+from app.schemas import SlowQueryStat
+from app.services import slow_queries as slow_queries_service
+from app.utils.security import require_authenticated
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryStat])
+async def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    since: Optional[datetime] = Query(None, description="Uniquement les captures depuis cette date (ISO 8601)"),
+    user: str = Depends(require_authenticated),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Requêtes lentes (au-delà de SLOW_QUERY_MS) regroupées par forme de requête, triées par
+    temps total, avec le dernier échantillon: SQL, paramètres masqués, plan EXPLAIN.
+    """
+    return await run_db(db, slow_queries_service.top_slow_queries_service, limit=limit, since=since)
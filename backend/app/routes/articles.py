@@ -5,49 +5,78 @@ Stack: FastAPI + SQLAlchemy + Pydantic
 """
 
 from fastapi import APIRouter, Depends, status, Query, UploadFile, File, Response
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import DbSession, get_db, get_read_db, run_db
+from app.models import Article
 from app.schemas import ArticleCreate, ArticleUpdate, ArticleOut
 from app.utils.security import require_authenticated
 from app.services import articles as articles_service
 from app.services.errors import NotFoundError, ValidationError
 from app.utils.http_errors import http_error
+from sqlalchemy import func
 from sqlalchemy.exc import DataError, IntegrityError, StatementError
 from app.utils.db_errors import format_db_exception
 from app.utils.images import validate_image_upload
+from app.utils.conditional import conditional_get
+from app.utils.fast_json import RowSerializer, fast_json_response
+from app.services import revisions as revisions_service
 
 router = APIRouter()
 
+# Listes: lignes en lecture seule (sans les images) + orjson, sortie identique à ArticleOut
+_ARTICLE_ROWS = RowSerializer(
+    ArticleOut, Article, computed={"image_stored": func.coalesce(func.length(Article.image_data), 0) > 0}
+)
+
 # ✅ Lire tous les articles
-@router.get("/", response_model=List[ArticleOut])
-def get_articles(
-    db: Session = Depends(get_db),
+# Synchro incrémentale: ?since=<ts> et/ou ?cursor=<X-Next-Cursor précédent>
+# -> uniquement les articles créés/modifiés, ordre stable (updated_at, id).
+@router.get("/", response_model=List[ArticleOut], dependencies=[Depends(conditional_get(revisions_service.ARTICLES))])
+async def get_articles(
+    response: Response,
+    db: DbSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    since: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None),
 ):
-    return articles_service.list_articles_service(db, skip=skip, limit=limit)
+    if since is None and not cursor:
+        rows = await run_db(
+            db, articles_service.list_articles_service, skip=skip, limit=limit, columns=_ARTICLE_ROWS.columns
+        )
+        return fast_json_response(_ARTICLE_ROWS.dump_many(rows), response)
+
+    try:
+        items, next_cursor = await run_db(
+            db, articles_service.list_articles_changed_service, since=since, cursor=cursor, limit=limit
+        )
+    except ValidationError as e:
+        raise http_error(400, code="validation_error", message=str(e), field="cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_json_response(_ARTICLE_ROWS.dump_many(items), response)
 
 
 # ✅ Lire un article par ID
-@router.get("/{article_id}", response_model=ArticleOut)
-def get_article(article_id: int, db: Session = Depends(get_db)):
+@router.get("/{article_id}", response_model=ArticleOut, dependencies=[Depends(conditional_get(revisions_service.ARTICLES))])
+async def get_article(article_id: int, db: DbSession = Depends(get_read_db)):
     try:
-        return articles_service.get_article_service(db, article_id=article_id)
+        return await run_db(db, articles_service.get_article_service, article_id=article_id)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=article id={article_id})")
 
 
 # ✅ Créer un article (auth requis)
 @router.post("/", response_model=ArticleOut, status_code=status.HTTP_201_CREATED)
-def create_article(
+async def create_article(
     article: ArticleCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return articles_service.create_article_service(db, article_in=article)
+        return await run_db(db, articles_service.create_article_service, article_in=article)
     except ValidationError as e:
         raise http_error(422, code="validation_error", message=str(e), field="titre")
     except (DataError, IntegrityError, StatementError) as e:
@@ -57,14 +86,14 @@ def create_article(
 
 # ✅ Mettre à jour un article (auth requis)
 @router.put("/{article_id}", response_model=ArticleOut)
-def update_article(
+async def update_article(
     article_id: int,
     article: ArticleUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return articles_service.update_article_service(db, article_id=article_id, article_in=article)
+        return await run_db(db, articles_service.update_article_service, article_id=article_id, article_in=article)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=article id={article_id})")
     except ValidationError as e:
@@ -76,23 +105,27 @@ def update_article(
 
 # ✅ Supprimer un article (auth requis)
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_article(
+async def delete_article(
     article_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        articles_service.delete_article_service(db, article_id=article_id)
+        await run_db(db, articles_service.delete_article_service, article_id=article_id)
         return None
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=article id={article_id})")
 
 
 @router.get("/{article_id}/image")
-def get_article_image(article_id: int, db: Session = Depends(get_db)):
+async def get_article_image(
+    article_id: int,
+    db: DbSession = Depends(get_read_db),
+    etag: str = Depends(conditional_get(revisions_service.ARTICLES)),
+):
     try:
-        data, mime = articles_service.get_article_image_service(db, article_id=article_id)
-        return Response(content=data, media_type=mime)
+        data, mime = await run_db(db, articles_service.get_article_image_service, article_id=article_id)
+        return Response(content=data, media_type=mime, headers={"ETag": etag, "Cache-Control": "no-cache"})
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=article_image article id={article_id})")
 
@@ -101,13 +134,13 @@ def get_article_image(article_id: int, db: Session = Depends(get_db)):
 async def upload_article_image(
     article_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
         data = await image.read()
         info = validate_image_upload(data=data, declared_mime=image.content_type)
-        return articles_service.set_article_image_service(db, article_id=article_id, image_data=data, image_mime=info.mime)
+        return await run_db(db, articles_service.set_article_image_service, article_id=article_id, image_data=data, image_mime=info.mime)
     except ValueError as e:
         raise http_error(413, code="validation_error", message=str(e), field="image")
     except NotFoundError as e:
@@ -118,12 +151,12 @@ async def upload_article_image(
 
 
 @router.delete("/{article_id}/image", response_model=ArticleOut)
-def delete_article_image(
+async def delete_article_image(
     article_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return articles_service.clear_article_image_service(db, article_id=article_id)
+        return await run_db(db, articles_service.clear_article_image_service, article_id=article_id)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=article id={article_id})")
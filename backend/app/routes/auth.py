@@ -6,20 +6,33 @@ Stack: FastAPI + SQLAlchemy + Passlib + PyJWT
 
 from fastapi import APIRouter, Depends, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import logging
 import os
 import time
 
-from app.database import get_db
+from app.core.config import get_settings
+from app.database import DbSession, get_db, run_db
 from app.schemas import UserCreate, UserResponse
-from app.utils.security import require_authenticated
+from app.utils.security import (
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    PasswordPoolBusy,
+    hash_password_async,
+    oauth2_scheme,
+    require_authenticated,
+    revoke_token,
+    verify_and_update_password_async,
+)
 from app.services import auth as auth_service
 from app.services.errors import ConflictError, UnauthorizedError, ValidationError
+from app.utils import login_limiter
 from app.utils.http_errors import http_error
+from app.utils.metrics import REGISTRY
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# --- Login rate limiting (in-memory, per-process) ---
+# --- Login rate limiting (app.utils.login_limiter; LOGIN_LIMITER_BACKEND) ---
 # Env knobs (optional)
 _LOGIN_WINDOW_SECONDS = int(os.getenv("LOGIN_WINDOW_SECONDS", "300"))  # rolling window for failures
 _LOGIN_MAX_ATTEMPTS = int(os.getenv("LOGIN_MAX_ATTEMPTS", "5"))        # lockout threshold
@@ -27,18 +40,38 @@ _LOGIN_LOCKOUT_SECONDS = int(os.getenv("LOGIN_LOCKOUT_SECONDS", "900"))  # locko
 _LOGIN_BASE_DELAY_SECONDS = float(os.getenv("LOGIN_BASE_DELAY_SECONDS", "1"))  # progressive backoff base
 _LOGIN_MAX_DELAY_SECONDS = float(os.getenv("LOGIN_MAX_DELAY_SECONDS", "30"))   # cap for backoff delay
 
-# state: key -> {"fail_count": int, "first_fail": float, "blocked_until": float, "last": float}
-_LOGIN_STATE: dict[tuple[str, str], dict[str, float]] = {}
+_LOGIN_POLICY = login_limiter.LoginPolicy(
+    window_seconds=_LOGIN_WINDOW_SECONDS,
+    max_attempts=_LOGIN_MAX_ATTEMPTS,
+    lockout_seconds=_LOGIN_LOCKOUT_SECONDS,
+    base_delay_seconds=_LOGIN_BASE_DELAY_SECONDS,
+    max_delay_seconds=_LOGIN_MAX_DELAY_SECONDS,
+)
+_LOGIN_LIMITER = login_limiter.build_limiter(get_settings(), _LOGIN_POLICY)
+
+
+def _limiter_keys_metric():
+    size = _LOGIN_LIMITER.size()
+    if size is None:
+        return []
+    return [("app_login_limiter_keys", "gauge", "Tracked login limiter keys (ip/user).", [({}, size)])]
+
+
+REGISTRY.register_collector(_limiter_keys_metric)
 
 def _now() -> float:
     return time.time()
 
-def _cleanup_login_state(now: float) -> None:
-    # drop entries that are stale (avoid unbounded growth)
-    ttl = _LOGIN_WINDOW_SECONDS + _LOGIN_LOCKOUT_SECONDS + 60
-    for k in list(_LOGIN_STATE.keys()):
-        if now - float(_LOGIN_STATE[k].get("last", now)) > ttl:
-            _LOGIN_STATE.pop(k, None)
+async def _limiter_call(fn, *args, default=None):
+    # Shared backends do network I/O: off the event loop. An unavailable backend fails open
+    # (logins keep working without throttling) rather than locking everybody out.
+    try:
+        if _LOGIN_LIMITER.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+    except Exception:
+        logger.warning("login limiter backend unavailable", exc_info=True)
+        return default
 
 # If running behind a trusted reverse proxy, enable this to honor forwarded headers.
 _TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "0").lower() in ("1", "true", "yes")
@@ -55,28 +88,14 @@ def _client_ip(request: Request) -> str:
                 return ip
     return (request.client.host if request.client else "unknown") or "unknown"
 
-def _key_ip(ip: str) -> tuple[str, str]:
-    return ("ip", ip)
-
-def _key_user(username: str) -> tuple[str, str]:
-    return ("user", username.lower().strip() or "unknown")
+def _key_ip(ip: str) -> str:
+    return f"ip:{ip}"
 
-def _blocked_seconds(key: tuple[str, str], now: float) -> int:
-    st = _LOGIN_STATE.get(key)
-    if not st:
-        return 0
-    blocked_until = float(st.get("blocked_until", 0.0))
-    if blocked_until <= now:
-        return 0
-    return int(blocked_until - now) + 1
+def _key_user(username: str) -> str:
+    return f"user:{username.lower().strip() or 'unknown'}"
 
-def _ensure_not_rate_limited(*, ip: str, username: str) -> None:
-    now = _now()
-    _cleanup_login_state(now)
-
-    wait_ip = _blocked_seconds(_key_ip(ip), now)
-    wait_user = _blocked_seconds(_key_user(username), now)
-    wait = max(wait_ip, wait_user)
+async def _ensure_not_rate_limited(*, ip: str, username: str) -> None:
+    wait = await _limiter_call(_LOGIN_LIMITER.blocked_seconds, (_key_ip(ip), _key_user(username)), _now(), default=0)
     if wait > 0:
         raise http_error(
             status.HTTP_429_TOO_MANY_REQUESTS,
@@ -85,94 +104,114 @@ def _ensure_not_rate_limited(*, ip: str, username: str) -> None:
             headers={"Retry-After": str(wait)},
         )
 
-def _register_login_failure(*, ip: str, username: str) -> None:
-    now = _now()
-    _cleanup_login_state(now)
-
-    for key in (_key_ip(ip), _key_user(username)):
-        st = _LOGIN_STATE.get(key) or {"fail_count": 0.0, "first_fail": now, "blocked_until": 0.0, "last": now}
-
-        # reset window if too old
-        first_fail = float(st.get("first_fail", now))
-        if now - first_fail > _LOGIN_WINDOW_SECONDS:
-            st = {"fail_count": 0.0, "first_fail": now, "blocked_until": 0.0, "last": now}
-
-        fail_count = int(st.get("fail_count", 0.0)) + 1
-        st["fail_count"] = float(fail_count)
-        st["last"] = now
-
-        # progressive delay
-        delay = min(_LOGIN_MAX_DELAY_SECONDS, _LOGIN_BASE_DELAY_SECONDS * (2 ** max(0, fail_count - 1)))
-        st["blocked_until"] = max(float(st.get("blocked_until", 0.0)), now + delay)
-
-        # hard lockout after threshold
-        if fail_count >= _LOGIN_MAX_ATTEMPTS:
-            st["blocked_until"] = max(float(st.get("blocked_until", 0.0)), now + _LOGIN_LOCKOUT_SECONDS)
-
-        _LOGIN_STATE[key] = st
-
-def _clear_login_state(*, ip: str, username: str) -> None:
-    _LOGIN_STATE.pop(_key_ip(ip), None)
-    _LOGIN_STATE.pop(_key_user(username), None)
+async def _register_login_failure(*, ip: str, username: str) -> None:
+    await _limiter_call(_LOGIN_LIMITER.register_failure, (_key_ip(ip), _key_user(username)), _now())
+
+async def _clear_login_state(*, ip: str, username: str) -> None:
+    await _limiter_call(_LOGIN_LIMITER.clear, (_key_ip(ip), _key_user(username)))
+
+def _unavailable():
+    # Pool bcrypt saturé: échec rapide plutôt qu'une file qui bloque les lectures
+    return http_error(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        code="unavailable",
+        message="Service momentanément surchargé, réessayez",
+        headers={"Retry-After": "1"},
+    )
+
+# Refresh token: HttpOnly cookie limited to /auth (sent to /auth/refresh and /auth/logout only)
+REFRESH_COOKIE = "refresh_token"
+_REFRESH_COOKIE_PATH = "/auth"
+
+def _secure_cookies() -> bool:
+    return os.getenv("ENV", "development").lower() not in ("development", "dev", "local")
+
+def _set_auth_cookies(response: Response, result: dict) -> dict:
+    """Pose les cookies HttpOnly et retourne le payload JSON (sans le refresh token)."""
+    payload = dict(result)
+    refresh_token = payload.pop("refresh_token", None)
+    # cookie attributes: HttpOnly, SameSite=Lax, path=/; secure in production
+    response.set_cookie(
+        key="access_token",
+        value=payload["access_token"],
+        httponly=True,
+        secure=_secure_cookies(),
+        samesite="lax",
+        path="/",
+    )
+    if refresh_token:
+        response.set_cookie(
+            key=REFRESH_COOKIE,
+            value=refresh_token,
+            max_age=REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+            httponly=True,
+            secure=_secure_cookies(),
+            samesite="strict",
+            path=_REFRESH_COOKIE_PATH,
+        )
+    return payload
 
 # ==========================
 # REGISTER
 # ==========================
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: DbSession = Depends(get_db)):
     """
     Crée un nouvel utilisateur avec mot de passe hashé.
+    Le bcrypt est attendu hors de la boucle et sans connexion base retenue.
     """
     try:
-        return auth_service.register_user_service(db, user_in=user)
+        username, password = await run_db(db, auth_service.check_new_user_service, user_in=user)
+        hashed = await hash_password_async(password)
+        return await run_db(db, auth_service.create_user_service, username=username, hashed_password=hashed)
     except ConflictError as e:
         raise http_error(status.HTTP_409_CONFLICT, code="conflict", message=str(e), field="username")
     except ValidationError as e:
         raise http_error(status.HTTP_422_UNPROCESSABLE_ENTITY, code="validation_error", message=str(e))
+    except PasswordPoolBusy:
+        raise _unavailable()
 
 
 # ==========================
 # LOGIN
 # ==========================
 @router.post("/login")
-def login(
+async def login(
     request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Authentifie un utilisateur et retourne un token JWT.
     Rate limit: par IP + par username, avec backoff/lockout (429 + Retry-After).
+    Trois étapes: hash stocké (base), bcrypt attendu dans PASSWORD_POOL (ni la boucle ni un
+    thread de requête ne sont bloqués), puis rehash éventuel et émission des tokens (base).
     """
     ip = _client_ip(request)
     username = form_data.username or ""
 
-    _ensure_not_rate_limited(ip=ip, username=username)
+    await _ensure_not_rate_limited(ip=ip, username=username)
 
     try:
-        result = auth_service.login_service(db, username=username, password=form_data.password)
-        _clear_login_state(ip=ip, username=username)
-
-        # If the service returned an access_token, set it as a HttpOnly cookie
+        stored_username, stored_hash = await run_db(db, auth_service.get_login_hash_service, username=username)
+        valid, new_hash = await verify_and_update_password_async(form_data.password or "", stored_hash)
+        if not valid:
+            raise UnauthorizedError("Identifiants invalides")
+        result = await run_db(db, auth_service.complete_login_service, username=stored_username, new_hash=new_hash)
+        await _clear_login_state(ip=ip, username=username)
+
+        # If the service returned an access_token, set it (and the refresh token) as HttpOnly cookies
         token = result.get("access_token") if isinstance(result, dict) else None
         if token:
-            # cookie attributes: HttpOnly, SameSite=Lax, path=/; secure in production
-            secure = os.getenv("ENV", "development").lower() not in ("development", "dev", "local")
-            response.set_cookie(
-                key="access_token",
-                value=token,
-                httponly=True,
-                secure=secure,
-                samesite="lax",
-                path="/",
-            )
             # Also return JSON payload (keep existing behavior)
-            return {**result}
+            return _set_auth_cookies(response, result)
 
         return result
+    except PasswordPoolBusy:
+        raise _unavailable()
     except UnauthorizedError as e:
-        _register_login_failure(ip=ip, username=username)
+        await _register_login_failure(ip=ip, username=username)
         raise http_error(
             status.HTTP_401_UNAUTHORIZED,
             code="unauthorized",
@@ -181,11 +220,31 @@ def login(
         )
 
 
+# ==========================
+# REFRESH
+# ==========================
+@router.post("/refresh")
+async def refresh(request: Request, response: Response, db: DbSession = Depends(get_db)):
+    """
+    Renouvelle le token d'accès à partir du cookie HttpOnly `refresh_token`, sans mot de passe.
+    Rotation: le refresh token présenté est révoqué et remplacé; un token déjà utilisé
+    révoque toute la session (vol probable).
+    """
+    refresh_token = request.cookies.get(REFRESH_COOKIE)
+    if not refresh_token:
+        raise http_error(status.HTTP_401_UNAUTHORIZED, code="auth_required", message="Authentification requise")
+    try:
+        result = await run_db(db, auth_service.refresh_service, refresh_token=refresh_token)
+    except UnauthorizedError as e:
+        raise http_error(status.HTTP_401_UNAUTHORIZED, code="auth_invalid", message=str(e))
+    return _set_auth_cookies(response, result)
+
+
 # ==========================
 # ROUTE PROTÉGÉE
 # ==========================
 @router.get("/me")
-def get_me(current_user: str = Depends(require_authenticated)):
+async def get_me(current_user: str = Depends(require_authenticated)):
     """
     Retourne l'utilisateur courant (extrait du token).
     """
@@ -194,7 +253,22 @@ def get_me(current_user: str = Depends(require_authenticated)):
 
 # Optional logout endpoint to clear cookie-based auth
 @router.post("/logout")
-def logout(response: Response):
-    """Efface le cookie `access_token` si présent."""
+async def logout(
+    request: Request,
+    response: Response,
+    token: str | None = Depends(oauth2_scheme),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Efface les cookies, révoque le token d'accès (refusé jusqu'à son expiration)
+    et la session de refresh tokens.
+    """
+    token = token or request.cookies.get("access_token")
+    if token:
+        revoke_token(token)
+    refresh_token = request.cookies.get(REFRESH_COOKIE)
+    if refresh_token:
+        await run_db(db, auth_service.logout_service, refresh_token=refresh_token)
     response.delete_cookie("access_token", path="/")
+    response.delete_cookie(REFRESH_COOKIE, path=_REFRESH_COOKIE_PATH)
     return {"status": "ok"}
@@ -0,0 +1,51 @@
+"""
+Module: batch.py
+Description: POST /batch — plusieurs GET internes en une seule requête HTTP (pages du
+dictionnaire et des histoires: thèmes, catégories, page, menu), exécutés dans le processus.
+Stack: FastAPI + SQLAlchemy
+"""
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.core.config import get_settings
+from app.database import DbSession, get_read_db, shared_session
+from app.schemas import BatchRequest, BatchResponse
+from app.utils import batch as batch_utils
+from app.utils.http_errors import http_error
+
+router = APIRouter()
+settings = get_settings()
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(payload: BatchRequest, request: Request, db: DbSession = Depends(get_read_db)):
+    """
+    Exécute des sous-requêtes GET sur les routes existantes (mêmes en-têtes d'authentification),
+    en parallèle et sur une seule session DB, et renvoie leurs résultats dans l'ordre demandé:
+    {"responses": [{"id", "status", "headers", "body"}]}. Une sous-requête en échec n'interrompt
+    pas les autres (son statut est renvoyé).
+    """
+    if len(payload.requests) > settings.batch_max_requests:
+        raise http_error(
+            400,
+            code="validation_error",
+            message=f"Au plus {settings.batch_max_requests} sous-requêtes par batch",
+            field="requests",
+        )
+
+    targets = []
+    for item in payload.requests:
+        try:
+            path, _ = batch_utils.split_target(item.path)
+        except ValueError as e:
+            raise http_error(400, code="validation_error", message=str(e), field="path")
+        if path.rstrip("/") == request.url.path.rstrip("/"):
+            raise http_error(400, code="validation_error", message="Un batch ne peut pas contenir /batch", field="path")
+        headers = [(b"if-none-match", item.if_none_match.encode("latin-1"))] if item.if_none_match else []
+        targets.append((item.path, headers))
+
+    with shared_session(db):
+        results = await batch_utils.call_all(request.app, request.scope, targets)
+
+    body = batch_utils.render([(item.id, sub) for item, sub in zip(payload.requests, results)])
+    return Response(content=body, media_type="application/json")
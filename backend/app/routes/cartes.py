@@ -1,41 +1,51 @@
 from fastapi import APIRouter, Depends, status, UploadFile, File, Response
-from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import get_db
+from app.database import DbSession, get_db, get_read_db, run_db
+from app.models import Carte
 from app.schemas import CarteCreate, CarteUpdate, CarteOut
 from app.utils.security import require_authenticated
 from app.services import cartes as cartes_service
 from app.services.errors import NotFoundError, ValidationError
 from app.utils.http_errors import http_error
+from sqlalchemy import func
 from sqlalchemy.exc import DataError, IntegrityError, StatementError
 from app.utils.db_errors import format_db_exception
 from app.utils.images import validate_image_upload
+from app.utils.conditional import conditional_get
+from app.utils.fast_json import RowSerializer, fast_json_response
+from app.services import revisions as revisions_service
 
 router = APIRouter()
 
+# Liste: lignes en lecture seule (sans les images) + orjson, sortie identique à CarteOut
+_CARTE_ROWS = RowSerializer(
+    CarteOut, Carte, computed={"image_stored": func.coalesce(func.length(Carte.image_data), 0) > 0}
+)
 
-@router.get("/", response_model=List[CarteOut])
-def get_cartes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return cartes_service.list_cartes_service(db, skip=skip, limit=limit)
 
+@router.get("/", response_model=List[CarteOut], dependencies=[Depends(conditional_get(revisions_service.CARTES))])
+async def get_cartes(response: Response, skip: int = 0, limit: int = 100, db: DbSession = Depends(get_read_db)):
+    rows = await run_db(db, cartes_service.list_cartes_service, skip=skip, limit=limit, columns=_CARTE_ROWS.columns)
+    return fast_json_response(_CARTE_ROWS.dump_many(rows), response)
 
-@router.get("/{carte_id}", response_model=CarteOut)
-def get_carte_by_id(carte_id: int, db: Session = Depends(get_db)):
+
+@router.get("/{carte_id}", response_model=CarteOut, dependencies=[Depends(conditional_get(revisions_service.CARTES))])
+async def get_carte_by_id(carte_id: int, db: DbSession = Depends(get_read_db)):
     try:
-        return cartes_service.get_carte_service(db, carte_id=carte_id)
+        return await run_db(db, cartes_service.get_carte_service, carte_id=carte_id)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "carte", "id": carte_id})
 
 
 @router.post("/", response_model=CarteOut, status_code=status.HTTP_201_CREATED)
-def create_carte(
+async def create_carte(
     carte: CarteCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return cartes_service.create_carte_service(db, carte_in=carte)
+        return await run_db(db, cartes_service.create_carte_service, carte_in=carte)
     except ValidationError as e:
         raise http_error(422, code="validation_error", message=str(e))
     except (DataError, IntegrityError, StatementError) as e:
@@ -44,14 +54,14 @@ def create_carte(
 
 
 @router.put("/{carte_id}", response_model=CarteOut)
-def update_carte(
+async def update_carte(
     carte_id: int,
     carte: CarteUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return cartes_service.update_carte_service(db, carte_id=carte_id, carte_in=carte)
+        return await run_db(db, cartes_service.update_carte_service, carte_id=carte_id, carte_in=carte)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "carte", "id": carte_id})
     except ValidationError as e:
@@ -62,23 +72,27 @@ def update_carte(
 
 
 @router.delete("/{carte_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_carte(
+async def delete_carte(
     carte_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        cartes_service.delete_carte_service(db, carte_id=carte_id)
+        await run_db(db, cartes_service.delete_carte_service, carte_id=carte_id)
         return None
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "carte", "id": carte_id})
 
 
 @router.get("/{carte_id}/image")
-def get_carte_image(carte_id: int, db: Session = Depends(get_db)):
+async def get_carte_image(
+    carte_id: int,
+    db: DbSession = Depends(get_read_db),
+    etag: str = Depends(conditional_get(revisions_service.CARTES)),
+):
     try:
-        data, mime = cartes_service.get_carte_image_service(db, carte_id=carte_id)
-        return Response(content=data, media_type=mime)
+        data, mime = await run_db(db, cartes_service.get_carte_image_service, carte_id=carte_id)
+        return Response(content=data, media_type=mime, headers={"ETag": etag, "Cache-Control": "no-cache"})
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "carte_image", "id": carte_id})
 
@@ -87,13 +101,13 @@ def get_carte_image(carte_id: int, db: Session = Depends(get_db)):
 async def upload_carte_image(
     carte_id: int,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
         data = await image.read()
         info = validate_image_upload(data=data, declared_mime=image.content_type)
-        return cartes_service.set_carte_image_service(db, carte_id=carte_id, image_data=data, image_mime=info.mime)
+        return await run_db(db, cartes_service.set_carte_image_service, carte_id=carte_id, image_data=data, image_mime=info.mime)
     except ValueError as e:
         raise http_error(413, code="validation_error", message=str(e), field="image")
     except NotFoundError as e:
@@ -104,13 +118,13 @@ async def upload_carte_image(
 
 
 @router.delete("/{carte_id}/image", response_model=CarteOut)
-def delete_carte_image(
+async def delete_carte_image(
     carte_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return cartes_service.clear_carte_image_service(db, carte_id=carte_id)
+        return await run_db(db, cartes_service.clear_carte_image_service, carte_id=carte_id)
     except ValidationError as e:
         raise http_error(422, code="validation_error", message=str(e))
     except NotFoundError as e:
@@ -0,0 +1,25 @@
+"""
+Module: changes.py
+Description: Journal des modifications (articles, cartes, dictionnaire, histoires) pour la
+synchronisation incrémentale: le client rappelle avec ?after=<lastRevision> précédent.
+Stack: FastAPI + SQLAlchemy + Pydantic
+"""
+
+from fastapi import APIRouter, Depends, Query
+
+from app.database import DbSession, get_read_db, run_db
+from app.schemas import ChangesPage
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
+from app.utils.conditional import conditional_get
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ChangesPage, dependencies=[Depends(conditional_get(revisions_service.CHANGES))])
+async def get_changes(
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: DbSession = Depends(get_read_db),
+):
+    return await run_db(db, changes_service.list_changes_service, after=after, limit=limit)
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response, status, Query
 from typing import List, Optional
 
-from app.database import get_db
+from app.database import DbSession, get_db, get_read_db, run_db
+from app.models import Dictionnaire
 from app.schemas import DictionnaireCreate, DictionnaireUpdate, DictionnaireOut, PaginatedDictionnaire
 from app.utils.security import require_authenticated
 from app.services import dictionnaire as dict_service
@@ -10,12 +10,19 @@ from app.services.errors import NotFoundError, ValidationError
 from app.utils.http_errors import http_error
 from sqlalchemy.exc import DataError, IntegrityError, StatementError
 from app.utils.db_errors import format_db_exception
+from app.utils.conditional import conditional_get
+from app.utils.fast_json import RowSerializer, fast_json_response
+from app.services import revisions as revisions_service
 
 router = APIRouter()
 
+# Liste: lignes en lecture seule + orjson, sortie identique à PaginatedDictionnaire
+_MOT_ROWS = RowSerializer(DictionnaireOut, Dictionnaire)
+
 # 🔎 Liste paginée avec filtres + tri
-@router.get("/", response_model=PaginatedDictionnaire)
-def get_dictionnaire(
+@router.get("/", response_model=PaginatedDictionnaire, dependencies=[Depends(conditional_get(revisions_service.DICTIONNAIRE))])
+async def get_dictionnaire(
+    response: Response,
     theme: Optional[str] = Query(None),
     categorie: Optional[str] = Query(None),
     lettre: Optional[str] = Query(None),
@@ -24,11 +31,12 @@ def get_dictionnaire(
     limit: int = Query(20, ge=1, le=100),
     sort: str = Query("mots_francais"),
     order: str = Query("asc"),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_read_db),
 ):
     try:
-        return dict_service.list_mots_service(
+        page_data = await run_db(
             db,
+            dict_service.list_mots_service,
             theme=theme,
             categorie=categorie,
             lettre=lettre,
@@ -37,32 +45,35 @@ def get_dictionnaire(
             limit=limit,
             sort=sort,
             order=order,
+            columns=_MOT_ROWS.columns,
         )
     except ValidationError as e:
         raise http_error(400, code="validation_error", message=str(e), field="sort")
+    page_data["items"] = _MOT_ROWS.dump_many(page_data["items"])
+    return fast_json_response(page_data, response)
 
 
 # 🧾 Liste des thèmes distincts
-@router.get("/themes", response_model=List[str])
-def get_themes(db: Session = Depends(get_db)):
-    return dict_service.list_themes_service(db)
+@router.get("/themes", response_model=List[str], dependencies=[Depends(conditional_get(revisions_service.DICTIONNAIRE))])
+async def get_themes(db: DbSession = Depends(get_read_db)):
+    return await run_db(db, dict_service.list_themes_service)
 
 
 # 🧾 Liste des catégories (toutes ou par thème)
-@router.get("/categories", response_model=List[str])
-def get_categories(theme: Optional[str] = Query("tous"), db: Session = Depends(get_db)):
-    return dict_service.list_categories_service(db, theme=theme)
+@router.get("/categories", response_model=List[str], dependencies=[Depends(conditional_get(revisions_service.DICTIONNAIRE))])
+async def get_categories(theme: Optional[str] = Query("tous"), db: DbSession = Depends(get_read_db)):
+    return await run_db(db, dict_service.list_categories_service, theme=theme)
 
 
 # ✅ Ajouter un mot (auth requis)
 @router.post("/", response_model=DictionnaireOut, status_code=status.HTTP_201_CREATED)
-def create_mot(
+async def create_mot(
     mot: DictionnaireCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return dict_service.create_mot_service(db, mot_in=mot)
+        return await run_db(db, dict_service.create_mot_service, mot_in=mot)
     except ValidationError as e:
         raise http_error(422, code="validation_error", message=str(e), field="motsFrancais")
     except (DataError, IntegrityError, StatementError) as e:
@@ -72,14 +83,14 @@ def create_mot(
 
 # ✅ Mettre à jour un mot (auth requis)
 @router.put("/{mot_id}", response_model=DictionnaireOut)
-def update_mot(
+async def update_mot(
     mot_id: int,
     mot: DictionnaireUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return dict_service.update_mot_service(db, mot_id=mot_id, mot_in=mot)
+        return await run_db(db, dict_service.update_mot_service, mot_id=mot_id, mot_in=mot)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=dictionnaire id={mot_id})")
     except ValidationError as e:
@@ -91,9 +102,9 @@ def update_mot(
 
 # ✅ Supprimer un mot (auth requis)
 @router.delete("/{mot_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_mot(mot_id: int, db: Session = Depends(get_db), user: str = Depends(require_authenticated)):
+async def delete_mot(mot_id: int, db: DbSession = Depends(get_db), user: str = Depends(require_authenticated)):
     try:
-        dict_service.delete_mot_service(db, mot_id=mot_id)
+        await run_db(db, dict_service.delete_mot_service, mot_id=mot_id)
         return None
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=f"{e} (resource=dictionnaire id={mot_id})")
@@ -0,0 +1,84 @@
+"""
+Module: feeds.py
+Description: Flux RSS 2.0 et JSON Feed (articles, histoires), servis depuis un cache mémoire
+avec ETag / Last-Modified (304) et corps pré-compressé (gzip).
+Stack: FastAPI + SQLAlchemy
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.database import DbSession, get_read_db, run_db
+from app.services import feeds as feeds_service
+from app.services.errors import NotFoundError
+from app.utils.http_cache import accepts_encoding, etag_matches, http_date, not_modified_since
+from app.utils.http_errors import http_error
+from app.utils.metrics import record_cache_lookup
+
+router = APIRouter()
+
+# Flux en cours de génération : les requêtes concurrentes sur un flux absent du cache
+# attendent la même génération au lieu d'interroger toutes la base. Attente asynchrone :
+# un verrou bloquant dans le service figerait la boucle en mode async (run_sync).
+_building: dict[tuple[str, str], asyncio.Future] = {}
+
+
+async def _feed(db: DbSession, resource: str, fmt: str) -> feeds_service.RenderedFeed:
+    feed = feeds_service.cached_feed(resource, fmt)
+    record_cache_lookup("feeds", feed is not None)
+    key = (resource, fmt)
+    while feed is None:
+        pending = _building.get(key)
+        if pending is None:
+            break
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # cette requête-ci a été annulée
+        feed = feeds_service.cached_feed(resource, fmt)  # génération abandonnée : on reprend
+    if feed is not None:
+        return feed
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())  # erreur transmise aux attentes
+    _building[key] = future
+    try:
+        feed = await run_db(db, feeds_service.build_feed_service, resource=resource, fmt=fmt)
+        future.set_result(feed)
+        return feed
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _building.pop(key, None)
+        if not future.done():
+            future.cancel()  # génération annulée : les requêtes en attente la relancent
+
+
+@router.get("/{resource}.{fmt}")
+async def get_feed(resource: str, fmt: str, request: Request, db: DbSession = Depends(get_read_db)):
+    try:
+        feed = await _feed(db, resource, fmt)
+    except NotFoundError as e:
+        raise http_error(404, code="not_found", message=str(e), extra={"resource": "feed", "name": f"{resource}.{fmt}"})
+
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": http_date(feed.last_modified),
+        "Cache-Control": "public, max-age=60",
+        "Vary": "Accept-Encoding",
+    }
+
+    # If-None-Match prime sur If-Modified-Since (RFC 9110 §13.2.2)
+    inm = request.headers.get("if-none-match")
+    if etag_matches(inm, feed.etag) or (inm is None and not_modified_since(request.headers.get("if-modified-since"), feed.last_modified)):
+        return Response(status_code=304, headers=headers)
+
+    if accepts_encoding(request.headers.get("accept-encoding"), "gzip"):
+        # Autres octets que le corps identity : ETag faible (comme compression.encoded_headers)
+        headers["Content-Encoding"] = "gzip"
+        headers["ETag"] = feed.etag if feed.etag.startswith("W/") else f"W/{feed.etag}"
+        return Response(content=feed.body_gzip, media_type=feed.media_type, headers=headers)
+    return Response(content=feed.body, media_type=feed.media_type, headers=headers)
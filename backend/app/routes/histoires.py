@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List, Dict
 
-from app.database import get_db
+from app.database import DbSession, get_db, get_read_db, run_db
+from app.models import Histoire
 from app.schemas import HistoireCreate, HistoireUpdate, HistoireOut
 from app.utils.security import require_authenticated
 from app.services import histoires as histoires_service
@@ -10,48 +10,60 @@ from app.services.errors import NotFoundError, ValidationError
 from sqlalchemy.exc import DataError, IntegrityError, StatementError
 from app.utils.db_errors import format_db_exception
 from app.utils.http_errors import http_error
+from app.utils.conditional import conditional_get
+from app.utils.fast_json import RowSerializer, fast_json_response
+from app.services import revisions as revisions_service
 
 router = APIRouter()
 
+# Liste: lignes en lecture seule + orjson, sortie identique à HistoireOut
+_HISTOIRE_ROWS = RowSerializer(HistoireOut, Histoire)
+
 # Lire les histoires avec pagination
-@router.get("/", response_model=List[HistoireOut])
-def get_histoires(page: int = 1, limit: int = 5, db: Session = Depends(get_db)):
-    return histoires_service.list_histoires_service(db, page=page, limit=limit)
+@router.get("/", response_model=List[HistoireOut], dependencies=[Depends(conditional_get(revisions_service.HISTOIRES))])
+async def get_histoires(response: Response, page: int = 1, limit: int = 5, db: DbSession = Depends(get_read_db)):
+    rows = await run_db(
+        db, histoires_service.list_histoires_service, page=page, limit=limit, columns=_HISTOIRE_ROWS.columns
+    )
+    return fast_json_response(_HISTOIRE_ROWS.dump_many(rows), response)
 
 
 # Sommaire groupé
-@router.get("/menu")
-def get_menu_histoires(db: Session = Depends(get_db)) -> Dict[str, Dict[str, List[histoires_service.MenuItem]]]:
-    return histoires_service.menu_histoires_service(db)
+@router.get("/menu", dependencies=[Depends(conditional_get(revisions_service.HISTOIRES))])
+async def get_menu_histoires(
+    response: Response, db: DbSession = Depends(get_read_db)
+) -> Dict[str, Dict[str, List[histoires_service.MenuItem]]]:
+    # Dicts déjà au format de sortie: encodés directement avec orjson
+    return fast_json_response(await run_db(db, histoires_service.menu_histoires_service), response)
 
 
 # Recherche par titre
-@router.get("/find", response_model=HistoireOut)
-def find_histoire(titre: str, db: Session = Depends(get_db)):
+@router.get("/find", response_model=HistoireOut, dependencies=[Depends(conditional_get(revisions_service.HISTOIRES))])
+async def find_histoire(titre: str, db: DbSession = Depends(get_read_db)):
     try:
-        return histoires_service.find_histoire_service(db, titre=titre)
+        return await run_db(db, histoires_service.find_histoire_service, titre=titre)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "histoire", "titre": titre})
 
 
 # Recherche par id
-@router.get("/{histoire_id}", response_model=HistoireOut)
-def get_histoire_by_id(histoire_id: int, db: Session = Depends(get_db)):
+@router.get("/{histoire_id}", response_model=HistoireOut, dependencies=[Depends(conditional_get(revisions_service.HISTOIRES))])
+async def get_histoire_by_id(histoire_id: int, db: DbSession = Depends(get_read_db)):
     try:
-        return histoires_service.get_histoire_by_id_service(db, histoire_id=histoire_id)
+        return await run_db(db, histoires_service.get_histoire_by_id_service, histoire_id=histoire_id)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "histoire", "id": histoire_id})
 
 
 # Créer une histoire (auth requis)
 @router.post("/", response_model=HistoireOut, status_code=status.HTTP_201_CREATED)
-def create_histoire(
+async def create_histoire(
     histoire: HistoireCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return histoires_service.create_histoire_service(db, histoire_in=histoire)
+        return await run_db(db, histoires_service.create_histoire_service, histoire_in=histoire)
     except ValidationError as e:
         raise http_error(422, code="validation_error", message=str(e))
     except (DataError, IntegrityError, StatementError) as e:
@@ -62,14 +74,14 @@ def create_histoire(
 
 # Mettre à jour une histoire (auth requis)
 @router.put("/{histoire_id}", response_model=HistoireOut)
-def update_histoire(
+async def update_histoire(
     histoire_id: int,
     histoire: HistoireUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     user: str = Depends(require_authenticated),
 ):
     try:
-        return histoires_service.update_histoire_service(db, histoire_id=histoire_id, histoire_in=histoire)
+        return await run_db(db, histoires_service.update_histoire_service, histoire_id=histoire_id, histoire_in=histoire)
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "histoire", "id": histoire_id})
     except ValidationError as e:
@@ -81,9 +93,9 @@ def update_histoire(
 
 # Supprimer une histoire (auth requis)
 @router.delete("/{histoire_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_histoire(histoire_id: int, db: Session = Depends(get_db), user: str = Depends(require_authenticated)):
+async def delete_histoire(histoire_id: int, db: DbSession = Depends(get_db), user: str = Depends(require_authenticated)):
     try:
-        histoires_service.delete_histoire_service(db, histoire_id=histoire_id)
+        await run_db(db, histoires_service.delete_histoire_service, histoire_id=histoire_id)
         return None
     except NotFoundError as e:
         raise http_error(404, code="not_found", message=str(e), extra={"resource": "histoire", "id": histoire_id})
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from typing import Optional
-from datetime import date
+from typing import Any, Optional
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -62,6 +62,7 @@ class ArticleOut(APIModel):
     image_url: Optional[str] = None
     source_url: Optional[str] = None
     date_ajout: date
+    updated_at: Optional[datetime] = None
     image_stored: bool = False
 
 
@@ -171,3 +172,60 @@ class PaginatedDictionnaire(APIModel):
     pages: int
     page: int
     limit: int
+
+
+# ==========================
+# Changes (delta sync)
+# ==========================
+class ChangeOut(APIModel):
+    revision: int
+    resource: str
+    resource_id: int
+    operation: str
+    changed_at: datetime
+
+
+class ChangesPage(APIModel):
+    items: list[ChangeOut]
+    last_revision: int
+    has_more: bool
+
+
+# ==========================
+# Batch
+# ==========================
+class BatchItem(APIModel):
+    id: Optional[str] = None  # renvoyé tel quel dans la réponse
+    path: str = Field(min_length=1)  # chemin + query string, ex: "/dictionnaire/?page=2"
+    if_none_match: Optional[str] = None
+
+
+class BatchRequest(APIModel):
+    requests: list[BatchItem] = Field(min_length=1)
+
+
+class BatchResponseItem(APIModel):
+    id: Optional[str] = None
+    status: int
+    headers: dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(APIModel):
+    responses: list[BatchResponseItem]
+
+
+# ==========================
+# Admin
+# ==========================
+class SlowQueryStat(APIModel):
+    fingerprint: str
+    calls: int
+    total_ms: float
+    max_ms: float
+    avg_ms: float
+    last_seen: datetime
+    statement: str
+    parameters: Optional[Any] = None
+    plan: Optional[Any] = None
+    path: Optional[str] = None
@@ -1,16 +1,57 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime, timezone
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 
 from app.crud import articles as articles_crud
 from app.models import Article
 from app.schemas import ArticleCreate, ArticleUpdate
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
 from app.services.errors import NotFoundError, ValidationError
+from app.utils.pagination import as_utc, decode_cursor, encode_cursor
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def list_articles_service(db: Session, *, skip: int, limit: int, columns: Sequence | None = None) -> list:
+    return articles_crud.list_articles(db, skip=skip, limit=limit, columns=columns)
+
+
+def list_articles_changed_service(
+    db: Session,
+    *,
+    since: datetime | None,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[Article], str | None]:
+    """Articles created/modified after `since` (or after `cursor`), oldest change first.
+
+    Returns (items, next_cursor); next_cursor is the position of the last item returned,
+    or the incoming cursor when nothing changed.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise ValidationError(str(e))
 
+    items = articles_crud.list_articles_changed_since(
+        db,
+        since=as_utc(since) if since is not None else None,
+        after=after,
+        limit=limit,
+    )
+    if not items:
+        return items, cursor
 
-def list_articles_service(db: Session, *, skip: int, limit: int) -> list[Article]:
-    return articles_crud.list_articles(db, skip=skip, limit=limit)
+    last = items[-1]
+    return items, encode_cursor(last.updated_at, last.id)
 
 
 def get_article_service(db: Session, *, article_id: int) -> Article:
@@ -30,9 +71,12 @@ def create_article_service(db: Session, *, article_in: ArticleCreate) -> Article
     # Set date_ajout to today if not provided
     if "date_ajout" not in payload or payload["date_ajout"] is None:
         payload["date_ajout"] = date.today()
+    payload["updated_at"] = _utcnow()
 
     obj = articles_crud.create_article(db, payload=payload)
+    changes_service.record_change(db, revisions_service.ARTICLES, changes_service.CREATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.ARTICLES)
     db.refresh(obj)
     return obj
 
@@ -51,9 +95,12 @@ def update_article_service(db: Session, *, article_id: int, article_in: ArticleU
     
     # Update date_ajout to today when modifying
     payload["date_ajout"] = date.today()
+    payload["updated_at"] = _utcnow()
 
     articles_crud.update_article(obj, payload=payload)
+    changes_service.record_change(db, revisions_service.ARTICLES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.ARTICLES)
     db.refresh(obj)
     return obj
 
@@ -64,7 +111,9 @@ def delete_article_service(db: Session, *, article_id: int) -> None:
         raise NotFoundError("Article non trouvé")
 
     articles_crud.delete_article(db, obj=obj)
+    changes_service.record_change(db, revisions_service.ARTICLES, changes_service.DELETE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.ARTICLES)
 
 
 def set_article_image_service(db: Session, *, article_id: int, image_data: bytes, image_mime: str) -> Article:
@@ -74,7 +123,10 @@ def set_article_image_service(db: Session, *, article_id: int, image_data: bytes
 
     obj.image_data = image_data
     obj.image_mime = image_mime
+    obj.updated_at = _utcnow()
+    changes_service.record_change(db, revisions_service.ARTICLES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.ARTICLES)
     db.refresh(obj)
     return obj
 
@@ -86,7 +138,10 @@ def clear_article_image_service(db: Session, *, article_id: int) -> Article:
 
     obj.image_data = None
     obj.image_mime = None
+    obj.updated_at = _utcnow()
+    changes_service.record_change(db, revisions_service.ARTICLES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.ARTICLES)
     db.refresh(obj)
     return obj
 
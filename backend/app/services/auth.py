@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from datetime import timedelta
+import secrets
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
 # NOTE: rate limiting (brute-force protection) is enforced at the route layer (/auth/login).
+# bcrypt runs between the services below, awaited by the route (security.*_async): these
+# sync services run through run_db, on the event loop thread in async mode.
 
+from app.crud import refresh_tokens as refresh_tokens_crud
 from app.crud import users as users_crud
 from app.schemas import UserCreate
 from app.services.errors import ConflictError, UnauthorizedError, ValidationError
-from app.utils.security import create_access_token, hash_password, verify_password, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.utils.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    create_access_token,
+    hash_refresh_token,
+    new_refresh_token,
+)
 
 
-def register_user_service(db: Session, *, user_in: UserCreate):
+def check_new_user_service(db: Session, *, user_in: UserCreate) -> tuple[str, str]:
+    """Register, step 1: validated (username, password), before hashing."""
     username = (user_in.username or "").strip()
     password = user_in.password or ""
     if not username:
@@ -19,21 +30,85 @@ def register_user_service(db: Session, *, user_in: UserCreate):
     if not password:
         raise ValidationError("Mot de passe requis")
 
-    if users_crud.get_user_by_username(db, username=username):
+    taken = users_crud.get_user_by_username(db, username=username) is not None
+    # Fin de la transaction (lecture seule): la connexion retourne au pool pendant le bcrypt
+    db.rollback()
+    if taken:
         raise ConflictError("Nom d'utilisateur déjà pris")
+    return username, password
 
-    hashed = hash_password(password)
-    obj = users_crud.create_user(db, username=username, hashed_password=hashed)
+
+def create_user_service(db: Session, *, username: str, hashed_password: str):
+    """Register, step 2: insert the user with the already computed hash."""
+    obj = users_crud.create_user(db, username=username, hashed_password=hashed_password)
     db.commit()
     db.refresh(obj)
     return obj
 
 
-def login_service(db: Session, *, username: str, password: str) -> dict:
+def get_login_hash_service(db: Session, *, username: str) -> tuple[str, str]:
+    """Login, step 1: (username, stored hash) to verify the password against."""
     user = users_crud.get_user_by_username(db, username=username)
-    if not user or not verify_password(password, user.password):
+    if not user:
         raise UnauthorizedError("Identifiants invalides")
+    found = (user.username, user.password)
+    # Fin de la transaction (lecture seule): la connexion retourne au pool pendant le bcrypt,
+    # sinon une rafale de logins occupe toutes les connexions et bloque les lectures.
+    db.rollback()
+    return found
+
+
+def complete_login_service(db: Session, *, username: str, new_hash: str | None = None) -> dict:
+    """Login, step 2 (password verified): store the rehash if any, issue the tokens."""
+    if new_hash:
+        # Hash au coût dépassé (BCRYPT_ROUNDS relevé): remplacé de façon transparente
+        user = users_crud.get_user_by_username(db, username=username)
+        if user is not None:
+            users_crud.update_user_password(db, user=user, hashed_password=new_hash)
+
+    now = datetime.now(timezone.utc)
+    refresh_tokens_crud.delete_expired_refresh_tokens(db, username=username, now=now)
+    result = _issue_tokens(db, username=username, family=secrets.token_hex(16), now=now)
+    db.commit()
+    return result
+
+
+def _issue_tokens(db: Session, *, username: str, family: str, now: datetime) -> dict:
+    access_token = create_access_token(data={"sub": username}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    refresh_token = new_refresh_token()
+    refresh_tokens_crud.create_refresh_token(
+        db,
+        token_hash=hash_refresh_token(refresh_token),
+        username=username,
+        family=family,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite returns naive datetimes (stored in UTC)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def refresh_service(db: Session, *, refresh_token: str) -> dict:
+    """Rotation: the presented token is revoked and a new pair is issued (no password check)."""
+    now = datetime.now(timezone.utc)
+    stored = refresh_tokens_crud.get_refresh_token_by_hash(db, token_hash=hash_refresh_token(refresh_token or ""))
+    if not stored or _aware(stored.expires_at) <= now:
+        raise UnauthorizedError("Session expirée, reconnectez-vous")
+    if stored.revoked_at is not None or not refresh_tokens_crud.revoke_refresh_token(db, token_id=stored.id, now=now):
+        # Already rotated: replayed (stolen) token, or two concurrent refreshes. Revoke the family.
+        refresh_tokens_crud.revoke_refresh_family(db, family=stored.family, now=now)
+        db.commit()
+        raise UnauthorizedError("Session révoquée, reconnectez-vous")
+    result = _issue_tokens(db, username=stored.username, family=stored.family, now=now)
+    db.commit()
+    return result
+
 
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
-    return {"access_token": token, "token_type": "bearer"}
+def logout_service(db: Session, *, refresh_token: str) -> None:
+    stored = refresh_tokens_crud.get_refresh_token_by_hash(db, token_hash=hash_refresh_token(refresh_token))
+    if stored:
+        refresh_tokens_crud.revoke_refresh_family(db, family=stored.family, now=datetime.now(timezone.utc))
+        db.commit()
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 
 from app.crud import cartes as cartes_crud
 from app.models import Carte
 from app.schemas import CarteCreate, CarteUpdate
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
 from app.services.errors import NotFoundError, ValidationError
 
 
-def list_cartes_service(db: Session, *, skip: int, limit: int) -> list[Carte]:
-    return cartes_crud.list_cartes(db, skip=skip, limit=limit)
+def list_cartes_service(db: Session, *, skip: int, limit: int, columns: Sequence | None = None) -> list:
+    return cartes_crud.list_cartes(db, skip=skip, limit=limit, columns=columns)
 
 
 def get_carte_service(db: Session, *, carte_id: int) -> Carte:
@@ -31,7 +35,9 @@ def create_carte_service(db: Session, *, carte_in: CarteCreate) -> Carte:
     payload["iframe_url"] = iframe_url
 
     obj = cartes_crud.create_carte(db, payload=payload)
+    changes_service.record_change(db, revisions_service.CARTES, changes_service.CREATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.CARTES)
     db.refresh(obj)
     return obj
 
@@ -58,7 +64,9 @@ def update_carte_service(db: Session, *, carte_id: int, carte_in: CarteUpdate) -
     payload = {k: (v.strip() if isinstance(v, str) else v) for k, v in payload.items()}
 
     cartes_crud.update_carte(obj, payload=payload)
+    changes_service.record_change(db, revisions_service.CARTES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.CARTES)
     db.refresh(obj)
     return obj
 
@@ -69,7 +77,9 @@ def delete_carte_service(db: Session, *, carte_id: int) -> None:
         raise NotFoundError("Carte non trouvée")
 
     cartes_crud.delete_carte(db, obj=obj)
+    changes_service.record_change(db, revisions_service.CARTES, changes_service.DELETE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.CARTES)
 
 
 def set_carte_image_service(db: Session, *, carte_id: int, image_data: bytes, image_mime: str) -> Carte:
@@ -79,7 +89,9 @@ def set_carte_image_service(db: Session, *, carte_id: int, image_data: bytes, im
 
     obj.image_data = image_data
     obj.image_mime = image_mime
+    changes_service.record_change(db, revisions_service.CARTES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.CARTES)
     db.refresh(obj)
     return obj
 
@@ -94,7 +106,9 @@ def clear_carte_image_service(db: Session, *, carte_id: int) -> Carte:
 
     obj.image_data = None
     obj.image_mime = None
+    changes_service.record_change(db, revisions_service.CARTES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.CARTES)
     db.refresh(obj)
     return obj
 
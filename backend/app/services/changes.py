@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.crud import changes as changes_crud
+from app.models import Change
+from app.services import revisions as revisions_service
+from app.services.feeds import invalidate_feeds
+from app.utils import response_cache
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Identifies this process in NOTIFY payloads: a node does not re-invalidate on its own writes.
+NODE_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def invalidate_caches(resource: str) -> None:
+    """Post-commit hook of content services: drop this node's cached reads of `resource`
+    (feeds, response cache)."""
+    invalidate_feeds(resource)
+    response_cache.invalidate_tags(resource)
+
+
+def invalidate_all_caches() -> None:
+    """Full flush, when invalidations from other nodes may have been missed."""
+    for resource in revisions_service.CONTENT_RESOURCES:
+        invalidate_feeds(resource)
+    response_cache.clear()
+
+
+def _notify_other_nodes(db: Session, resource: str, resource_id: int, operation: str, revision: int) -> None:
+    settings = get_settings()
+    if not settings.cache_notify or db.get_bind().dialect.name != "postgresql":
+        return
+    payload = json.dumps(
+        {"resource": resource, "id": resource_id, "op": operation, "revision": revision, "node": NODE_ID},
+        separators=(",", ":"),
+    )
+    changes_crud.notify(db, channel=settings.cache_notify_channel, payload=payload)
+
+
+def record_change(db: Session, resource: str, operation: str, obj) -> int:
+    """Single write hook for content services; call before commit, in the write transaction.
+
+    Bumps the per-table revision (ETags), appends to the change log, replacing any
+    previous entry for the same object, and (Postgres) NOTIFYs the other API nodes so they
+    drop their cached reads on commit. Returns the change revision.
+    """
+    if getattr(obj, "id", None) is None:
+        db.flush()  # assign the primary key of a new row
+
+    revisions_service.mark_changed(db, resource)
+    revision = revisions_service.mark_changed(db, revisions_service.CHANGES)
+
+    changes_crud.delete_superseded(db, resource=resource, resource_id=obj.id)
+    changes_crud.create_change(
+        db,
+        payload={
+            "revision": revision,
+            "resource": resource,
+            "resource_id": obj.id,
+            "operation": operation,
+            "changed_at": datetime.now(timezone.utc),
+        },
+    )
+    _notify_other_nodes(db, resource, obj.id, operation, revision)
+    return revision
+
+
+def list_changes_service(db: Session, *, after: int, limit: int) -> dict:
+    # Fetch one extra row to tell the client whether to keep paging.
+    rows: list[Change] = changes_crud.list_changes(db, after=after, limit=limit + 1)
+    items = rows[:limit]
+    return {
+        "items": items,
+        "last_revision": items[-1].revision if items else after,
+        "has_more": len(rows) > limit,
+    }
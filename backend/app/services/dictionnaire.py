@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from sqlalchemy.orm import Session
 
 from app.crud import dictionnaire as dict_crud
 from app.models import Dictionnaire
 from app.schemas import DictionnaireCreate, DictionnaireUpdate
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
 from app.services.errors import NotFoundError, ValidationError
 
 
@@ -28,6 +32,7 @@ def list_mots_service(
     limit: int,
     sort: str,
     order: str,
+    columns: Sequence | None = None,
 ) -> dict:
     sort_col = _SORTABLE_FIELDS.get(sort)
     if not sort_col:
@@ -44,6 +49,7 @@ def list_mots_service(
         limit=limit,
         sort_col=sort_col,
         desc_order=desc_order,
+        columns=columns,
     )
 
 
@@ -63,7 +69,9 @@ def create_mot_service(db: Session, *, mot_in: DictionnaireCreate) -> Dictionnai
     payload["mots_francais"] = mf
 
     obj = dict_crud.create_mot(db, payload=payload)
+    changes_service.record_change(db, revisions_service.DICTIONNAIRE, changes_service.CREATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.DICTIONNAIRE)
     db.refresh(obj)
     return obj
 
@@ -81,7 +89,9 @@ def update_mot_service(db: Session, *, mot_id: int, mot_in: DictionnaireUpdate)
         payload["mots_francais"] = mf
 
     dict_crud.update_mot(obj, payload=payload)
+    changes_service.record_change(db, revisions_service.DICTIONNAIRE, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.DICTIONNAIRE)
     db.refresh(obj)
     return obj
 
@@ -92,4 +102,6 @@ def delete_mot_service(db: Session, *, mot_id: int) -> None:
         raise NotFoundError("Mot non trouvé")
 
     dict_crud.delete_mot(db, obj=obj)
+    changes_service.record_change(db, revisions_service.DICTIONNAIRE, changes_service.DELETE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.DICTIONNAIRE)
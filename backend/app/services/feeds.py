@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.crud import articles as articles_crud
+from app.crud import changes as changes_crud
+from app.crud import histoires as histoires_crud
+from app.services.errors import NotFoundError
+from app.utils.http_cache import http_date, strong_etag
+from app.utils.metrics import record_cache_lookup
+
+# Feeds are rendered once per content change and kept in memory as ready-to-send bytes
+# (plain + gzip). Write services call `invalidate_feeds(resource)` after commit; the
+# max-age only bounds staleness on workers that did not handle the write.
+#
+# A rendering depends on the data only (never on the clock or the request), so every
+# rebuild and every worker produce the same bytes and the same ETag: conditional GETs keep
+# answering 304 across rebuilds. Concurrent misses are collapsed in the route (async),
+# not here: a lock held in this sync code would block the event loop in async mode.
+
+FEED_ITEMS = 50
+# Last-Modified of a feed without any dated change (e.g. only seeded rows)
+_NEVER = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_FORMATS = {
+    "xml": "application/rss+xml; charset=utf-8",
+    "json": "application/feed+json; charset=utf-8",
+}
+
+
+@dataclass(frozen=True)
+class FeedItem:
+    id: str
+    title: str
+    url: str
+    summary: str
+    published: datetime | None
+    updated: datetime | None
+
+
+@dataclass(frozen=True)
+class RenderedFeed:
+    body: bytes
+    body_gzip: bytes
+    media_type: str
+    etag: str
+    last_modified: datetime
+    generated_at: float
+
+
+@dataclass(frozen=True)
+class _FeedSource:
+    title: str
+    description: str
+    page_path: str
+    load: Callable[[Session, str], tuple[list[FeedItem], datetime | None]]
+
+
+def _utc(dt: datetime | None) -> datetime | None:
+    if dt is None:
+        return None
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _load_articles(db: Session, site_url: str) -> tuple[list[FeedItem], datetime | None]:
+    rows = articles_crud.list_recent_articles(db, limit=FEED_ITEMS)
+    items = [
+        FeedItem(
+            id=f"article-{a.id}",
+            title=a.titre,
+            url=a.source_url or f"{site_url}/",
+            summary=a.description or "",
+            published=_utc(datetime(a.date_ajout.year, a.date_ajout.month, a.date_ajout.day)) if a.date_ajout else None,
+            updated=_utc(a.updated_at),
+        )
+        for a in rows
+    ]
+    # A deletion (or an article leaving the top FEED_ITEMS) changes the feed without touching
+    # the remaining rows: the change log dates it.
+    changed = _utc(changes_crud.last_change_at(db, resource="articles"))
+    newest = max((d for d in (*(i.updated for i in items), changed) if d), default=None)
+    return items, newest
+
+
+def _load_histoires(db: Session, site_url: str) -> tuple[list[FeedItem], datetime | None]:
+    rows = histoires_crud.list_recent_histoires(db, limit=FEED_ITEMS)
+    items = [
+        FeedItem(
+            id=f"histoire-{h.id}",
+            title=h.titre,
+            url=f"{site_url}/histoire-legendes/{h.id}",
+            summary=h.description_courte or "",
+            published=None,
+            updated=None,
+        )
+        for h in rows
+    ]
+    # Histoires have no timestamps: the last write recorded in the change log (deletions
+    # included) stands for them.
+    return items, _utc(changes_crud.last_change_at(db, resource="histoires"))
+
+
+_SOURCES: dict[str, _FeedSource] = {
+    "articles": _FeedSource(
+        title="Le Provençal — Actualités",
+        description="Derniers articles publiés",
+        page_path="/",
+        load=_load_articles,
+    ),
+    "histoires": _FeedSource(
+        title="Le Provençal — Histoire & légendes",
+        description="Dernières histoires publiées",
+        page_path="/histoire-legendes",
+        load=_load_histoires,
+    ),
+}
+
+
+def _render_rss(src: _FeedSource, items: list[FeedItem], *, site_url: str, updated: datetime) -> bytes:
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = src.title
+    ET.SubElement(channel, "link").text = f"{site_url}{src.page_path}"
+    ET.SubElement(channel, "description").text = src.description
+    ET.SubElement(channel, "language").text = "fr"
+    ET.SubElement(channel, "lastBuildDate").text = http_date(updated)
+    for it in items:
+        node = ET.SubElement(channel, "item")
+        ET.SubElement(node, "title").text = it.title
+        ET.SubElement(node, "link").text = it.url
+        ET.SubElement(node, "guid", isPermaLink="false").text = it.id
+        if it.summary:
+            ET.SubElement(node, "description").text = it.summary
+        if it.published or it.updated:
+            ET.SubElement(node, "pubDate").text = http_date(it.published or it.updated)
+    return ET.tostring(rss, encoding="utf-8", xml_declaration=True)
+
+
+def _render_json_feed(src: _FeedSource, items: list[FeedItem], *, site_url: str, feed_url: str) -> bytes:
+    def item(it: FeedItem) -> dict:
+        out: dict = {"id": it.id, "url": it.url, "title": it.title, "content_text": it.summary}
+        if it.published:
+            out["date_published"] = it.published.isoformat()
+        if it.updated:
+            out["date_modified"] = it.updated.isoformat()
+        return out
+
+    doc = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": src.title,
+        "description": src.description,
+        "home_page_url": f"{site_url}{src.page_path}",
+        "feed_url": feed_url,
+        "language": "fr",
+        "items": [item(it) for it in items],
+    }
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_cache: dict[tuple[str, str], RenderedFeed] = {}
+_cache_lock = threading.Lock()
+# Bumped on invalidation so a rendering that raced with a write is not cached.
+_generations: dict[str, int] = {}
+
+
+def invalidate_feeds(resource: str) -> None:
+    """Drop cached feeds of `resource` (call after a committed write)."""
+    with _cache_lock:
+        _generations[resource] = _generations.get(resource, 0) + 1
+        for key in [k for k in _cache if k[0] == resource]:
+            _cache.pop(key, None)
+
+
+def _build(db: Session, resource: str, fmt: str) -> RenderedFeed:
+    settings = get_settings()
+    src = _SOURCES[resource]
+    items, newest = src.load(db, settings.site_url)
+    last_modified = newest or _NEVER
+
+    if fmt == "xml":
+        body = _render_rss(src, items, site_url=settings.site_url, updated=last_modified)
+    else:
+        feed_url = f"{settings.feeds_url}/{resource}.{fmt}"
+        body = _render_json_feed(src, items, site_url=settings.site_url, feed_url=feed_url)
+
+    return RenderedFeed(
+        body=body,
+        body_gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        media_type=_FORMATS[fmt],
+        etag=strong_etag(body),
+        last_modified=last_modified,
+        generated_at=time.monotonic(),
+    )
+
+
+def cached_feed(resource: str, fmt: str) -> RenderedFeed | None:
+    """The rendered feed if cached and fresh (no database access); NotFoundError if unknown."""
+    if resource not in _SOURCES or fmt not in _FORMATS:
+        raise NotFoundError("Flux non trouvé")
+    entry = _cache.get((resource, fmt))
+    if entry is not None and time.monotonic() - entry.generated_at < get_settings().feeds_max_age_seconds:
+        return entry
+    return None
+
+
+def build_feed_service(db: Session, *, resource: str, fmt: str) -> RenderedFeed:
+    """Render the feed from the database and cache it (unless a write raced with it)."""
+    if resource not in _SOURCES or fmt not in _FORMATS:
+        raise NotFoundError("Flux non trouvé")
+    generation = _generations.get(resource, 0)
+    entry = _build(db, resource, fmt)
+    with _cache_lock:
+        if _generations.get(resource, 0) == generation:
+            _cache[(resource, fmt)] = entry
+    return entry
+
+
+def get_feed_service(db: Session, *, resource: str, fmt: str) -> RenderedFeed:
+    entry = cached_feed(resource, fmt)
+    record_cache_lookup("feeds", entry is not None)
+    return entry if entry is not None else build_feed_service(db, resource=resource, fmt=fmt)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List, TypedDict
+from typing import Dict, List, Sequence
 
 from sqlalchemy.orm import Session
+# pydantic requires typing_extensions.TypedDict on Python < 3.12
+from typing_extensions import TypedDict
 
 from app.crud import histoires as histoires_crud
 from app.models import Histoire
 from app.schemas import HistoireCreate, HistoireUpdate
+from app.services import changes as changes_service
+from app.services import revisions as revisions_service
 from app.services.errors import NotFoundError, ValidationError
 
 
@@ -16,13 +20,17 @@ class MenuItem(TypedDict):
     description_courte: str
 
 
-def list_histoires_service(db: Session, *, page: int, limit: int) -> list[Histoire]:
+def list_histoires_service(db: Session, *, page: int, limit: int, columns: Sequence | None = None) -> list:
     offset = (page - 1) * limit
-    return histoires_crud.list_histoires(db, offset=offset, limit=limit)
+    return histoires_crud.list_histoires(db, offset=offset, limit=limit, columns=columns)
+
+
+# Read-only rows for the menu: never load the long texts
+_MENU_COLUMNS = (Histoire.id, Histoire.titre, Histoire.typologie, Histoire.periode, Histoire.description_courte)
 
 
 def menu_histoires_service(db: Session) -> Dict[str, Dict[str, List[MenuItem]]]:
-    histoires = histoires_crud.list_all_histoires(db)
+    histoires = histoires_crud.list_all_histoires(db, columns=_MENU_COLUMNS)
     grouped: Dict[str, Dict[str, List[MenuItem]]] = {}
 
     for h in histoires:
@@ -71,7 +79,9 @@ def create_histoire_service(db: Session, *, histoire_in: HistoireCreate) -> Hist
     payload.update(titre=titre, typologie=typologie, periode=periode)
 
     obj = histoires_crud.create_histoire(db, payload=payload)
+    changes_service.record_change(db, revisions_service.HISTOIRES, changes_service.CREATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.HISTOIRES)
     db.refresh(obj)
     return obj
 
@@ -93,7 +103,9 @@ def update_histoire_service(db: Session, *, histoire_id: int, histoire_in: Histo
     payload = {k: (v.strip() if isinstance(v, str) else v) for k, v in payload.items()}
 
     histoires_crud.update_histoire(obj, payload=payload)
+    changes_service.record_change(db, revisions_service.HISTOIRES, changes_service.UPDATE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.HISTOIRES)
     db.refresh(obj)
     return obj
 
@@ -104,4 +116,6 @@ def delete_histoire_service(db: Session, *, histoire_id: int) -> None:
         raise NotFoundError("Histoire non trouvée")
 
     histoires_crud.delete_histoire(db, obj=obj)
+    changes_service.record_change(db, revisions_service.HISTOIRES, changes_service.DELETE, obj)
     db.commit()
+    changes_service.invalidate_caches(revisions_service.HISTOIRES)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.crud import revisions as revisions_crud
+
+# Resources tracked by the revision counters (one row each in `revisions`).
+ARTICLES = "articles"
+CARTES = "cartes"
+DICTIONNAIRE = "dictionnaire"
+HISTOIRES = "histoires"
+CONTENT_RESOURCES = (ARTICLES, CARTES, DICTIONNAIRE, HISTOIRES)
+# Global counter across resources, used as the change log revision.
+CHANGES = "changes"
+
+
+def mark_changed(db: Session, resource: str) -> int:
+    """Bump the revision of `resource`; call before the write service commits."""
+    return revisions_crud.bump_revision(db, resource=resource)
+
+
+def current_revisions(db: Session, *, resources: tuple[str, ...]) -> dict[str, int]:
+    return revisions_crud.get_revisions(db, resources=resources)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.crud import slow_queries as slow_queries_crud
+
+
+def record_slow_query_service(db: Session, *, entry: dict, keep: int) -> None:
+    """Store one captured slow query (see app.utils.slow_queries) and cap the log to `keep` rows."""
+    slow_queries_crud.create_slow_query(db, payload=entry)
+    db.flush()
+    slow_queries_crud.prune_slow_queries(db, keep=keep)
+    db.commit()
+
+
+def _loads(value: Optional[str]):
+    return json.loads(value) if value else None
+
+
+def top_slow_queries_service(db: Session, *, limit: int, since: Optional[datetime] = None) -> list[dict]:
+    """Slowest statement shapes by total time, with the latest sample (statement, plan) of each."""
+    rows = slow_queries_crud.top_slow_queries(db, limit=limit, since=since)
+    samples = {s.id: s for s in slow_queries_crud.get_slow_queries_by_ids(db, ids=[r.last_id for r in rows])}
+    out = []
+    for r in rows:
+        sample = samples.get(r.last_id)
+        out.append(
+            {
+                "fingerprint": r.fingerprint,
+                "calls": r.calls,
+                "total_ms": round(r.total_ms, 1),
+                "max_ms": round(r.max_ms, 1),
+                "avg_ms": round(r.avg_ms, 1),
+                "last_seen": r.last_seen,
+                "statement": sample.statement if sample else "",
+                "parameters": _loads(sample.parameters) if sample else None,
+                "plan": _loads(sample.plan) if sample else None,
+                "path": sample.path if sample else None,
+            }
+        )
+    return out
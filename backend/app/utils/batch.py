@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+from urllib.parse import urlsplit
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# In-process GET sub-requests (POST /batch).
+#
+# Each sub-request is run through the whole ASGI application (middlewares included: response
+# cache, metrics, SQL timing, rate limiting), as if it came from the same client: its
+# Authorization, Cookie and Accept-Language headers are forwarded, and X-Forwarded-For so that
+# the rate limiter keys sub-requests on the client's IP, not the proxy's (TRUST_PROXY_HEADERS);
+# Accept-Encoding is not (the batch response is compressed as a whole). Sub-requests are independent GETs and run concurrently; see
+# database.shared_session for the DB side.
+
+FORWARDED_HEADERS = (b"authorization", b"cookie", b"accept-language", b"x-forwarded-for")
+RETURNED_HEADERS = (b"content-type", b"etag", b"last-modified", b"cache-control", b"x-next-cursor", b"x-cache")
+
+
+class SubResponse:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: list[tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+def split_target(target: str) -> tuple[str, str]:
+    """'/dictionnaire/?page=2' -> ('/dictionnaire/', 'page=2'); only local paths are accepted."""
+    parts = urlsplit(target)
+    if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+        raise ValueError(f"Chemin invalide: {target}")
+    return parts.path, parts.query
+
+
+def _sub_scope(parent: dict, path: str, query: str, headers: list[tuple[bytes, bytes]]) -> dict:
+    scope = {
+        key: parent[key]
+        for key in ("asgi", "http_version", "scheme", "server", "client", "root_path", "app")
+        if key in parent
+    }
+    forwarded = [(k, v) for k, v in parent["headers"] if k in FORWARDED_HEADERS]
+    scope.update(
+        type="http",
+        method="GET",
+        path=path,
+        raw_path=path.encode("utf-8"),
+        query_string=query.encode("latin-1"),
+        headers=[*forwarded, *headers],
+        state=dict(parent.get("state") or {}),
+    )
+    return scope
+
+
+async def call(app, parent_scope: dict, target: str, headers: Optional[list[tuple[bytes, bytes]]] = None) -> SubResponse:
+    path, query = split_target(target)
+    status = 500
+    response_headers: list[tuple[bytes, bytes]] = []
+    chunks: list[bytes] = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # no disconnect: the batch waits for every sub-response
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(_sub_scope(parent_scope, path, query, headers or []), receive, send)
+    except Exception:
+        # Already answered with a 500 by ServerErrorMiddleware: the other sub-requests go on
+        logger.exception("Batch sub-request failed: GET %s", target)
+        if not response_headers:
+            return SubResponse(500, [], b"")
+    return SubResponse(status, response_headers, b"".join(chunks))
+
+
+async def call_all(app, parent_scope: dict, requests: list[tuple[str, list[tuple[bytes, bytes]]]]) -> list[SubResponse]:
+    return list(await asyncio.gather(*(call(app, parent_scope, target, headers) for target, headers in requests)))
+
+
+def render(items: list[tuple[Optional[str], SubResponse]]) -> bytes:
+    """{"responses": [{"id", "status", "headers", "body"}]}; JSON bodies are embedded as is (no re-parsing)."""
+    parts = []
+    for item_id, sub in items:
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in sub.headers if k.lower() in RETURNED_HEADERS}
+        meta = orjson.dumps({"id": item_id, "status": sub.status, "headers": headers})
+        is_json = headers.get("content-type", "").startswith("application/json")
+        if not sub.body:
+            body = b"null"
+        elif is_json:
+            body = sub.body
+        else:
+            body = orjson.dumps(sub.body.decode("utf-8", errors="replace"))
+        parts.append(meta[:-1] + b',"body":' + body + b"}")
+    return b'{"responses":[' + b",".join(parts) + b"]}"
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.http_cache import negotiate_encoding
+
+try:  # optional: without it only gzip is offered
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Response compression (gzip, Brotli when the `brotli` package is installed).
+#
+# - the encoding is negotiated from Accept-Encoding (q-values; Brotli preferred on a tie);
+# - only textual content types, only bodies of at least `min_size` bytes, never responses
+#   that already carry a Content-Encoding (feeds, cached variants) or Cache-Control: no-transform;
+# - bodies of at least `offload_size` bytes are compressed in the threadpool, off the event loop;
+# - a compressed representation gets a weak ETag (W/"..."): conditional requests keep
+#   working since ETags are compared weakly (http_cache.etag_matches).
+# The response cache stores every encoding of an entry (Compression.variants), so a cached
+# payload is compressed once, when it is stored.
+
+ENCODINGS: tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+IDENTITY = "identity"
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/feed+json",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    return next((v for k, v in headers if k.lower() == name), None)
+
+
+@dataclass(frozen=True)
+class Compression:
+    min_size: int = 1024
+    offload_size: int = 64 * 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+
+    def negotiate(self, scope) -> Optional[str]:
+        accept = _header(scope.get("headers", []), b"accept-encoding")
+        return negotiate_encoding(accept.decode("latin-1") if accept else None, ENCODINGS)
+
+    def compressible(self, headers) -> bool:
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+        cache_control = (_header(headers, b"cache-control") or b"").decode("latin-1").lower()
+        return (
+            content_type.startswith(_COMPRESSIBLE_TYPES)
+            and _header(headers, b"content-encoding") is None
+            and "no-transform" not in cache_control
+        )
+
+    # --- whole bodies ---
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress_async(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.offload_size:
+            return await run_in_threadpool(self.compress, body, encoding)
+        return self.compress(body, encoding)
+
+    def _variants(self, body: bytes) -> dict[str, bytes]:
+        out = {IDENTITY: body}
+        if len(body) >= self.min_size:
+            out.update((encoding, self.compress(body, encoding)) for encoding in ENCODINGS)
+        return out
+
+    async def variants(self, body: bytes) -> dict[str, bytes]:
+        """The body in every supported encoding (identity only below `min_size`)."""
+        if len(body) >= self.offload_size:
+            return await run_in_threadpool(self._variants, body)
+        return self._variants(body)
+
+    # --- streamed bodies ---
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            c = brotli.Compressor(quality=self.brotli_quality)
+            return c.process, c.finish
+        c = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        return c.compress, c.flush
+
+
+def encoded_headers(headers, encoding: str, length: Optional[int]) -> list[tuple[bytes, bytes]]:
+    """`headers` of an identity response adapted to `encoding` (None length: streamed, kept as is)."""
+    out = []
+    vary = True
+    for k, v in headers:
+        name = k.lower()
+        if name == b"content-length" and (encoding != IDENTITY or length is not None):
+            continue
+        if name == b"etag" and encoding != IDENTITY and not v.startswith(b"W/"):
+            v = b"W/" + v
+        if name == b"vary" and vary:
+            if b"accept-encoding" not in v.lower():
+                v = v + b", Accept-Encoding"
+            vary = False
+        out.append((k, v))
+    if vary:
+        out.append((b"vary", b"Accept-Encoding"))
+    if encoding != IDENTITY:
+        out.append((b"content-encoding", encoding.encode("latin-1")))
+    if length is not None:
+        out.append((b"content-length", str(length).encode("latin-1")))
+    return out
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing textual responses per Accept-Encoding."""
+
+    def __init__(self, app, *, compression: Compression):
+        self.app = app
+        self.compression = compression
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        compression = self.compression
+        encoding = compression.negotiate(scope) or IDENTITY
+        held: Optional[dict] = None  # start message, until the first body chunk tells the size
+        stream = None  # (compress, flush) while streaming compressed chunks
+
+        async def send_wrapper(message):
+            nonlocal held, stream
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if message["status"] in (204, 304) or not compression.compressible(headers):
+                    await send(message)
+                else:
+                    held = message
+                return
+            if message["type"] != "http.response.body" or (held is None and stream is None):
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if held is not None:
+                start, held = held, None
+                headers = start.get("headers", [])
+                if encoding == IDENTITY or (not more and len(body) < compression.min_size):
+                    await send({**start, "headers": encoded_headers(headers, IDENTITY, None if more else len(body))})
+                    await send(message)
+                    return
+                if not more:
+                    # Whole body in one message (the usual case)
+                    body = await compression.compress_async(body, encoding)
+                    await send({**start, "headers": encoded_headers(headers, encoding, len(body))})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                stream = compression.compressor(encoding)
+                await send({**start, "headers": encoded_headers(headers, encoding, None)})
+
+            compress, flush = stream
+            chunk = compress(body) + (b"" if more else flush())
+            if not more:
+                stream = None
+            await send({"type": "http.response.body", "body": chunk, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.database import DbSession, get_read_db, run_db
+from app.services import revisions as revisions_service
+from app.utils.http_cache import etag_matches, weak_etag
+
+# Conditional GET for read endpoints: the ETag is derived from the revision counters of
+# the tables the endpoint reads plus the path and normalized query string, so a matching
+# If-None-Match is answered with 304 after a single primary-key lookup, before the
+# endpoint's own query runs.
+
+
+def request_etag(request: Request, revisions: dict[str, int]) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    revs = ",".join(f"{r}:{n}" for r, n in sorted(revisions.items()))
+    return weak_etag(request.url.path, query, revs)
+
+
+def conditional_get(*resources: str) -> Callable[..., str]:
+    """Dependency factory: sets ETag on the response, or raises 304 if the client is up to date.
+
+    Returns the ETag, for endpoints that build their own Response (headers of the injected
+    `response` are not merged into a returned Response).
+    """
+
+    async def dependency(request: Request, response: Response, db: DbSession = Depends(get_read_db)) -> str:
+        revisions = await run_db(db, revisions_service.current_revisions, resources=resources)
+        etag = request_etag(request, revisions)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return dependency
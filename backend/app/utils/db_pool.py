@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Checkout wait buckets (seconds): most checkouts are immediate, the tail is what matters.
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolStats:
+    __slots__ = ("name", "wait", "timeouts", "invalidated")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait = Histogram(POOL_WAIT_BUCKETS)  # time spent in checkout (queue wait + connect)
+        self.timeouts = Counter()  # checkouts that gave up after pool_timeout
+        self.invalidated = Counter()  # idle connections found dead on checkout
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats | None = None
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.timeouts.inc()
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.wait.observe(time.perf_counter() - t0)
+
+    def recreate(self):
+        # engine.dispose() rebuilds the pool: keep accumulating into the same stats
+        new = super().recreate()
+        new.stats = self.stats
+        return new
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:")
+
+
+def pool_kwargs(url: str, settings, *, use_async: bool) -> dict:
+    """create_engine / create_async_engine keyword arguments for the configured pool."""
+    if _is_memory_sqlite(url):
+        # In-memory SQLite needs its single-connection pool; sizing does not apply.
+        return {"pool_pre_ping": settings.db_pool_pre_ping}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def instrument_engine(engine, *, name: str, idle_check_seconds: int, pre_ping: bool) -> PoolStats:
+    """Attach PoolStats and, unless pre_ping is on, an idle-only liveness check.
+
+    Instead of a SELECT 1 on every checkout, only connections that sat idle in the pool
+    longer than `idle_check_seconds` are pinged; recently used ones are handed out as-is.
+    A dead connection is discarded and the pool transparently retries with a fresh one.
+    """
+    stats = PoolStats(name)
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.stats = stats
+
+    if pre_ping or idle_check_seconds <= 0:
+        return stats
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        last = record.info.get("last_checkin")
+        if last is None or time.monotonic() - last < idle_check_seconds:
+            return
+        try:
+            alive = engine.dialect.do_ping(dbapi_conn)
+        except Exception:
+            alive = False
+        if not alive:
+            stats.invalidated.inc()
+            logger.info("Pool %s: idle connection was dead, reconnecting", name)
+            raise sa_exc.DisconnectionError()
+        record.info["last_checkin"] = time.monotonic()
+
+    return stats
+
+
+def pool_status(engine, stats: PoolStats) -> dict:
+    pool = engine.pool
+    out = {"name": stats.name}
+    for attr, key in (("size", "size"), ("checkedout", "checked_out"), ("checkedin", "checked_in"), ("overflow", "overflow")):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            out[key] = fn()
+    wait = stats.wait.snapshot()
+    out.update(
+        timeouts=int(stats.timeouts.value),
+        invalidated=int(stats.invalidated.value),
+        wait_seconds_sum=round(wait["sum"], 6),
+        wait_count=wait["count"],
+    )
+    return out
+
+
+def pool_metrics(pools) -> list:
+    """Registry collector (see app.utils.metrics): pool gauges and counters per engine."""
+    size, conns, wait, timeouts, invalidated = [], [], [], [], []
+    for engine, stats in pools:
+        status = pool_status(engine, stats)
+        label = {"pool": stats.name}
+        if "size" in status:
+            size.append((label, status["size"]))
+        for state in ("checked_out", "checked_in", "overflow"):
+            if state in status:
+                conns.append(({**label, "state": state}, status[state]))
+        wait.append((label, stats.wait.snapshot()))
+        timeouts.append((label, stats.timeouts.value))
+        invalidated.append((label, stats.invalidated.value))
+    return [
+        ("db_pool_size", "gauge", "Configured pool size.", size),
+        ("db_pool_connections", "gauge", "Pool connections by state.", conns),
+        ("db_pool_checkout_wait_seconds", "histogram", "Time spent waiting for a pooled connection.", wait),
+        ("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT.", timeouts),
+        ("db_pool_invalidated_total", "counter", "Idle connections found dead on checkout.", invalidated),
+    ]
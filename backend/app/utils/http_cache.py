@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+# Helpers for HTTP validators (ETag / Last-Modified) and conditional requests.
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def weak_etag(*parts: str) -> str:
+    """Weak validator derived from inputs (revisions, path, query) rather than from the body."""
+    return 'W/"' + hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2): `If-None-Match` may list several tags or be `*`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(t) == wanted for t in if_none_match.split(","))
+
+
+def http_date(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None:
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have a one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _encoding_qvalues(accept_encoding: Optional[str]) -> dict[str, float]:
+    out = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for p in params.split(";"):
+            k, _, v = p.strip().partition("=")
+            if k == "q":
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        out[name] = q
+    return out
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """True if `encoding` is listed in Accept-Encoding with a non-zero q-value."""
+    q = _encoding_qvalues(accept_encoding)
+    return q.get(encoding, q.get("*", 0.0)) > 0
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: tuple[str, ...]) -> Optional[str]:
+    """Best of `available` (in order of preference on a tie) for Accept-Encoding, or None (identity)."""
+    q = _encoding_qvalues(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in available:
+        value = q.get(encoding, q.get("*", 0.0))
+        if value > best_q:
+            best, best_q = encoding, value
+    return best
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+# Login rate limiter state (routes.auth): per key ("ip:<addr>", "user:<name>") a failure
+# count within a rolling window, progressive backoff and a lockout after too many failures.
+#
+# Backends (LOGIN_LIMITER_BACKEND), all atomic and O(1) per check / failure:
+# - memory:   per process (one worker: simplest; N workers: N times the attempts);
+# - mmap:     fixed-size hash table in a file mapped by every worker of the host, under flock;
+# - postgres: UNLOGGED table `login_limiter` (shared by all nodes), one UPSERT per key;
+# - redis:    any Redis-protocol server, one Lua script per key (shared by all nodes).
+# Shared backends store a SHA-256 of the key, never the IP address or username.
+
+
+@dataclass(frozen=True)
+class LoginPolicy:
+    window_seconds: float = 300  # rolling window for failures
+    max_attempts: int = 5  # lockout threshold
+    lockout_seconds: float = 900  # lockout duration after max attempts
+    base_delay_seconds: float = 1  # progressive backoff base
+    max_delay_seconds: float = 30  # cap for backoff delay
+
+    @property
+    def ttl_seconds(self) -> float:
+        """State older than this (since the last failure) no longer matters."""
+        return self.window_seconds + self.lockout_seconds + 60
+
+    def delay(self, fail_count: int) -> float:
+        # exponent capped: a key failing for hours must not build ever larger integers
+        return min(self.max_delay_seconds, self.base_delay_seconds * (2 ** min(max(0, fail_count - 1), 62)))
+
+    def after_failure(self, fail_count: int, first_fail: float, blocked_until: float, now: float) -> tuple[int, float, float]:
+        """(fail_count, first_fail, blocked_until) after one more failure at `now`."""
+        if fail_count == 0 or now - first_fail > self.window_seconds:
+            fail_count, first_fail, blocked_until = 0, now, 0.0
+        fail_count += 1
+        blocked_until = max(blocked_until, now + self.delay(fail_count))
+        if fail_count >= self.max_attempts:
+            blocked_until = max(blocked_until, now + self.lockout_seconds)
+        return fail_count, first_fail, blocked_until
+
+
+def wait_seconds(blocked_until: float, now: float) -> int:
+    return int(blocked_until - now) + 1 if blocked_until > now else 0
+
+
+def digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+# ==========================
+# In-process
+# ==========================
+class _Record:
+    __slots__ = ("fail_count", "first_fail", "blocked_until", "last")
+
+    def __init__(self, fail_count: int, first_fail: float, blocked_until: float, last: float):
+        self.fail_count = fail_count
+        self.first_fail = first_fail
+        self.blocked_until = blocked_until
+        self.last = last
+
+
+class MemoryBackend:
+    """Keys in an OrderedDict kept in order of last failure (moved to the end on update).
+
+    Expiry pops stale entries from the front until a fresh one is found, and the LRU cap
+    (`max_keys`) pops the front too: every entry is removed at most once, so both are
+    amortized O(1) whatever the number of tracked keys.
+    """
+
+    blocking = False
+
+    def __init__(self, policy: LoginPolicy, *, max_keys: int = 100_000):
+        self.policy = policy
+        self.max_keys = max_keys
+        self._state: OrderedDict[str, _Record] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.policy.ttl_seconds
+        state = self._state
+        while state:
+            key = next(iter(state))
+            if state[key].last >= cutoff:
+                break
+            del state[key]
+
+    def blocked_seconds(self, keys: Sequence[str], now: float) -> int:
+        with self._lock:
+            self._expire(now)
+            wait = 0
+            for key in keys:
+                rec = self._state.get(key)
+                if rec is not None:
+                    wait = max(wait, wait_seconds(rec.blocked_until, now))
+            return wait
+
+    def register_failure(self, keys: Sequence[str], now: float) -> None:
+        with self._lock:
+            self._expire(now)
+            for key in keys:
+                rec = self._state.get(key)
+                if rec is None:
+                    rec = self._state[key] = _Record(0, now, 0.0, now)
+                    if len(self._state) > self.max_keys:
+                        self._state.popitem(last=False)
+                else:
+                    self._state.move_to_end(key)
+                rec.fail_count, rec.first_fail, rec.blocked_until = self.policy.after_failure(
+                    rec.fail_count, rec.first_fail, rec.blocked_until, now
+                )
+                rec.last = now
+
+    def clear(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._state.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        return len(self._state)
+
+
+# ==========================
+# Shared memory (same host)
+# ==========================
+_MAGIC = b"LLIM"
+_HEADER = struct.Struct("<4sII4x")  # magic, version, slots
+_SLOT = struct.Struct("<16sIxxxxddd")  # key digest, fail_count, first_fail, blocked_until, last
+_EMPTY = bytes(16)
+
+
+class MmapBackend:
+    """Open-addressing hash table in a memory-mapped file, shared by the workers of a host.
+
+    A key lives in one of PROBE consecutive slots from its hash; inserting into a full probe
+    window evicts the least recently failed entry there, so each operation touches at most
+    PROBE slots whatever the number of keys. Operations hold an exclusive flock on the file
+    (microseconds) plus a thread lock (flock does not exclude threads of one process).
+    """
+
+    blocking = False
+    PROBE = 16
+
+    def __init__(self, policy: LoginPolicy, *, path: str, slots: int = 65536):
+        self.policy = policy
+        self.path = path
+        self.slots = slots
+        self._lock = threading.Lock()
+        size = _HEADER.size + slots * _SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+            self._map = mmap.mmap(self._fd, size)
+            magic, _, existing = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC or existing != slots:
+                self._map[:] = bytes(size)
+                _HEADER.pack_into(self._map, 0, _MAGIC, 1, slots)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        return _HEADER.size + (index % self.slots) * _SLOT.size
+
+    def _find(self, key_digest: bytes, now: float, *, insert: bool) -> Optional[int]:
+        start = int.from_bytes(key_digest[:8], "little")
+        free = None
+        oldest, oldest_last = None, float("inf")
+        for i in range(self.PROBE):
+            off = self._offset(start + i)
+            d, _, _, _, last = _SLOT.unpack_from(self._map, off)
+            if d == key_digest:
+                return off
+            if d == _EMPTY or now - last > self.policy.ttl_seconds:
+                free = off if free is None else free
+            elif last < oldest_last:
+                oldest, oldest_last = off, last
+        if not insert:
+            return None
+        return free if free is not None else oldest
+
+    def blocked_seconds(self, keys: Sequence[str], now: float) -> int:
+        wait = 0
+        with self._locked():
+            for key in keys:
+                off = self._find(digest(key)[:16], now, insert=False)
+                if off is not None:
+                    wait = max(wait, wait_seconds(_SLOT.unpack_from(self._map, off)[3], now))
+        return wait
+
+    def register_failure(self, keys: Sequence[str], now: float) -> None:
+        with self._locked():
+            for key in keys:
+                d = digest(key)[:16]
+                off = self._find(d, now, insert=True)
+                existing, count, first, blocked, last = _SLOT.unpack_from(self._map, off)
+                if existing != d or now - last > self.policy.ttl_seconds:
+                    count, first, blocked = 0, now, 0.0
+                _SLOT.pack_into(self._map, off, d, *self.policy.after_failure(count, first, blocked, now), now)
+
+    def clear(self, keys: Sequence[str]) -> None:
+        with self._locked():
+            for key in keys:
+                off = self._find(digest(key)[:16], 0.0, insert=False)
+                if off is not None:
+                    _SLOT.pack_into(self._map, off, _EMPTY, 0, 0.0, 0.0, 0.0)
+
+    def size(self) -> Optional[int]:
+        # Scrape-time only (O(slots))
+        n = 0
+        for i in range(self.slots):
+            if self._map[self._offset(i) : self._offset(i) + 16] != _EMPTY:
+                n += 1
+        return n
+
+
+# ==========================
+# Postgres (UNLOGGED table)
+# ==========================
+class DatabaseBackend:
+    """Table `login_limiter` (models.LoginLimiterEntry; UNLOGGED on Postgres, see migration).
+
+    A failure is one UPSERT per key computing the new state from the locked row, so
+    concurrent failures from several nodes are never lost. Stale rows are pruned every
+    `prune_every` failures (index on `last`).
+    """
+
+    blocking = True
+
+    def __init__(self, policy: LoginPolicy, *, engine, prune_every: int = 1000):
+        self.policy = policy
+        self.engine = engine
+        self.prune_every = prune_every
+        self._failures = 0
+        self._upsert = None
+
+    def _table(self):
+        from app.models import LoginLimiterEntry
+
+        return LoginLimiterEntry.__table__
+
+    def blocked_seconds(self, keys: Sequence[str], now: float) -> int:
+        from sqlalchemy import func, select
+
+        t = self._table()
+        with self.engine.connect() as conn:
+            blocked = conn.execute(
+                select(func.max(t.c.blocked_until)).where(t.c.key.in_([digest(k).hex() for k in keys]))
+            ).scalar()
+        return wait_seconds(blocked or 0.0, now)
+
+    def _upsert_statement(self):
+        from sqlalchemy import bindparam, case, func, literal
+
+        t = self._table()
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        greatest = func.greatest if dialect == "postgresql" else func.max
+
+        p = self.policy
+        now = bindparam("now")
+        reset = (now - t.c.first_fail) > p.window_seconds
+        count = case((reset, literal(1)), else_=t.c.fail_count + 1)
+        # backoff delay per count, as a lookup (no power() in every SQL dialect)
+        steps, n = [], 1
+        while p.delay(n) < p.max_delay_seconds and n < 64:
+            steps.append((count == n, literal(p.delay(n))))
+            n += 1
+        delay = case(*steps, else_=literal(p.max_delay_seconds)) if steps else literal(p.max_delay_seconds)
+        lockout = case((count >= p.max_attempts, now + p.lockout_seconds), else_=literal(0.0))
+
+        first_count, first_fail, first_blocked = p.after_failure(0, 0.0, 0.0, 0.0)
+        stmt = insert(t).values(
+            key=bindparam("key"),
+            fail_count=first_count,
+            first_fail=now,
+            blocked_until=now + first_blocked,
+            last=now,
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[t.c.key],
+            set_={
+                "fail_count": count,
+                "first_fail": case((reset, now), else_=t.c.first_fail),
+                "blocked_until": greatest(case((reset, literal(0.0)), else_=t.c.blocked_until), now + delay, lockout),
+                "last": now,
+            },
+        )
+
+    def register_failure(self, keys: Sequence[str], now: float) -> None:
+        if self._upsert is None:
+            self._upsert = self._upsert_statement()
+        with self.engine.begin() as conn:
+            for key in sorted(digest(k).hex() for k in keys):  # fixed order: no deadlock between nodes
+                conn.execute(self._upsert, {"key": key, "now": now})
+        self._failures += 1
+        if self._failures % self.prune_every == 0:
+            self.prune(now)
+
+    def prune(self, now: float) -> None:
+        t = self._table()
+        with self.engine.begin() as conn:
+            conn.execute(t.delete().where(t.c.last < now - self.policy.ttl_seconds))
+
+    def clear(self, keys: Sequence[str]) -> None:
+        t = self._table()
+        with self.engine.begin() as conn:
+            conn.execute(t.delete().where(t.c.key.in_([digest(k).hex() for k in keys])))
+
+    def size(self) -> Optional[int]:
+        return None  # not queried at scrape time
+
+
+# ==========================
+# Redis protocol
+# ==========================
+_FAILURE_SCRIPT = """
+local now, window, max_attempts = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local lockout, base, max_delay, ttl = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6]), tonumber(ARGV[7])
+local s = redis.call('HMGET', KEYS[1], 'c', 'f', 'b')
+local c, f, b = tonumber(s[1]) or 0, tonumber(s[2]) or now, tonumber(s[3]) or 0
+if c == 0 or now - f > window then c, f, b = 0, now, 0 end
+c = c + 1
+b = math.max(b, now + math.min(max_delay, base * 2 ^ math.max(0, c - 1)))
+if c >= max_attempts then b = math.max(b, now + lockout) end
+redis.call('HSET', KEYS[1], 'c', c, 'f', tostring(f), 'b', tostring(b))
+redis.call('EXPIRE', KEYS[1], ttl)
+return c
+"""
+
+
+class RedisBackend:
+    """One hash per key; a failure is one atomic Lua script, expiry is Redis' own TTL."""
+
+    blocking = True
+
+    def __init__(self, policy: LoginPolicy, *, client, prefix: str = "ll:"):
+        self.policy = policy
+        self.client = client
+        self.prefix = prefix
+        self._failure = client.register_script(_FAILURE_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + digest(key).hex()
+
+    def blocked_seconds(self, keys: Sequence[str], now: float) -> int:
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hget(self._key(key), "b")
+        return max((wait_seconds(float(v), now) for v in pipe.execute() if v is not None), default=0)
+
+    def register_failure(self, keys: Sequence[str], now: float) -> None:
+        p = self.policy
+        args = [now, p.window_seconds, p.max_attempts, p.lockout_seconds, p.base_delay_seconds, p.max_delay_seconds,
+                int(p.ttl_seconds)]
+        for key in keys:
+            self._failure(keys=[self._key(key)], args=args)
+
+    def clear(self, keys: Sequence[str]) -> None:
+        self.client.delete(*(self._key(k) for k in keys))
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def build_limiter(settings, policy: LoginPolicy):
+    backend = settings.login_limiter_backend
+    if backend == "mmap":
+        return MmapBackend(policy, path=settings.login_limiter_mmap_path, slots=settings.login_limiter_mmap_slots)
+    if backend == "postgres":
+        from app.database import engine
+
+        return DatabaseBackend(policy, engine=engine)
+    if backend == "redis":
+        import redis
+
+        client = redis.Redis.from_url(settings.login_limiter_redis_url, socket_timeout=1.0)
+        return RedisBackend(policy, client=client)
+    return MemoryBackend(policy, max_keys=settings.login_limiter_max_keys)
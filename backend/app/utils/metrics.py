@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Dependency-free metric primitives (thread-safe, cheap to update on hot paths).
+
+# Latency buckets in seconds (Prometheus-style upper bounds; +Inf is implicit).
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound ("+Inf" last), plus sum and count."""
+        with self._lock:
+            counts = list(self.counts)
+            total, n = self.sum, self.count
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, c in zip([*map(repr, self.buckets), "+Inf"], counts):
+            running += c
+            cumulative[bound] = running
+        return {"buckets": cumulative, "sum": total, "count": n}
+
+
+class Gauge:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+# ==========================
+# Registry (exported by GET /metrics, see app.utils.prometheus)
+# ==========================
+# A sample is (labels, value); histogram values are Histogram.snapshot() dicts.
+Sample = Tuple[Dict[str, str], Any]
+# Collectors are called at export time for state owned elsewhere (pools, limiter, ...):
+# they return (name, kind, help, samples) tuples.
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+
+class MetricFamily:
+    """Metric with a fixed set of label names; one child metric per label values tuple."""
+
+    def __init__(self, name: str, kind: str, help: str, labelnames: Sequence[str] = (), buckets=None) -> None:
+        self.name = name
+        self.kind = kind  # counter | gauge | histogram
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._buckets = buckets or DEFAULT_LATENCY_BUCKETS
+        self._children: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _new(self):
+        if self.kind == "histogram":
+            return Histogram(self._buckets)
+        return Gauge() if self.kind == "gauge" else Counter()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new())
+        return child
+
+    def samples(self) -> List[Sample]:
+        out = []
+        for values, child in list(self._children.items()):
+            value = child.snapshot() if self.kind == "histogram" else child.value
+            out.append((dict(zip(self.labelnames, values)), value))
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, kind: str, help: str, labelnames: Sequence[str], buckets=None) -> MetricFamily:
+        with self._lock:
+            fam = self._families.get(name)
+            if fam is None:
+                fam = self._families[name] = MetricFamily(name, kind, help, labelnames, buckets)
+            elif fam.kind != kind or fam.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} already registered with another type or labels")
+            return fam
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, "counter", help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, "gauge", help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=None) -> MetricFamily:
+        return self._family(name, "histogram", help, labelnames, buckets)
+
+    def register_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        """{name: {"type", "help", "samples"}} for this process (JSON-serializable)."""
+        out = {
+            fam.name: {"type": fam.kind, "help": fam.help, "samples": fam.samples()}
+            for fam in list(self._families.values())
+        }
+        for collector in list(self._collectors):
+            for name, kind, help, samples in collector():
+                out[name] = {"type": kind, "help": help, "samples": list(samples)}
+        return out
+
+
+REGISTRY = Registry()
+
+# Shared by every cache (feeds, ...): hit ratio = hit / (hit + miss) per `cache` label.
+CACHE_REQUESTS = REGISTRY.counter("app_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
@@ -4,7 +4,9 @@ Module: pagination.py
 Description: Utilitaires pour la pagination des résultats SQLAlchemy.
 """
 
-from typing import Any, List
+import base64
+from datetime import datetime, timezone
+from typing import Any, List, Tuple
 from sqlalchemy.orm import Query
 
 
@@ -31,3 +33,34 @@ def paginate_with_meta(query: Query, skip: int = 0, limit: int = 10) -> dict:
         "limit": limit,
         "items": items
     }
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    """
+    Encode une position (horodatage, id) en curseur opaque (base64 url-safe).
+    """
+    raw = f"{as_utc(ts).isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Décode un curseur produit par `encode_cursor`.
+    Lève ValueError si le curseur est invalide.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts_part, id_part = raw.rsplit("|", 1)
+        return as_utc(datetime.fromisoformat(ts_part)), int(id_part)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Curseur invalide") from e
+
+
+def as_utc(ts: datetime) -> datetime:
+    """
+    Normalise un datetime en UTC (les valeurs naïves sont considérées comme UTC).
+    """
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import logging
+import select
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+# Cross-node cache invalidation: background thread LISTENing on the channel the write
+# services NOTIFY on (services.changes.record_change). For each change committed by another
+# node, the local caches of that resource are dropped.
+#
+# Notifications sent while this node is not listening are lost, so the caches are fully
+# flushed whenever that may have happened:
+# - after a reconnect (the connection dropped, possibly in the middle of writes);
+# - on a gap in the change revisions: they are gap-free and NOTIFY delivers in commit order,
+#   so a jump means a notification went missing.
+
+
+class CacheInvalidationListener:
+    def __init__(
+        self,
+        url: str,
+        *,
+        channel: str,
+        node_id: str,
+        on_change: Callable[[str], None],
+        on_flush: Callable[[], None],
+        poll_seconds: float = 30.0,
+        min_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+    ):
+        self.url = url
+        self.channel = channel
+        self.node_id = node_id
+        self.on_change = on_change
+        self.on_flush = on_flush
+        self.poll_seconds = poll_seconds
+        self.min_backoff_seconds = min_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.last_revision: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- lifecycle ---
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="cache-invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self) -> None:
+        backoff = self.min_backoff_seconds
+        connected_before = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                if connected_before:
+                    logger.warning("Cache invalidation listener reconnected: flushing local caches")
+                    self._flush()
+                connected_before = True
+                backoff = self.min_backoff_seconds
+                while not self._stop.is_set():
+                    for payload in self._wait(conn, self.poll_seconds):
+                        self.handle(payload)
+            except Exception:
+                logger.warning("Cache invalidation listener disconnected, retrying in %.0fs", backoff, exc_info=True)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff_seconds)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    # --- messages ---
+    def handle(self, payload: str) -> None:
+        try:
+            msg = json.loads(payload)
+            revision = int(msg["revision"])
+            resource = str(msg["resource"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation payload: %r", payload[:200])
+            return
+
+        if self.last_revision is not None and revision > self.last_revision + 1:
+            logger.warning("Missed cache invalidations (%s -> %s): flushing local caches", self.last_revision, revision)
+            self._flush()
+        if self.last_revision is None or revision > self.last_revision:
+            self.last_revision = revision
+        if msg.get("node") != self.node_id:
+            self.on_change(resource)
+
+    def _flush(self) -> None:
+        self.last_revision = None
+        self.on_flush()
+
+    # --- Postgres (psycopg2) ---
+    def _connect(self):
+        u = make_url(self.url)
+        engine = create_engine(u.set(drivername=u.get_backend_name()), poolclass=NullPool)
+        raw = engine.raw_connection().driver_connection
+        raw.autocommit = True
+        with raw.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+        return raw
+
+    def _wait(self, conn, timeout: float) -> list[str]:
+        readable, _, _ = select.select([conn], [], [], timeout)
+        if not readable:
+            # Idle: make sure the connection is still alive (half-open TCP goes unnoticed).
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+        conn.poll()
+        payloads = [n.payload for n in conn.notifies]
+        conn.notifies.clear()
+        return payloads
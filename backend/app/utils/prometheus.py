@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.utils.metrics import REGISTRY, Registry
+
+logger = logging.getLogger(__name__)
+
+# Prometheus text exposition (format 0.0.4) of app.utils.metrics.REGISTRY.
+#
+# Multi-worker (uvicorn --workers / gunicorn): each worker process has its own registry, so a
+# scrape hitting one worker would only see a fraction of the traffic. With METRICS_DIR set,
+# every worker periodically writes its snapshot to METRICS_DIR/metrics_<pid>.json (atomic
+# rename) and GET /metrics merges all files:
+# - counters and histograms are summed over every file, including workers that have exited,
+#   so totals stay monotonic across worker restarts;
+# - gauges (in flight, pool sizes, limiter size) are summed over live workers only.
+# The answering worker's own data is current; the others' lag by at most METRICS_FLUSH_SECONDS.
+# METRICS_DIR must be emptied when the service (re)starts, like prometheus_client's
+# PROMETHEUS_MULTIPROC_DIR.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_FILE_PREFIX = "metrics_"
+
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the last body chunk.", ("method", "route")
+)
+HTTP_RESPONSE_SIZE = REGISTRY.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size.",
+    ("method", "route"),
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests being processed.").labels()
+
+
+def _route_label(scope) -> str:
+    # Route template ("/articles/{article_id}"), never the raw path: bounded cardinality.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class HttpMetricsMiddleware:
+    """Pure ASGI middleware recording per-route count, latency, response size and in-flight."""
+
+    def __init__(self, app, *, metrics_dir: str = "", flush_seconds: float = 5.0):
+        self.app = app
+        self.exporter = SnapshotWriter(metrics_dir, flush_seconds) if metrics_dir else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.exporter is not None:
+            self.exporter.ensure_started()
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            method, route = scope["method"], _route_label(scope)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+# ==========================
+# Multi-process snapshots
+# ==========================
+class SnapshotWriter:
+    """Writes this process' registry snapshot to `directory` every `interval` seconds."""
+
+    def __init__(self, directory: str, interval: float, registry: Registry = REGISTRY):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.registry = registry
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        # Started lazily (and again after a fork): threads do not survive fork().
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            threading.Thread(target=self._run, name="metrics-writer", daemon=True).start()
+            atexit.register(self.write)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except Exception:
+                logger.exception("Could not write metrics snapshot")
+
+    def write(self) -> None:
+        write_snapshot(self.directory, self.registry)
+
+
+def write_snapshot(directory: Path, registry: Registry = REGISTRY) -> None:
+    pid = os.getpid()
+    path = directory / f"{_FILE_PREFIX}{pid}.json"
+    tmp = directory / f".{_FILE_PREFIX}{pid}.tmp"
+    tmp.write_text(json.dumps({"pid": pid, "metrics": registry.snapshot()}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots(directory: Path) -> list[tuple[int, dict]]:
+    out = []
+    for path in directory.glob(f"{_FILE_PREFIX}*.json"):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            out.append((int(data["pid"]), data["metrics"]))
+        except (OSError, ValueError, KeyError):
+            continue  # removed or unreadable: skip it for this scrape
+    return out
+
+
+def _merge(snapshots: list[tuple[int, dict]]) -> dict:
+    merged: dict[str, dict] = {}
+    for pid, metrics in snapshots:
+        alive = _pid_alive(pid)
+        for name, fam in metrics.items():
+            if fam["type"] == "gauge" and not alive:
+                continue
+            out = merged.setdefault(name, {"type": fam["type"], "help": fam["help"], "samples": {}})
+            for labels, value in fam["samples"]:
+                key = tuple(sorted(labels.items()))
+                prev = out["samples"].get(key)
+                if prev is None:
+                    out["samples"][key] = value
+                elif fam["type"] == "histogram":
+                    out["samples"][key] = {
+                        "buckets": {b: prev["buckets"].get(b, 0) + c for b, c in value["buckets"].items()},
+                        "sum": prev["sum"] + value["sum"],
+                        "count": prev["count"] + value["count"],
+                    }
+                else:
+                    out["samples"][key] = prev + value
+    return {
+        name: {**fam, "samples": [(dict(k), v) for k, v in fam["samples"].items()]}
+        for name, fam in merged.items()
+    }
+
+
+def collect(metrics_dir: str = "", registry: Registry = REGISTRY) -> dict:
+    """Registry snapshot, merged across worker processes when `metrics_dir` is set."""
+    if not metrics_dir:
+        return registry.snapshot()
+    directory = Path(metrics_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    write_snapshot(directory, registry)  # this worker's view is always current
+    return _merge(_read_snapshots(directory))
+
+
+def _with_cache_ratios(metrics: dict) -> dict:
+    fam = metrics.get("app_cache_requests_total")
+    if not fam:
+        return metrics
+    totals: dict[str, list[float]] = {}
+    for labels, value in fam["samples"]:
+        hit_total = totals.setdefault(labels.get("cache", ""), [0.0, 0.0])
+        hit_total[1] += value
+        if labels.get("result") == "hit":
+            hit_total[0] += value
+    ratios = [({"cache": cache}, hits / total) for cache, (hits, total) in totals.items() if total]
+    return {
+        **metrics,
+        "app_cache_hit_ratio": {"type": "gauge", "help": "Cache hit ratio since start.", "samples": ratios},
+    }
+
+
+# ==========================
+# Text format
+# ==========================
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(metrics: dict) -> str:
+    lines = []
+    for name in sorted(metrics):
+        fam = metrics[name]
+        lines.append(f"# HELP {name} {_escape(fam['help'])}")
+        lines.append(f"# TYPE {name} {fam['type']}")
+        for labels, value in fam["samples"]:
+            if fam["type"] != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for bound, count in value["buckets"].items():
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def render_metrics(metrics_dir: str = "") -> str:
+    return render(_with_cache_ratios(collect(metrics_dir)))
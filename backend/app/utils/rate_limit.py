@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Mapping, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.utils.metrics import REGISTRY
+
+# Token buckets for public reads (RATE_LIMIT_PER_MINUTE): one bucket per (client IP, route
+# class), refilled continuously up to `burst` tokens. A request costs the tokens of its
+# class (RATE_LIMIT_COSTS: a search costs more than a list page, a list page more than a
+# by-id read); without enough tokens it gets a 429 with Retry-After.
+
+SEARCH = "search"
+LIST = "list"
+ITEM = "item"
+DEFAULT_COSTS = {SEARCH: 5, LIST: 2, ITEM: 1}
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+# Not throttled: probes / scraping by monitoring, and /auth (own limiter, see routes.auth)
+_EXEMPT_PREFIXES = ("/health", "/metrics", "/auth/", "/docs", "/openapi.json", "/redoc")
+_ID_SEGMENT = re.compile(r"/\d+(?:/|$)")
+_SEARCH_PARAMS = re.compile(rb"(?:^|&)(?:search|q)=[^&]")
+
+THROTTLED = REGISTRY.counter(
+    "app_rate_limited_total", "Public read requests rejected by the token-bucket limiter.", ("route_class",)
+)
+
+
+def route_class(path: str, query_string: bytes) -> Optional[str]:
+    """search | list | item, or None for requests that are not throttled."""
+    if path.startswith(_EXEMPT_PREFIXES):
+        return None
+    if _SEARCH_PARAMS.search(query_string):
+        return SEARCH
+    if _ID_SEGMENT.search(path):
+        return ITEM
+    return LIST
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class _Shard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: OrderedDict[tuple, _Bucket] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    """Buckets spread over `shards` independently locked tables (by key hash).
+
+    On the event loop the locks are never contended; they matter when several threads take
+    tokens at once, and sharding keeps them from serializing on one lock. Each shard keeps
+    its buckets in order of last use: a bucket idle for `burst / rate` seconds is full again,
+    i.e. identical to a missing one, so it is dropped from the front (amortized O(1)), and
+    `max_keys` caps memory under spoofed-address floods by evicting the least recently used.
+    """
+
+    def __init__(self, *, rate: float, burst: int, shards: int = 16, max_keys: int = 100_000):
+        self.rate = rate  # tokens per second
+        self.burst = burst
+        self._shards = [_Shard() for _ in range(shards)]
+        self._shard_max = max(1, max_keys // shards)
+        self._idle = burst / rate
+
+    def acquire(self, key: tuple, cost: float, now: float) -> float:
+        """Take `cost` tokens: 0.0 when allowed, else seconds until enough tokens are back."""
+        cost = min(cost, self.burst)
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            buckets = shard.buckets
+            while buckets:
+                oldest = next(iter(buckets.values()))
+                if now - oldest.updated < self._idle:
+                    break
+                buckets.popitem(last=False)
+
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket(float(self.burst), now)
+                if len(buckets) > self._shard_max:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+                bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return 0.0
+            return (cost - bucket.tokens) / self.rate
+
+    def size(self) -> int:
+        return sum(len(s.buckets) for s in self._shards)
+
+    def collect(self):
+        yield ("app_rate_limit_buckets", "gauge", "Tracked rate limit buckets (ip/route class).", [({}, self.size())])
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware: token-bucket limit on public reads (GET/HEAD), 429 + Retry-After.
+
+    Must sit inside CORSMiddleware so that browsers can read the 429.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        limiter: TokenBucketLimiter,
+        client_ip: Callable[[Request], str],
+        costs: Optional[Mapping[str, float]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.client_ip = client_ip
+        self.costs = {**DEFAULT_COSTS, **(costs or {})}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+        klass = route_class(scope["path"], scope.get("query_string", b""))
+        if klass is None:
+            await self.app(scope, receive, send)
+            return
+
+        ip = self.client_ip(Request(scope))
+        wait = self.limiter.acquire((ip, klass), self.costs[klass], time.monotonic())
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        THROTTLED.labels(klass).inc()
+        retry_after = max(1, math.ceil(wait))
+        response = JSONResponse(
+            {"detail": {"code": "rate_limited", "message": f"Trop de requêtes. Réessayez dans {retry_after}s."}},
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
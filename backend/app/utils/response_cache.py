@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.compression import IDENTITY, Compression, encoded_headers
+from app.utils.http_cache import etag_matches, negotiate_encoding
+from app.utils.metrics import REGISTRY, record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# Response cache for public GET endpoints.
+#
+# Keys are the path, the normalized query string and the current version of each tag the
+# route depends on (tags are resource names: "articles", "dictionnaire", ...). Write services
+# invalidate a resource after commit by bumping its tag version (services.changes.invalidate_caches):
+# entries built from older data are never looked up again and age out via TTL / LRU. Because
+# the versions are read before the endpoint runs, a response computed concurrently with a
+# write is stored under the old version and cannot be served after the invalidation.
+#
+# With read replicas (DATABASE_READ_URLS), a miss computed right after an invalidation may
+# come from a replica that has not replayed the write yet: stored under the new version, it
+# would be served to everyone, the writer pinned to the primary included. For
+# READ_YOUR_WRITES_SECONDS after a bump (the lag the read pin already assumes), misses on
+# the bumped tags are served but not stored.
+#
+# Backends: in-process (per worker, byte-budget LRU) or any Redis-protocol server shared by
+# all nodes (CACHE_BACKEND=redis, CACHE_REDIS_URL).
+#
+# With compression enabled, an entry holds the body in every supported encoding (compressed
+# once, when stored); hits are served in the encoding negotiated from Accept-Encoding.
+
+ALL = "*"  # implicit tag of every entry: bumping it clears the cache
+
+
+class MemoryBackend:
+    """In-process backend: LRU bounded by total bytes, per-entry TTL."""
+
+    blocking = False
+
+    def __init__(self, *, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+        self._versions: dict[str, int] = {}
+        self._bumped_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def lookup(self, base_key: str, tags: tuple[str, ...]) -> tuple[str, Optional[bytes]]:
+        now = time.monotonic()
+        with self._lock:
+            key = _versioned_key(base_key, tags, [self._versions.get(t, 0) for t in tags])
+            entry = self._entries.get(key)
+            if entry is None:
+                return key, None
+            value, expires_at = entry
+            if expires_at <= now:
+                self._drop(key)
+                return key, None
+            self._entries.move_to_end(key)
+            return key, value
+
+    def store(self, key: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def bump(self, tags: tuple[str, ...]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                self._bumped_at[tag] = now
+
+    def bumped_within(self, tags: tuple[str, ...], seconds: float) -> bool:
+        since = time.monotonic() - seconds
+        with self._lock:
+            return any(self._bumped_at.get(t, float("-inf")) > since for t in tags)
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class RedisBackend:
+    """Shared backend over the Redis protocol (Redis, Valkey, KeyDB...).
+
+    `client` is a redis-py compatible client; eviction under memory pressure is left to the
+    server's maxmemory policy (allkeys-lru recommended), entries also carry a TTL.
+    """
+
+    blocking = True
+
+    def __init__(self, client, *, prefix: str = "rc:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _bumped_key(self, tag: str) -> str:
+        return f"{self.prefix}bumped:{tag}"
+
+    def lookup(self, base_key: str, tags: tuple[str, ...]) -> tuple[str, Optional[bytes]]:
+        versions = [int(v or 0) for v in self.client.mget([self._tag_key(t) for t in tags])]
+        key = self.prefix + _versioned_key(base_key, tags, versions)
+        return key, self.client.get(key)
+
+    def store(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def bump(self, tags: tuple[str, ...]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        now = repr(time.time())
+        for tag in tags:
+            pipe.incr(self._tag_key(tag))
+            pipe.set(self._bumped_key(tag), now)
+        pipe.execute()
+
+    def bumped_within(self, tags: tuple[str, ...], seconds: float) -> bool:
+        since = time.time() - seconds
+        return any(v is not None and float(v) > since for v in self.client.mget([self._bumped_key(t) for t in tags]))
+
+
+def _versioned_key(base_key: str, tags: tuple[str, ...], versions: list[int]) -> str:
+    return base_key + "|" + ",".join(f"{t}:{v}" for t, v in zip(tags, versions))
+
+
+# ==========================
+# Process-wide backend
+# ==========================
+_backend: Any = None
+_backend_lock = threading.Lock()
+
+
+def build_backend(settings):
+    if settings.cache_backend == "off":
+        return None
+    if settings.cache_backend == "redis":
+        import redis
+
+        return RedisBackend(redis.Redis.from_url(settings.cache_redis_url, socket_timeout=1.0))
+    return MemoryBackend(max_bytes=settings.cache_max_bytes)
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        from app.core.config import get_settings
+
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_backend(get_settings()) or False
+    return _backend or None
+
+
+def set_backend(backend) -> None:
+    """Replace the process-wide backend (tests)."""
+    global _backend
+    _backend = backend if backend is not None else False
+
+
+def _replicas_configured() -> bool:
+    from app.database import replicas
+
+    return replicas.configured
+
+
+def _size_metrics():
+    backend = get_backend()
+    if isinstance(backend, MemoryBackend):
+        yield ("app_response_cache_bytes", "gauge", "In-process response cache size.", [({}, backend.size_bytes)])
+
+
+REGISTRY.register_collector(_size_metrics)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Invalidate every cached response depending on one of `tags` (call after commit)."""
+    backend = get_backend()
+    if backend is None:
+        return
+    try:
+        backend.bump(tags)
+    except Exception:
+        logger.exception("Response cache invalidation failed for %s", tags)
+
+
+def clear() -> None:
+    invalidate_tags(ALL)
+
+
+# ==========================
+# Serialized entries
+# ==========================
+def encode_entry(status: int, headers: list[tuple[bytes, bytes]], bodies: dict[str, bytes]) -> bytes:
+    """`bodies`: the body per content encoding (always "identity", plus "gzip", "br"...)."""
+    meta = json.dumps(
+        {
+            "status": status,
+            "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers],
+            "bodies": [[encoding, len(body)] for encoding, body in bodies.items()],
+        }
+    )
+    raw = meta.encode("utf-8")
+    return struct.pack(">I", len(raw)) + raw + b"".join(bodies.values())
+
+
+def decode_entry(value: bytes) -> tuple[int, list[tuple[bytes, bytes]], dict[str, bytes]]:
+    (n,) = struct.unpack(">I", value[:4])
+    meta = json.loads(value[4 : 4 + n])
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in meta["headers"]]
+    bodies, offset = {}, 4 + n
+    for encoding, length in meta["bodies"]:
+        bodies[encoding] = value[offset : offset + length]
+        offset += length
+    return meta["status"], headers, bodies
+
+
+def _normalized_query(query_string: bytes) -> str:
+    return urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+
+
+# ==========================
+# Middleware
+# ==========================
+_NOT_MODIFIED_HEADERS = {b"etag", b"cache-control", b"last-modified"}
+
+
+class ResponseCacheMiddleware:
+    """Pure ASGI middleware serving cached 200 responses of the configured GET routes.
+
+    `routes` maps exact paths to the tags (resources) their response depends on. A hit is
+    answered before routing, dependencies and the database; If-None-Match is honoured
+    against the cached ETag. Must sit inside CORSMiddleware (CORS headers are per origin).
+
+    A miss is buffered until complete (up to `max_entry_bytes`), stored in every encoding
+    when `compression` is set, and sent in the negotiated one: CompressionMiddleware leaves
+    it alone (Content-Encoding already set).
+
+    `replica_lag_seconds`: while read replicas are configured, misses on tags bumped less than
+    that long ago are not stored (they may have been read from a lagging replica).
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        routes: dict[str, tuple[str, ...]],
+        ttl: int,
+        max_entry_bytes: int,
+        backend=None,
+        compression: Optional[Compression] = None,
+        replica_lag_seconds: int = 0,
+    ):
+        self.app = app
+        self.routes = routes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self._backend = backend
+        self.compression = compression
+        self.replica_lag_seconds = replica_lag_seconds
+
+    @property
+    def backend(self):
+        return self._backend if self._backend is not None else get_backend()
+
+    async def _call_backend(self, backend, fn, *args):
+        if backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def __call__(self, scope, receive, send):
+        tags = self.routes.get(scope.get("path")) if scope["type"] == "http" and scope["method"] == "GET" else None
+        backend = self.backend if tags else None
+        if backend is None:
+            await self.app(scope, receive, send)
+            return
+
+        base_key = f"{scope['path']}?{_normalized_query(scope.get('query_string', b''))}"
+        try:
+            key, cached = await self._call_backend(backend, backend.lookup, base_key, (*tags, ALL))
+        except Exception:
+            logger.warning("Response cache unavailable, bypassing it", exc_info=True)
+            await self.app(scope, receive, send)
+            return
+
+        record_cache_lookup("response", cached is not None)
+        if cached is not None:
+            await self._send_cached(scope, send, cached)
+            return
+
+        cacheable = True
+        if self.replica_lag_seconds and _replicas_configured():
+            try:
+                cacheable = not await self._call_backend(backend, backend.bumped_within, (*tags, ALL), self.replica_lag_seconds)
+            except Exception:
+                logger.warning("Response cache unavailable, bypassing it", exc_info=True)
+                cacheable = False
+
+        start: dict = {}
+        chunks: list[bytes] = []
+        size = 0
+        buffering = False  # cacheable so far: held until complete
+
+        async def send_wrapper(message):
+            nonlocal size, buffering
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                buffering = cacheable and message["status"] == 200 and not any(k.lower() == b"set-cookie" for k, _ in headers)
+                start.update(message, headers=[*headers, (b"x-cache", b"MISS")])
+                if not buffering:
+                    await send(start)
+                return
+            if message["type"] != "http.response.body" or not buffering:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > self.max_entry_bytes:
+                # Too large to cache: stream it as is from here
+                buffering = False
+                await send(start)
+                await send({**message, "body": b"".join(chunks)})
+                chunks.clear()
+            elif not message.get("more_body", False):
+                buffering = False
+                await self._store_and_send(scope, send, backend, key, start, b"".join(chunks))
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _store_and_send(self, scope, send, backend, key: str, start: dict, body: bytes) -> None:
+        headers = [(k, v) for k, v in start["headers"] if k.lower() not in (b"content-length", b"x-cache")]
+        compression = self.compression
+        if compression is not None and compression.compressible(headers):
+            bodies = await compression.variants(body)
+        else:
+            bodies = {IDENTITY: body}
+        try:
+            await self._call_backend(backend, backend.store, key, encode_entry(start["status"], headers, bodies), self.ttl)
+        except Exception:
+            logger.warning("Could not store response in cache", exc_info=True)
+        await self._send_entry(scope, send, start["status"], headers, bodies, b"MISS")
+
+    async def _send_cached(self, scope, send, cached: bytes) -> None:
+        status, headers, bodies = decode_entry(cached)
+        etag = next((v.decode("latin-1") for k, v in headers if k.lower() == b"etag"), None)
+        if_none_match = next((v.decode("latin-1") for k, v in scope["headers"] if k == b"if-none-match"), None)
+        if etag and etag_matches(if_none_match, etag):
+            kept = [(k, v) for k, v in headers if k.lower() in _NOT_MODIFIED_HEADERS]
+            await send({"type": "http.response.start", "status": 304, "headers": [*kept, (b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await self._send_entry(scope, send, status, headers, bodies, b"HIT")
+
+    async def _send_entry(self, scope, send, status: int, headers, bodies: dict[str, bytes], x_cache: bytes) -> None:
+        if len(bodies) > 1:
+            accept = next((v.decode("latin-1") for k, v in scope["headers"] if k == b"accept-encoding"), None)
+            encoding = negotiate_encoding(accept, tuple(e for e in bodies if e != IDENTITY)) or IDENTITY
+            body = bodies[encoding]
+            headers = encoded_headers(headers, encoding, len(body))
+        else:
+            body = bodies[IDENTITY]
+            headers = [*headers, (b"content-length", str(len(body)).encode("latin-1"))]
+        await send({"type": "http.response.start", "status": status, "headers": [*headers, (b"x-cache", x_cache)]})
+        await send({"type": "http.response.body", "body": body})
@@ -4,9 +4,16 @@ Description: Gestion de la sécurité (hashage des mots de passe, génération e
 Stack: FastAPI + Passlib + PyJWT (via jose)
 """
 
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+import hashlib
 import os
+import secrets
+import threading
+import time
 
 from jose import JWTError, jwt
 from jose.exceptions import ExpiredSignatureError
@@ -14,6 +21,7 @@ from passlib.context import CryptContext
 from fastapi import Depends, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from app.utils.http_errors import http_error
+from app.utils.metrics import REGISTRY
 
 from app.config import settings as _settings
 
@@ -33,11 +41,78 @@ ALGORITHM: str = str(getattr(_settings, "algorithm", os.getenv("ALGORITHM", "HS2
 ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
     getattr(_settings, "access_token_expire_minutes", os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 )
+REFRESH_TOKEN_EXPIRE_DAYS: int = int(
+    getattr(_settings, "refresh_token_expire_days", os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 14))
+)
+JWT_CACHE_SIZE: int = int(getattr(_settings, "jwt_cache_size", os.getenv("JWT_CACHE_SIZE", 1024)))
+BCRYPT_ROUNDS: int = int(getattr(_settings, "bcrypt_rounds", os.getenv("BCRYPT_ROUNDS", 12)))
+BCRYPT_WORKERS: int = int(getattr(_settings, "bcrypt_workers", os.getenv("BCRYPT_WORKERS", 2)))
+BCRYPT_QUEUE: int = int(getattr(_settings, "bcrypt_queue", os.getenv("BCRYPT_QUEUE", 16)))
 
 # ==========================
 # Context pour hashage
 # ==========================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds = BCRYPT_ROUNDS: un hash au coût inférieur est "à mettre à jour" (rehash au login)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+
+class PasswordPoolBusy(RuntimeError):
+    pass
+
+
+class PasswordHasherPool:
+    """
+    Threads dédiés au bcrypt (la lib C relâche le GIL), hors du threadpool des requêtes.
+    Au plus `workers + max_queue` hashes en cours ou en attente: au-delà, PasswordPoolBusy
+    immédiatement (503) plutôt qu'une file qui grossit et bloque les threads des lectures.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args) -> Future:
+        """Soumet le calcul sans attendre son résultat (PasswordPoolBusy si le pool est plein)."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy("password hashing pool saturated")
+        with self._lock:
+            self.pending += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args):
+        """Version bloquante (scripts, benchmarks): le thread appelant attend le résultat."""
+        return self.submit(fn, *args).result()
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    def collect(self):
+        yield ("app_password_hash_pending", "gauge", "Password hashes running or queued.", [({}, self.pending)])
+        yield ("app_password_hash_rejected_total", "counter", "Password hashes rejected (pool saturated).", [({}, self.rejected)])
+
+
+PASSWORD_POOL = PasswordHasherPool(workers=BCRYPT_WORKERS, max_queue=BCRYPT_QUEUE)
+REGISTRY.register_collector(PASSWORD_POOL.collect)
 
 # ==========================
 # OAuth2
@@ -51,16 +126,41 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 # ==========================
 def hash_password(password: str) -> str:
     """
-    Hash un mot de passe avec bcrypt.
+    Hash un mot de passe avec bcrypt (coût BCRYPT_ROUNDS), dans PASSWORD_POOL.
+    Lève PasswordPoolBusy si le pool est saturé.
     """
-    return pwd_context.hash(password)
+    return PASSWORD_POOL.run(pwd_context.hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Vérifie si le mot de passe en clair correspond au hash.
+    Vérifie si le mot de passe en clair correspond au hash (dans PASSWORD_POOL).
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return PASSWORD_POOL.run(pwd_context.verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Comme verify_password, et retourne aussi un nouveau hash (coût BCRYPT_ROUNDS) quand le
+    hash stocké utilise un coût dépassé; None sinon.
+    """
+    return PASSWORD_POOL.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+# Routes: attente asynchrone du pool, sans bloquer la boucle d'événements (mode async,
+# run_sync) ni occuper un thread de requête (mode sync) pendant le bcrypt.
+async def hash_password_async(password: str) -> str:
+    """
+    hash_password pour les routes async. Lève PasswordPoolBusy si le pool est saturé.
+    """
+    return await asyncio.wrap_future(PASSWORD_POOL.submit(pwd_context.hash, password))
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password pour les routes async. Lève PasswordPoolBusy si le pool est saturé.
+    """
+    return await asyncio.wrap_future(PASSWORD_POOL.submit(pwd_context.verify_and_update, plain_password, hashed_password))
 
 
 # ==========================
@@ -72,7 +172,9 @@ def create_access_token(data: Dict[str, str], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    # jti: two tokens for the same user within the same second must differ, otherwise
+    # revoking one at logout (see revoke_token) would revoke the other as well
+    to_encode.update({"exp": expire, "jti": secrets.token_urlsafe(8)})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -86,6 +188,114 @@ def decode_access_token(token: str) -> Optional[Dict[str, str]]:
         return None
 
 
+# ==========================
+# Refresh tokens
+# ==========================
+def new_refresh_token() -> str:
+    """
+    Refresh token opaque (256 bits aléatoires); seul son hash est stocké côté serveur.
+    """
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    SHA-256 (hex) du refresh token: suffisant pour un secret aléatoire, pas besoin de bcrypt.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+# ==========================
+# Cache des tokens vérifiés
+# ==========================
+class VerifiedTokenCache:
+    """
+    LRU borné: token -> (sub, exp) après une vérification réussie (signature + expiration).
+    Un token n'est servi depuis le cache que tant que `exp` n'est pas dépassé; un token
+    révoqué (logout) est retiré et refusé jusqu'à son expiration, même s'il revient.
+    La révocation est locale au process (les autres workers l'acceptent jusqu'à `exp`).
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}  # sha256(token) -> exp
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[0]
+
+    def put(self, token: str, sub: str, exp: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (sub, exp)
+            self._entries.move_to_end(token)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revoke(self, token: str, exp: float) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+            now = time.time()
+            # purge des révocations expirées (le token serait refusé de toute façon)
+            for fp in [fp for fp, until in self._revoked.items() if until <= now]:
+                del self._revoked[fp]
+            self._revoked[self._fingerprint(token)] = exp
+
+    def is_revoked(self, token: str) -> bool:
+        return bool(self._revoked) and self._fingerprint(token) in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+
+TOKEN_CACHE = VerifiedTokenCache(JWT_CACHE_SIZE)
+
+
+def token_subject(token: str) -> Optional[str]:
+    """
+    Retourne le `sub` d'un token valide (non expiré, non révoqué), sinon None.
+    Les tokens déjà vérifiés sont servis depuis TOKEN_CACHE (pas de HMAC ni de parsing JSON).
+    """
+    now = time.time()
+    sub = TOKEN_CACHE.get(token, now)
+    if sub is not None:
+        return sub
+    payload = decode_access_token(token)
+    if payload is None or "sub" not in payload or TOKEN_CACHE.is_revoked(token):
+        return None
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        TOKEN_CACHE.put(token, payload["sub"], float(exp))
+    return payload["sub"]
+
+
+def revoke_token(token: str) -> None:
+    """
+    Révoque un token (logout): retiré du cache et refusé jusqu'à son expiration.
+    """
+    payload = decode_access_token(token)
+    if payload is None:
+        return  # déjà invalide ou expiré
+    exp = payload.get("exp")
+    TOKEN_CACHE.revoke(token, float(exp) if isinstance(exp, (int, float)) else time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 # ==========================
 # Dépendance FastAPI
 # ==========================
@@ -107,15 +317,15 @@ def require_authenticated(request: Request, token: Optional[str] = Depends(oauth
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_access_token(token)
-    if payload is None or "sub" not in payload:
+    sub = token_subject(token)
+    if sub is None:
         raise http_error(
             status.HTTP_401_UNAUTHORIZED,
             code="auth_invalid",
             message="Authentification requise (token invalide ou expiré)",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return payload["sub"]
+    return sub
 
 
 def get_current_user_optional(request: Request, token: Optional[str] = Depends(oauth2_scheme)) -> Optional[str]:
@@ -128,7 +338,4 @@ def get_current_user_optional(request: Request, token: Optional[str] = Depends(o
         token = cookie_token or None
     if not token:
         return None
-    payload = decode_access_token(token)
-    if payload is None or "sub" not in payload:
-        return None
-    return payload["sub"]
+    return token_subject(token)
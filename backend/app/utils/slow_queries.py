@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+from app.utils.sql_stats import add_statement_observer, remove_statement_observer
+
+logger = logging.getLogger(__name__)
+
+# Slow-query log.
+#
+# Statements slower than the threshold are queued from the cursor-execute hook (cheap, never
+# blocks: a full queue drops the entry) and handled by one background thread, outside the
+# request and its transaction:
+# - bound parameters are redacted to their type/length before being stored;
+# - the plan is captured with EXPLAIN (ANALYZE off, FORMAT JSON) on Postgres (EXPLAIN QUERY
+#   PLAN on SQLite) over a separate, single-connection engine to the same database
+#   (the replica the statement ran on, if any). Without ANALYZE nothing is executed.
+# - the entry is handed to `store` (see services.slow_queries: table `slow_queries`).
+
+Store = Callable[[dict], None]
+
+_EXPLAINABLE = ("select", "with", "update", "delete")
+_STATEMENT_MAX_LEN = 10_000
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"(%\(\w+\)s|\$\d+|\?|%s)")
+_IN_LIST = re.compile(r"\(\s*\?(\s*,\s*\?)*\s*\)")
+_ASYNCPG_PARAM = re.compile(r"\$(\d+)")
+
+
+def fingerprint(statement: str) -> str:
+    """Stable id of a statement shape: literals, placeholders and IN lists normalized."""
+    s = " ".join(statement.split()).lower()
+    s = _STRING.sub("?", s)
+    s = _NUMBER.sub("?", s)
+    s = _PLACEHOLDER.sub("?", s)
+    s = _IN_LIST.sub("(?)", s)
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:16]
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {k: _redact_value(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(v) for v in parameters]
+    return _redact_value(parameters)
+
+
+def _sync_url(url) -> str:
+    # postgresql+asyncpg -> postgresql (psycopg2), sqlite+aiosqlite -> sqlite
+    u = make_url(url)
+    return u.set(drivername=u.get_backend_name()).render_as_string(hide_password=False)
+
+
+def _to_pyformat(statement: str, parameters) -> tuple[str, tuple]:
+    # asyncpg ($1, $2, ...) -> psycopg2 (%s, %s, ...); parameters are positional and ordered.
+    return _ASYNCPG_PARAM.sub("%s", statement.replace("%", "%%")), tuple(parameters)
+
+
+class SlowQueryLog:
+    def __init__(self, *, threshold_ms: float, store: Store, explain: bool = True, queue_size: int = 1000):
+        self.threshold_seconds = threshold_ms / 1000.0
+        self.store = store
+        self.explain = explain
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._explain_engines: dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    # --- capture (request path) ---
+    def install(self) -> None:
+        add_statement_observer(self.observe)
+
+    def uninstall(self) -> None:
+        remove_statement_observer(self.observe)
+
+    def observe(self, conn, statement, parameters, executemany, elapsed, stats) -> None:
+        if elapsed < self.threshold_seconds or threading.current_thread() is self._thread:
+            return  # the worker's own EXPLAIN / insert statements are never logged
+        entry = {
+            "statement": statement[:_STATEMENT_MAX_LEN],
+            "parameters": parameters,  # raw, only kept in memory for EXPLAIN
+            "executemany": executemany,
+            "duration_ms": elapsed * 1000.0,
+            "path": stats.path if stats is not None else "",
+            "url": conn.engine.url,
+            "driver": conn.engine.dialect.driver,
+            "captured_at": datetime.now(timezone.utc),
+        }
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+            self._thread.start()
+
+    # --- background thread ---
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            try:
+                self.store(self._prepare(entry))
+            except Exception:
+                logger.exception("Could not record slow query")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued entry has been stored (tests, shutdown)."""
+        self._queue.join()
+
+    def _prepare(self, entry: dict) -> dict:
+        statement = entry["statement"]
+        plan = None
+        if self.explain and not entry["executemany"] and statement.lstrip().lower().startswith(_EXPLAINABLE):
+            try:
+                plan = self._explain(entry)
+            except Exception as e:
+                plan = {"error": f"{type(e).__name__}: {e}"[:500]}
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s", entry["duration_ms"], entry["path"] or "-", " ".join(statement.split())[:200]
+        )
+        return {
+            "fingerprint": fingerprint(statement),
+            "statement": statement,
+            "parameters": json.dumps(redact_parameters(entry["parameters"], entry["executemany"])),
+            "duration_ms": entry["duration_ms"],
+            "plan": json.dumps(plan) if plan is not None else None,
+            "path": entry["path"][:200],
+            "captured_at": entry["captured_at"],
+        }
+
+    def _explain_engine(self, url):
+        key = _sync_url(url)
+        eng = self._explain_engines.get(key)
+        if eng is None:
+            eng = create_engine(key, pool_size=1, max_overflow=0, future=True)
+            self._explain_engines[key] = eng
+        return eng
+
+    def _explain(self, entry: dict):
+        url = entry["url"]
+        backend = url.get_backend_name()
+        if backend == "sqlite" and url.database in (None, "", ":memory:"):
+            return None  # a second connection would see another (empty) database
+        statement, parameters = entry["statement"], entry["parameters"]
+        if entry["driver"] == "asyncpg":
+            statement, parameters = _to_pyformat(statement, parameters)
+
+        with self._explain_engine(url).connect() as conn:
+            if backend == "postgresql":
+                row = conn.exec_driver_sql(f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters).scalar()
+                return json.loads(row) if isinstance(row, str) else row
+            if backend == "sqlite":
+                rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                return [list(r) for r in rows]
+        return None
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Per-request SQL statistics.
+#
+# Cursor-execute hooks are registered on the Engine class, so they apply to every engine
+# (primary, replicas, the sync side of async engines, test engines). They only do work while
+# a QueryStats is active in the current context: the middleware below sets one per HTTP
+# request; `query_budget()` sets one around a block of code in tests.
+#
+# The QueryStats object is shared by reference, so statements executed in the threadpool
+# (run_in_threadpool copies the context) or in the async greenlet (run_sync) are counted
+# in the request that issued them.
+
+_STATEMENT_MAX_LEN = 200
+_START_KEY = "sql_stats_start"
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("sql_query_stats", default=None)
+
+# Called after every statement with (conn, statement, parameters, executemany, elapsed, stats),
+# whether or not a request is being measured (see app.utils.slow_queries).
+StatementObserver = Callable[..., None]
+_observers: list[StatementObserver] = []
+
+
+def add_statement_observer(observer: StatementObserver) -> None:
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_statement_observer(observer: StatementObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised before the statement that exceeds a strict query budget."""
+
+
+class QueryStats:
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement", "budget", "strict", "path", "_repeats")
+
+    def __init__(self, *, budget: int = 0, strict: bool = False, path: str = "") -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = ""
+        self.budget = budget  # 0: no budget
+        self.strict = strict
+        self.path = path  # request path, for observers
+        self._repeats: dict[str, int] = {}
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.count > self.budget
+
+    def most_repeated(self) -> tuple[str, int]:
+        """(statement, executions) of the statement run most often: N+1 loops show up here."""
+        if not self._repeats:
+            return "", 0
+        statement = max(self._repeats, key=self._repeats.__getitem__)
+        return statement, self._repeats[statement]
+
+    def check_budget(self, statement: str) -> None:
+        if self.strict and self.budget and self.count >= self.budget:
+            raise QueryBudgetExceeded(
+                f"query budget of {self.budget} exceeded; next statement: {_shorten(statement)}"
+            )
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+        self._repeats[statement] = self._repeats.get(statement, 0) + 1
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _shorten(statement: str) -> str:
+    s = " ".join(statement.split())
+    return s if len(s) <= _STATEMENT_MAX_LEN else s[: _STATEMENT_MAX_LEN - 3] + "..."
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None and not _observers:
+        return
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+    if stats is not None:
+        stats.check_budget(statement)  # on failure, handle_error drops the start time pushed above
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for observer in _observers:
+        observer(conn, statement, parameters, executemany, elapsed, stats)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute: drop its start time.
+    conn = exception_context.connection
+    starts = conn.info.get(_START_KEY) if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail (QueryBudgetExceeded) as soon as the block runs more than `max_queries` statements.
+
+    Meant for tests of services/crud called directly:
+
+        with query_budget(2):
+            list_articles_service(db, skip=0, limit=20)
+    """
+    stats = QueryStats(budget=max_queries, strict=True)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def server_timing(stats: QueryStats, app_seconds: float) -> bytes:
+    return (
+        f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries", '
+        f"app;dur={app_seconds * 1000:.1f}"
+    ).encode("latin-1")
+
+
+class SqlTimingMiddleware:
+    """Pure ASGI middleware: per-request query count / DB time.
+
+    - `Server-Timing` response header (db + app durations, visible in browser devtools)
+    - one structured log line per request (db_queries, db_time_ms, db_slowest_*)
+    - warning when the query budget is exceeded or a statement repeats `repeat_threshold` times
+      (typical of per-row lazy loads); in strict mode the budget fails the request instead.
+    """
+
+    def __init__(self, app, *, budget: int = 0, strict: bool = False, repeat_threshold: int = 10):
+        self.app = app
+        self.budget = budget
+        self.strict = strict
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(budget=self.budget, strict=self.strict, path=scope["path"])
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = (b"server-timing", server_timing(stats, time.perf_counter() - start))
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._log(scope, status, stats, time.perf_counter() - start)
+
+    def _log(self, scope, status: int, stats: QueryStats, elapsed: float) -> None:
+        method, path = scope["method"], scope["path"]
+        fields = {
+            "http_method": method,
+            "http_path": path,
+            "http_status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.total_seconds * 1000, 1),
+            "db_slowest_ms": round(stats.slowest_seconds * 1000, 1),
+            "db_slowest_statement": _shorten(stats.slowest_statement),
+        }
+        logger.info(
+            "%s %s %s duration_ms=%s db_queries=%s db_time_ms=%s db_slowest_ms=%s",
+            method, path, status, fields["duration_ms"], fields["db_queries"],
+            fields["db_time_ms"], fields["db_slowest_ms"],
+            extra=fields,
+        )
+
+        if stats.over_budget:
+            logger.warning(
+                "%s %s ran %s queries (budget %s)", method, path, stats.count, stats.budget, extra=fields
+            )
+        statement, repeats = stats.most_repeated()
+        if self.repeat_threshold and repeats >= self.repeat_threshold:
+            logger.warning(
+                "Possible N+1 on %s %s: statement executed %s times: %s",
+                method, path, repeats, _shorten(statement), extra=fields,
+            )
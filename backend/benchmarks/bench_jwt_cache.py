@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Verified-JWT cache benchmark: authenticated request bursts with and without the cache.
+
+An editor saving a batch of changes sends many requests with the same token. Measures:
+- token check alone (utils.security.token_subject): signature + JSON parsing vs cache hit;
+- full in-process requests to an authenticated route (GET /auth/me), same token each time.
+
+    cd backend && python -m benchmarks.bench_jwt_cache --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+def _per_call_us(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return round((time.perf_counter() - start) / n * 1e6, 2)
+
+
+async def _requests_us(app, token: str, n: int) -> float:
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/auth/me", headers=headers)
+        start = time.perf_counter()
+        for _ in range(n):
+            resp = await client.get("/auth/me", headers=headers)
+            assert resp.status_code == 200, resp.text
+        return round((time.perf_counter() - start) / n * 1e6, 2)
+
+
+def run(requests: int) -> dict:
+    from app.main import app
+    from app.utils import security
+
+    token = security.create_access_token({"sub": "bench"})
+    asyncio.run(_requests_us(app, token, 200))  # warm-up (routing, middleware stack)
+    report = {}
+    for label, size in (("uncached", 0), ("cached", 1024)):
+        security.TOKEN_CACHE = security.VerifiedTokenCache(size)
+        report[label] = {
+            "token_check_us": _per_call_us(lambda: security.token_subject(token), requests * 10),
+            "request_us": asyncio.run(_requests_us(app, token, requests)),
+        }
+    report["saving_per_request_us"] = round(report["uncached"]["request_us"] - report["cached"]["request_us"], 2)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Login limiter benchmark: per-operation cost and memory with N tracked keys.
+
+Fills a backend with --keys distinct "ip:" keys (one failure each, as a credential-stuffing
+attack from many addresses would), then times failures and checks for new and known keys,
+including while old keys expire. --legacy also times one pass of the previous O(n) cleanup
+(a scan of a dict of dicts on every login attempt) at the same size, for comparison.
+
+    cd backend && python -m benchmarks.bench_login_limiter --keys 1000000
+    python -m benchmarks.bench_login_limiter --backend mmap --keys 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app.utils.login_limiter import LoginPolicy, MemoryBackend, MmapBackend
+
+POLICY = LoginPolicy()
+
+
+def _build(backend: str, keys: int):
+    if backend == "mmap":
+        path = os.path.join(tempfile.mkdtemp(), "login_limiter.bin")
+        return MmapBackend(POLICY, path=path, slots=keys * 2)
+    return MemoryBackend(POLICY, max_keys=keys)
+
+
+def _per_op_us(fn, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return round((time.perf_counter() - start) / n * 1e6, 3)
+
+
+def _bytes_per_key(sample: int = 50_000) -> float:
+    # Traced on a sample: tracemalloc slows allocation down too much for a full fill
+    tracemalloc.start()
+    limiter = MemoryBackend(POLICY, max_keys=sample)
+    for i in range(sample):
+        limiter.register_failure((f"ip:{i}",), 1_000_000.0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return round(memory / sample, 1)
+
+
+def _legacy_cleanup_ms(keys: int) -> float:
+    now = 1_000_000.0
+    state = {("ip", str(i)): {"fail_count": 1.0, "first_fail": now, "blocked_until": now + 1, "last": now} for i in range(keys)}
+    ttl = POLICY.ttl_seconds
+    start = time.perf_counter()
+    for k in list(state.keys()):
+        if now - float(state[k].get("last", now)) > ttl:
+            state.pop(k, None)
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def run(backend: str, keys: int, ops: int, legacy: bool = False) -> dict:
+    now = 1_000_000.0
+    limiter = _build(backend, keys)
+    start = time.perf_counter()
+    for i in range(keys):
+        limiter.register_failure((f"ip:{i}",), now + i * 1e-6)
+    fill_s = time.perf_counter() - start
+
+    t = now + keys * 1e-6
+    report = {
+        "backend": backend,
+        "keys": keys,
+        "fill_seconds": round(fill_s, 3),
+        "bytes_per_key": _bytes_per_key() if backend == "memory" else None,
+        "check_known_us": _per_op_us(lambda i: limiter.blocked_seconds((f"ip:{i % keys}", "user:u"), t), ops),
+        "check_unknown_us": _per_op_us(lambda i: limiter.blocked_seconds((f"ip:new{i}", "user:u"), t), ops),
+        "failure_us": _per_op_us(lambda i: limiter.register_failure((f"ip:{i % keys}", "user:u"), t), ops),
+        # Every key goes stale at once: expiry is spread over the following operations
+        "failure_while_expiring_us": _per_op_us(
+            lambda i: limiter.register_failure((f"ip:late{i}",), t + POLICY.ttl_seconds + 1), ops
+        ),
+        "tracked_after": limiter.size(),
+    }
+    if legacy:
+        report["legacy_cleanup_per_op_ms"] = _legacy_cleanup_ms(keys)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("memory", "mmap"), default="memory")
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=100_000)
+    parser.add_argument("--legacy", action="store_true", help="also time one pass of the old O(n) cleanup")
+    args = parser.parse_args()
+    print(json.dumps(run(args.backend, args.keys, args.ops, args.legacy), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Login burst benchmark: login throughput vs latency of concurrent public reads.
+
+Two phases of --seconds each, in process: readers alone on GET /dictionnaire/, then the
+same readers while --logins clients log in as fast as they can. bcrypt runs in its own
+pool (BCRYPT_WORKERS / BCRYPT_QUEUE): read latency should barely move, and logins beyond
+the pool capacity get 503 instead of queueing.
+
+    cd backend && python -m benchmarks.bench_password_hashing --rounds 12 --logins 32 --readers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.run import BACKEND_DIR, Result, summarize
+
+
+async def _loop(client, request, result: Result, until: float) -> None:
+    while time.perf_counter() < until:
+        start = time.perf_counter()
+        resp = await request(client)
+        result.latencies.append(time.perf_counter() - start)
+        result.statuses[resp.status_code] = result.statuses.get(resp.status_code, 0) + 1
+
+
+async def _phase(app, *, readers: int, logins: int, seconds: float) -> dict:
+    import httpx
+
+    from benchmarks.datasets import BENCH_PASSWORD, BENCH_USER
+
+    login_form = {"username": BENCH_USER, "password": BENCH_PASSWORD}
+    reads, auth = Result(), Result()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        until = time.perf_counter() + seconds
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(_loop(client, lambda c: c.get("/dictionnaire/", params={"page": 1}), reads, until) for _ in range(readers)),
+            *(_loop(client, lambda c: c.post("/auth/login", data=login_form), auth, until) for _ in range(logins)),
+        )
+        reads.wall_seconds = auth.wall_seconds = time.perf_counter() - start
+    report = {"reads": summarize(reads, None)}
+    if logins:
+        report["logins"] = summarize(auth, None)
+        report["logins_ok_per_second"] = round(auth.statuses.get(200, 0) / auth.wall_seconds, 1)
+    for part in report.values():
+        if isinstance(part, dict):
+            part.pop("peak_rss_mb", None)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, default=0, help="BCRYPT_WORKERS (default: settings default)")
+    parser.add_argument("--queue", type=int, default=-1, help="BCRYPT_QUEUE (default: settings default)")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent read clients")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    args = parser.parse_args()
+
+    db_url = f"sqlite:///{Path(tempfile.gettempdir()) / 'leprovencal_bench_tiny.db'}"
+    os.environ.update(
+        DATABASE_URL=db_url,
+        CACHE_BACKEND="off",
+        SQL_QUERY_BUDGET="0",
+        SLOW_QUERY_MS="0",
+        BCRYPT_ROUNDS=str(args.rounds),
+        LOGIN_MAX_ATTEMPTS="1000000",
+    )
+    if args.workers:
+        os.environ["BCRYPT_WORKERS"] = str(args.workers)
+    if args.queue >= 0:
+        os.environ["BCRYPT_QUEUE"] = str(args.queue)
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from sqlalchemy import create_engine
+
+    from benchmarks.datasets import SCALES, ensure_dataset
+
+    engine = create_engine(db_url, future=True)
+    ensure_dataset(engine, SCALES["tiny"])
+    engine.dispose()
+
+    from app.main import app
+    from app.utils import security
+
+    report = {
+        "bcrypt": {"rounds": args.rounds, "workers": security.PASSWORD_POOL.workers, "queue": security.PASSWORD_POOL.max_queue},
+        "reads_alone": asyncio.run(_phase(app, readers=args.readers, logins=0, seconds=args.seconds)),
+        "reads_during_logins": asyncio.run(_phase(app, readers=args.readers, logins=args.logins, seconds=args.seconds)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
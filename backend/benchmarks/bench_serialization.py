@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Serialization benchmark: default response path vs fast path (app.utils.fast_json), per list endpoint.
+
+Default: ORM objects -> response_model (from_attributes, camelCase aliases) -> json.dumps.
+Fast:    selected columns (plain rows) -> RowSerializer -> orjson.
+
+Both sides include the query, on an in-memory SQLite database filled with synthetic rows.
+
+    cd backend && python -m benchmarks.bench_serialization --rows 5000 --limit 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timezone
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Article, Carte, Dictionnaire, Histoire
+from app.routes.articles import _ARTICLE_ROWS
+from app.routes.cartes import _CARTE_ROWS
+from app.routes.dictionnaire import _MOT_ROWS
+from app.routes.histoires import _HISTOIRE_ROWS
+from app.schemas import ArticleOut, CarteOut, HistoireOut, PaginatedDictionnaire
+from app.services import articles as articles_service
+from app.services import cartes as cartes_service
+from app.services import dictionnaire as dict_service
+from app.services import histoires as histoires_service
+from app.utils.fast_json import fast_json_response
+
+
+def _session(rows: int, image_bytes: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, future=True)()
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    image = b"\x89PNG" + b"\0" * image_bytes
+    db.add_all(
+        Dictionnaire(
+            mots_francais=f"mot {i} é",
+            synonymes_francais=f"synonyme {i}",
+            mots_provencal=f"mot provençal {i}",
+            theme=f"thème {i % 20}",
+            categorie=f"catégorie {i % 50}",
+            description="Descripcioun « lònga » " * 4,
+        )
+        for i in range(rows)
+    )
+    db.add_all(
+        Article(titre=f"Article {i}", description="Texte " * 30, date_ajout=date(2024, 1, 1), updated_at=now,
+                image_data=image if i % 2 else None, image_mime="image/png")
+        for i in range(200)
+    )
+    db.add_all(
+        Carte(titre=f"Carte {i}", iframe_url="https://example.org/map", legende="Légende",
+              image_data=image if i % 2 else None, image_mime="image/png")
+        for i in range(200)
+    )
+    db.add_all(
+        Histoire(titre=f"Histoire {i}", typologie="Légende", periode="Moyen Âge",
+                 description_courte="Court", description_longue="Long texte. " * 200)
+        for i in range(200)
+    )
+    db.commit()
+    return db
+
+
+def _default(annotation, content) -> bytes:
+    adapter = TypeAdapter(annotation)
+    return JSONResponse(adapter.dump_python(adapter.validate_python(content, from_attributes=True), mode="json", by_alias=True)).body
+
+
+def _cases(db, limit: int):
+    mots_kw = dict(theme=None, categorie=None, lettre=None, search=None, page=1, limit=limit, sort="mots_francais", order="asc")
+
+    def mots_fast():
+        page = dict_service.list_mots_service(db, **mots_kw, columns=_MOT_ROWS.columns)
+        page["items"] = _MOT_ROWS.dump_many(page["items"])
+        return fast_json_response(page).body
+
+    return {
+        "GET /dictionnaire/": (
+            lambda: _default(PaginatedDictionnaire, dict_service.list_mots_service(db, **mots_kw)),
+            mots_fast,
+        ),
+        "GET /articles/": (
+            lambda: _default(list[ArticleOut], articles_service.list_articles_service(db, skip=0, limit=limit)),
+            lambda: fast_json_response(_ARTICLE_ROWS.dump_many(
+                articles_service.list_articles_service(db, skip=0, limit=limit, columns=_ARTICLE_ROWS.columns))).body,
+        ),
+        "GET /cartes/": (
+            lambda: _default(list[CarteOut], cartes_service.list_cartes_service(db, skip=0, limit=limit)),
+            lambda: fast_json_response(_CARTE_ROWS.dump_many(
+                cartes_service.list_cartes_service(db, skip=0, limit=limit, columns=_CARTE_ROWS.columns))).body,
+        ),
+        "GET /histoires/": (
+            lambda: _default(list[HistoireOut], histoires_service.list_histoires_service(db, page=1, limit=limit)),
+            lambda: fast_json_response(_HISTOIRE_ROWS.dump_many(
+                histoires_service.list_histoires_service(db, page=1, limit=limit, columns=_HISTOIRE_ROWS.columns))).body,
+        ),
+    }
+
+
+def _time(fn, repeat: int, expire) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        expire()  # no identity-map reuse between runs
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="dictionary rows")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--image-bytes", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    db = _session(args.rows, args.image_bytes)
+    report = {}
+    for endpoint, (default, fast) in _cases(db, args.limit).items():
+        if default() != fast():
+            raise SystemExit(f"{endpoint}: fast path output differs from the default path")
+        d = _time(default, args.repeat, db.expunge_all)
+        f = _time(fast, args.repeat, db.expunge_all)
+        report[endpoint] = {"default_ms": round(d * 1000, 3), "fast_ms": round(f * 1000, 3), "speedup": round(d / f, 2)}
+    print(json.dumps({"rows": args.rows, "limit": args.limit, "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Compare two benchmark reports (benchmarks.run) endpoint by endpoint.
+
+    python -m benchmarks.compare before.json after.json [--threshold 10] [--fail]
+
+Positive deltas are regressions (slower latency, lower throughput, more memory). With --fail
+the exit code is 1 when a p95 or throughput regression exceeds the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+# metric -> +1 when higher is worse, -1 when lower is worse
+METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": -1, "peak_rss_mb": 1}
+GATED = ("p95_ms", "throughput_rps")
+
+
+def _delta(before: Optional[float], after: Optional[float], direction: int) -> Optional[float]:
+    if not before or after is None:
+        return None
+    return round((after - before) / before * 100 * direction, 1)
+
+
+def compare(before: dict, after: dict) -> dict:
+    out = {}
+    for name, b in before["endpoints"].items():
+        a = after["endpoints"].get(name)
+        if a is None:
+            continue
+        out[name] = {
+            metric: {"before": b.get(metric), "after": a.get(metric), "regression_pct": _delta(b.get(metric), a.get(metric), d)}
+            for metric, d in METRICS.items()
+        }
+    return out
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--fail", action="store_true", help="exit 1 on a p95/throughput regression over the threshold")
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+    after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+    diff = compare(before, after)
+
+    regressions = [
+        (name, metric, m["regression_pct"])
+        for name, metrics in diff.items()
+        for metric, m in metrics.items()
+        if metric in GATED and m["regression_pct"] is not None and m["regression_pct"] > args.threshold
+    ]
+    if args.json:
+        print(json.dumps({"endpoints": diff, "regressions": regressions}, indent=2))
+    else:
+        print(f"{'endpoint':28s} {'p50 ms':>18s} {'p95 ms':>18s} {'req/s':>18s} {'rss MB':>16s}")
+        for name, m in diff.items():
+            cells = []
+            for metric in ("p50_ms", "p95_ms", "throughput_rps", "peak_rss_mb"):
+                pct = m[metric]["regression_pct"]
+                cells.append(f"{m[metric]['after'] or 0:9.1f} ({pct:+5.1f}%)" if pct is not None else f"{'-':>17s}")
+            print(f"{name:28s} " + " ".join(cells))
+        for name, metric, pct in regressions:
+            print(f"REGRESSION {name} {metric}: +{pct}%", file=sys.stderr)
+    return 1 if args.fail and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Synthetic datasets for the benchmarks (SQLite or Postgres).
+
+Deterministic (seeded) and bulk-inserted with SQLAlchemy Core. A database already holding a
+dataset of the requested scale is reused as is (`ensure_dataset`), so large scales are only
+generated once per database.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.database import Base
+from app.models import Article, Carte, Change, Dictionnaire, Histoire, Revision, User
+from app.services import revisions as revisions_service
+from app.utils.security import hash_password
+
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench-password"
+
+_CHUNK = 5000
+_THEMES = ["Cuisine", "Nature", "Maison", "Métiers", "Fêtes", "Mer", "Corps", "Temps", "Animaux", "Famille"]
+_TYPOLOGIES = ["Légende", "Conte", "Histoire", "Tradition"]
+_PERIODES = ["Antiquité", "Moyen Âge", "Renaissance", "XIXe siècle", "XXe siècle"]
+_WORDS = "lou la li de e que soulèu mistrau mar terro oustau pan vin oli flour aigo vènt cigalo prouvènço".split()
+
+
+@dataclass(frozen=True)
+class Scale:
+    dictionnaire: int
+    histoires: int
+    articles: int  # half of them with a stored image
+    cartes: int  # half of them with a stored image
+    image_bytes: int
+
+
+SCALES = {
+    "tiny": Scale(dictionnaire=500, histoires=50, articles=10, cartes=10, image_bytes=20_000),
+    "small": Scale(dictionnaire=10_000, histoires=2_000, articles=100, cartes=100, image_bytes=200_000),
+    "medium": Scale(dictionnaire=100_000, histoires=5_000, articles=300, cartes=300, image_bytes=500_000),
+    "large": Scale(dictionnaire=1_000_000, histoires=10_000, articles=500, cartes=500, image_bytes=1_000_000),
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _insert(conn, model, rows) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= _CHUNK:
+            conn.execute(insert(model), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+
+
+def _counts(engine: Engine) -> dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            model.__tablename__: conn.execute(select(func.count()).select_from(model)).scalar_one()
+            for model in (Dictionnaire, Histoire, Article, Carte)
+        }
+
+
+def _expected(scale: Scale) -> dict[str, int]:
+    return {"dictionnaire": scale.dictionnaire, "histoires": scale.histoires, "articles": scale.articles, "cartes": scale.cartes}
+
+
+def generate(engine: Engine, scale: Scale, *, seed: int = 42) -> None:
+    """(Re)create every table and fill it. Destroys existing data."""
+    rng = random.Random(seed)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    image = rng.randbytes(scale.image_bytes)
+
+    with engine.begin() as conn:
+        _insert(
+            conn,
+            Dictionnaire,
+            (
+                {
+                    "mots_francais": f"{_text(rng, 2)} {i}",
+                    "synonymes_francais": _text(rng, 3),
+                    "mots_provencal": f"{_text(rng, 2)} {i}",
+                    "eg_provencal": _text(rng, 2),
+                    "theme": _THEMES[i % len(_THEMES)],
+                    "categorie": f"Catégorie {i % 97}",
+                    "description": _text(rng, 12),
+                }
+                for i in range(scale.dictionnaire)
+            ),
+        )
+        _insert(
+            conn,
+            Histoire,
+            (
+                {
+                    "titre": f"Histoire {i}",
+                    "typologie": _TYPOLOGIES[i % len(_TYPOLOGIES)],
+                    "periode": _PERIODES[i % len(_PERIODES)],
+                    "description_courte": _text(rng, 8)[:100],
+                    "description_longue": _text(rng, 400),
+                    "source_url": f"https://example.org/histoires/{i}",
+                }
+                for i in range(scale.histoires)
+            ),
+        )
+        _insert(
+            conn,
+            Article,
+            (
+                {
+                    "titre": f"Article {i}",
+                    "description": _text(rng, 60),
+                    "source_url": f"https://example.org/articles/{i}",
+                    "date_ajout": date(2024, 1, 1) - timedelta(days=i),
+                    "updated_at": now - timedelta(hours=i),
+                    "image_data": image if i % 2 == 0 else None,
+                    "image_mime": "image/png" if i % 2 == 0 else None,
+                }
+                for i in range(scale.articles)
+            ),
+        )
+        _insert(
+            conn,
+            Carte,
+            (
+                {
+                    "titre": f"Carte {i}",
+                    "iframe_url": f"https://example.org/cartes/{i}",
+                    "legende": _text(rng, 10),
+                    "image_data": image if i % 2 == 0 else None,
+                    "image_mime": "image/png" if i % 2 == 0 else None,
+                }
+                for i in range(scale.cartes)
+            ),
+        )
+        # Change log (GET /changes) and revision counters, as the write services leave them
+        changes = []
+        for resource, count in _expected(scale).items():
+            changes.extend((resource, i) for i in range(1, count + 1))
+        _insert(
+            conn,
+            Change,
+            (
+                {"revision": rev, "resource": resource, "resource_id": rid, "operation": "create", "changed_at": now}
+                for rev, (resource, rid) in enumerate(changes, 1)
+            ),
+        )
+        conn.execute(
+            insert(Revision),
+            [{"resource": r, "revision": 1} for r in revisions_service.CONTENT_RESOURCES]
+            + [{"resource": revisions_service.CHANGES, "revision": len(changes)}],
+        )
+        conn.execute(insert(User), [{"username": BENCH_USER, "password": hash_password(BENCH_PASSWORD)}])
+
+
+def ensure_dataset(engine: Engine, scale: Scale, *, regenerate: bool = False) -> dict:
+    """Generate the dataset unless the database already holds one of this scale."""
+    start = time.perf_counter()
+    reused = False
+    if not regenerate:
+        try:
+            reused = _counts(engine) == _expected(scale)
+        except Exception:
+            reused = False  # no schema yet
+    if not reused:
+        generate(engine, scale)
+    return {**asdict(scale), "reused": reused, "seconds": round(time.perf_counter() - start, 3)}
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""Replay production traffic (uvicorn / gunicorn access logs) against a local instance.
+
+    # On the server: parse + anonymize the logs into a trace (no IPs, no secrets in query strings)
+    python -m benchmarks.replay prepare /var/log/api/access.log* -o trace.jsonl
+    # Locally: replay at 4x speed, at most 64 requests in flight
+    python -m benchmarks.replay run trace.jsonl --target http://127.0.0.1:8000 --speed 4 --concurrency 64 --out replay.json
+
+Requests are sent at their original relative time divided by --speed (logs without
+timestamps are re-timed at --rate requests/s). Only GET/HEAD are replayed: access logs do
+not hold request bodies. The report gives, per route template (ids replaced by {id}),
+latency percentiles, throughput, status counts, error rate and how often the status differs
+from the one logged, plus how late requests were sent (a late schedule means the client side,
+i.e. --concurrency, is the bottleneck rather than the API).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import secrets
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+
+from benchmarks.run import Result, _percentile, summarize
+
+REPLAYED_METHODS = ("GET", "HEAD")
+SENSITIVE_PARAMS = re.compile(r"token|password|passwd|secret|key|code|email|session|auth", re.IGNORECASE)
+
+# uvicorn: [2024-05-01 12:00:00,123 ...] INFO:     1.2.3.4:5678 - "GET /path?q=1 HTTP/1.1" 200 OK
+_UVICORN = re.compile(
+    r'(?P<client>[\w.:\[\]-]+?)(?::\d+)? - "(?P<method>[A-Z]+) (?P<target>\S+) HTTP/[\d.]+" (?P<status>\d{3})'
+)
+_ISO_TS = re.compile(r"(?P<ts>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)")
+# Common / combined log format (gunicorn, nginx): 1.2.3.4 - - [10/Oct/2000:13:55:36 -0700] "GET / HTTP/1.1" 200 2326
+_CLF = re.compile(
+    r'(?P<client>\S+) \S+ \S+ \[(?P<ts>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+) HTTP/[\d.]+" (?P<status>\d{3})'
+)
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+
+
+@dataclass(frozen=True)
+class Entry:
+    offset: float  # seconds since the first request of the trace
+    method: str
+    target: str  # anonymized path + query string
+    route: str
+    client: str  # anonymized client id
+    status: int  # status in the original log
+
+
+def _parse_iso(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace(",", ".").replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def parse_line(line: str) -> Optional[tuple[Optional[datetime], str, str, str, int]]:
+    """(timestamp or None, client, method, target, status), or None for other lines."""
+    m = _CLF.search(line)
+    if m:
+        ts = datetime.strptime(m["ts"], "%d/%b/%Y:%H:%M:%S %z")
+        return ts, m["client"], m["method"], m["target"], int(m["status"])
+    m = _UVICORN.search(line)
+    if not m:
+        return None
+    ts_match = _ISO_TS.search(line[: m.start()])
+    ts = _parse_iso(ts_match["ts"]) if ts_match else None
+    return ts, m["client"], m["method"], m["target"], int(m["status"])
+
+
+def anonymize_target(target: str) -> str:
+    parts = urlsplit(target)
+    query = [(k, "redacted" if SENSITIVE_PARAMS.search(k) else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return parts.path + (f"?{urlencode(query)}" if query else "")
+
+
+def route_of(target: str) -> str:
+    path = urlsplit(target).path
+    return "/".join("{id}" if _NUMERIC_SEGMENT.match(s) else s for s in path.split("/"))
+
+
+def parse_logs(lines: Iterable[str], *, rate: float = 10.0, salt: Optional[str] = None) -> list[Entry]:
+    """Parse and anonymize access log lines, sorted by time; lines without timestamps are spaced 1/rate apart.
+
+    Offsets are relative to the earliest timestamp, whatever the order of the lines (rotated
+    logs: access.log sorts before the older access.log.1). Client ids are salted digests of
+    the address; without `salt`, a random one per call: ids cannot be reversed by hashing
+    candidate IPs, nor linked across traces.
+    """
+    if salt is None:
+        salt = secrets.token_hex(16)
+    parsed = [p for p in map(parse_line, lines) if p is not None]
+    first = min((ts for ts, *_ in parsed if ts is not None), default=None)
+    clients: dict[str, str] = {}
+    entries = []
+    for n, (ts, client, method, target, status) in enumerate(parsed):
+        offset = (ts - first).total_seconds() if ts is not None else n / rate
+        if client not in clients:
+            digest = hashlib.sha256((salt + client).encode("utf-8")).hexdigest()[:8]
+            clients[client] = f"c{len(clients)}-{digest}"
+        entries.append(Entry(offset, method, anonymize_target(target), route_of(target), clients[client], status))
+    return sorted(entries, key=lambda e: e.offset)
+
+
+def read_trace(path: Path) -> list[Entry]:
+    with path.open(encoding="utf-8") as f:
+        return [Entry(**json.loads(line)) for line in f if line.strip()]
+
+
+def load(paths: list[Path], *, rate: float, salt: Optional[str] = None) -> list[Entry]:
+    if len(paths) == 1 and paths[0].suffix == ".jsonl":
+        return read_trace(paths[0])
+    lines: list[str] = []
+    for p in paths:
+        lines.extend(p.read_text(encoding="utf-8", errors="replace").splitlines())
+    return parse_logs(lines, rate=rate, salt=salt)
+
+
+# ==========================
+# Replay
+# ==========================
+async def replay(
+    client: httpx.AsyncClient, entries: list[Entry], *, speed: float = 1.0, concurrency: int = 32, timeout: float = 30.0
+) -> dict:
+    entries = [e for e in entries if e.method in REPLAYED_METHODS]
+    per_route: dict[str, Result] = {}
+    failures: dict[str, int] = {}  # transport errors / timeouts
+    mismatches: dict[str, int] = {}
+    lateness: list[float] = []
+    in_flight = 0
+    max_in_flight = 0
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(entry: Entry, due: float):
+        nonlocal in_flight, max_in_flight
+        async with slots:
+            lateness.append(max(time.perf_counter() - due, 0.0))
+            stats = per_route.setdefault(entry.route, Result())
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(entry.method, entry.target, timeout=timeout)
+                await resp.aread()
+            except httpx.HTTPError:
+                stats.errors += 1
+                failures[entry.route] = failures.get(entry.route, 0) + 1
+                return
+            finally:
+                in_flight -= 1
+            stats.latencies.append(time.perf_counter() - start)
+            stats.statuses[resp.status_code] = stats.statuses.get(resp.status_code, 0) + 1
+            stats.bytes += len(resp.content)
+            if resp.status_code >= 500:
+                stats.errors += 1
+            if resp.status_code != entry.status:
+                mismatches[entry.route] = mismatches.get(entry.route, 0) + 1
+
+    started = time.perf_counter()
+    tasks = []
+    for entry in entries:
+        due = started + entry.offset / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(entry, due)))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - started
+
+    routes = {}
+    for route, stats in sorted(per_route.items(), key=lambda kv: -len(kv[1].latencies)):
+        stats.wall_seconds = wall
+        summary = summarize(stats, None)
+        summary.pop("peak_rss_mb")
+        attempted = len(stats.latencies) + failures.get(route, 0)
+        summary["error_rate"] = round(stats.errors / attempted, 4) if attempted else 0.0
+        summary["status_mismatches"] = mismatches.get(route, 0)
+        routes[route] = summary
+
+    late = sorted(lateness)
+    span = entries[-1].offset / speed if entries else 0.0
+    return {
+        "requests": len(entries),
+        "duration_seconds": round(wall, 3),
+        "offered_rps": round(len(entries) / span, 1) if span else None,
+        "achieved_rps": round(len(entries) / wall, 1) if wall else None,
+        "max_in_flight": max_in_flight,
+        "schedule_lag_p95_ms": round(_percentile(late, 95) * 1000, 3),
+        "schedule_lag_max_ms": round(late[-1] * 1000, 3) if late else 0.0,
+        "routes": routes,
+    }
+
+
+def _print_summary(report: dict) -> None:
+    print(
+        f"{report['requests']} requests in {report['duration_seconds']}s "
+        f"(offered {report['offered_rps']} req/s, achieved {report['achieved_rps']} req/s, "
+        f"max in flight {report['max_in_flight']}, schedule lag p95 {report['schedule_lag_p95_ms']} ms)",
+        file=sys.stderr,
+    )
+    for route, r in report["routes"].items():
+        print(
+            f"  {route:36s} n={r['requests']:6d} p50={r['p50_ms']:8.2f}ms p95={r['p95_ms']:8.2f}ms "
+            f"p99={r['p99_ms']:8.2f}ms err={r['error_rate']:.2%}",
+            file=sys.stderr,
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    prep = sub.add_parser("prepare", help="parse + anonymize access logs into a JSONL trace")
+    prep.add_argument("logs", nargs="+", type=Path)
+    prep.add_argument("-o", "--output", type=Path, required=True)
+    prep.add_argument("--rate", type=float, default=10.0, help="req/s for logs without timestamps")
+    prep.add_argument(
+        "--salt", help="salt for client ids, to keep them stable across traces (default: random per run; keep it secret)"
+    )
+
+    run = sub.add_parser("run", help="replay a trace (or raw logs) against an instance")
+    run.add_argument("trace", nargs="+", type=Path, help="trace.jsonl from `prepare`, or raw access logs")
+    run.add_argument("--target", default="http://127.0.0.1:8000")
+    run.add_argument("--speed", type=float, default=1.0, help="time compression: 2 = twice as fast")
+    run.add_argument("--concurrency", type=int, default=32, help="max requests in flight")
+    run.add_argument("--rate", type=float, default=10.0, help="req/s for logs without timestamps")
+    run.add_argument("--limit", type=int, default=0, help="replay only the first N requests")
+    run.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.command == "prepare":
+        entries = load(args.logs, rate=args.rate, salt=args.salt)
+        with args.output.open("w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        print(f"{len(entries)} requests written to {args.output}", file=sys.stderr)
+        return
+
+    entries = load(args.trace, rate=args.rate)
+    if args.limit:
+        entries = entries[: args.limit]
+
+    async def _run():
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=args.target, limits=limits) as client:
+            return await replay(client, entries, speed=args.speed, concurrency=args.concurrency)
+
+    report = {"target": args.target, "speed": args.speed, "concurrency": args.concurrency, **asyncio.run(_run())}
+    _print_summary(report)
+    out = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(out + "\n", encoding="utf-8")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
-import subprocess
+import argparse
 import sys
 import os
 import logging
-from sqlalchemy import create_engine
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
 from sqlalchemy.exc import OperationalError
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+BASE_DIR = Path(__file__).resolve().parent
+
 def _is_production(env: str) -> bool:
     return env.lower() in {"prod", "production"}
 
@@ -22,40 +27,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger("init_app")
 
-def check_db_connection():
+# Tout tourne dans ce process, sur l'engine de l'application : pas de sous-process qui
+# réimporte l'app et se reconnecte. Sur une base déjà à jour (révision Alembic = head,
+# checksums des seeds inchangés), le démarrage se limite à quelques requêtes.
+
+def _fail(message: str):
+    # En prod, éviter les traces qui peuvent contenir des détails sensibles
+    if _is_production(ENV):
+        logger.error(message)
+    else:
+        logger.exception(message)
+    sys.exit(1)
+
+@contextmanager
+def _phase(name: str, timings: dict):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+def _alembic_config(connection):
+    from alembic.config import Config
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BASE_DIR / "migrations"))
+    cfg.attributes["connection"] = connection  # voir migrations/env.py
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+def check_db_connection(engine):
     logger.info("Vérification de la connexion à la base...")
     try:
-        engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
         with engine.connect():
             logger.info("Connexion à la base réussie.")
     except OperationalError:
-        # En prod, éviter les traces qui peuvent contenir des détails sensibles
-        if _is_production(ENV):
-            logger.error("Impossible de se connecter à la base.")
-        else:
-            logger.exception("Impossible de se connecter à la base.")
-        sys.exit(1)
-
-def run_alembic_migrations():
-    logger.info("Application des migrations Alembic...")
-    result = subprocess.run(["alembic", "upgrade", "head"])
-    if result.returncode == 0:
-        logger.info("Migrations appliquées avec succès.")
-    else:
-        logger.error("Erreur lors des migrations (code=%s).", result.returncode)
-        sys.exit(1)
+        _fail("Impossible de se connecter à la base.")
+
+def run_alembic_migrations(engine) -> bool:
+    """Applique les migrations manquantes ; False si le schéma était déjà à jour."""
+    from alembic import command
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    try:
+        with engine.begin() as connection:
+            cfg = _alembic_config(connection)
+            heads = set(ScriptDirectory.from_config(cfg).get_heads())
+            current = set(MigrationContext.configure(connection).get_current_heads())
+            if current == heads:
+                logger.info("Schéma à jour (%s) : aucune migration.", ", ".join(sorted(heads)))
+                return False
+            logger.info("Application des migrations Alembic (%s -> %s)...", ", ".join(sorted(current)) or "vide", ", ".join(sorted(heads)))
+            command.upgrade(cfg, "head")
+    except Exception:
+        _fail("Erreur lors des migrations.")
+    logger.info("Migrations appliquées avec succès.")
+    return True
+
+def run_seeds(engine, *, force: bool = False) -> list:
+    """Charge les seeds dont le checksum a changé (toutes si `force`)."""
+    from seeds.loader import format_report, load_all
 
-def run_seeds():
     logger.info("Insertion des données initiales (seeds)...")
-    result = subprocess.run([sys.executable, "-m", "seeds.seed_all"])
-    if result.returncode == 0:
-        logger.info("Seeds exécutés avec succès.")
-    else:
-        logger.error("Erreur lors de l'exécution des seeds (code=%s).", result.returncode)
-        sys.exit(1)
+    try:
+        reports = load_all(engine, force=force)
+    except Exception:
+        _fail("Erreur lors de l'exécution des seeds.")
+    for report in reports:
+        logger.info("  %s", format_report(report))
+    logger.info("Seeds exécutés avec succès.")
+    return reports
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Initialise la base : connexion, migrations, seeds.")
+    parser.add_argument("--force-seeds", action="store_true", help="recharger les seeds même si leur checksum est inchangé")
+    args = parser.parse_args(argv)
 
-if __name__ == "__main__":
     logger.info("Initialisation complète du projet...")
-    check_db_connection()
-    run_alembic_migrations()
-    run_seeds()
+    timings: dict = {}
+    with _phase("total", timings):
+        with _phase("engine", timings):
+            from app.database import engine
+        with _phase("connexion", timings):
+            check_db_connection(engine)
+        with _phase("migrations", timings):
+            migrated = run_alembic_migrations(engine)
+        with _phase("seeds", timings):
+            reports = run_seeds(engine, force=args.force_seeds)
+
+    loaded = [r["source"] for r in reports if not r["skipped"]]
+    logger.info(
+        "Initialisation terminée en %.3fs (engine %.3fs, connexion %.3fs, migrations %.3fs%s, seeds %.3fs%s).",
+        timings["total"],
+        timings["engine"],
+        timings["connexion"],
+        timings["migrations"],
+        "" if migrated else " : à jour",
+        timings["seeds"],
+        f" : {', '.join(loaded)}" if loaded else " : inchangés",
+    )
+    return {"timings": timings, "migrated": migrated, "seeds": reports}
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,9 @@ import app.models  # noqa: F401  (ensures models are registered on Base.metadata
 # Configuration Alembic
 config = context.config
 
-# Interprétation du fichier logging
-if config.config_file_name is not None:
+# Interprétation du fichier logging (pas quand init_app appelle Alembic en process : il
+# garde sa propre configuration de logs)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # Définition de la MetaData pour autogenerate
@@ -38,6 +39,12 @@ def run_migrations_offline():
 def run_migrations_online():
     """Run migrations in 'online' mode."""
     logger.info("Running migrations (online)")
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Connexion partagée fournie par init_app (même engine que les seeds)
+        _run_with(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
@@ -45,14 +52,18 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        _run_with(connection)
+
+
+def _run_with(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
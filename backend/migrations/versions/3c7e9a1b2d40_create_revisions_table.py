@@ -0,0 +1,35 @@
+"""create revisions table
+
+Revision ID: 3c7e9a1b2d40
+Revises: 8a1f3c5e7d92
+Create Date: 2026-10-19 10:02:17.551903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9a1b2d40'
+down_revision: Union[str, None] = '8a1f3c5e7d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    revisions = op.create_table(
+        'revisions',
+        sa.Column('resource', sa.String(length=50), nullable=False),
+        sa.Column('revision', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('resource'),
+    )
+    op.bulk_insert(
+        revisions,
+        [{'resource': r, 'revision': 0} for r in ('articles', 'cartes', 'dictionnaire', 'histoires')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('revisions')
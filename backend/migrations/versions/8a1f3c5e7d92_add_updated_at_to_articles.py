@@ -0,0 +1,38 @@
+"""add updated_at to articles + index date_ajout
+
+Revision ID: 8a1f3c5e7d92
+Revises: 5f2231d7d1d3
+Create Date: 2026-10-19 09:12:41.104233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1f3c5e7d92'
+down_revision: Union[str, None] = '5f2231d7d1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill existing rows from date_ajout (midnight UTC)
+    conn = op.get_bind()
+    conn.execute(text("UPDATE articles SET updated_at = CAST(date_ajout AS TIMESTAMP) WHERE updated_at IS NULL"))
+
+    op.alter_column('articles', 'updated_at', nullable=False)
+
+    op.create_index(op.f('ix_articles_updated_at'), 'articles', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_articles_date_ajout'), 'articles', ['date_ajout'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_articles_date_ajout'), table_name='articles')
+    op.drop_index(op.f('ix_articles_updated_at'), table_name='articles')
+    op.drop_column('articles', 'updated_at')
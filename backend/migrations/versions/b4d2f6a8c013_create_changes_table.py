@@ -0,0 +1,43 @@
+"""create changes table (delta sync log)
+
+Revision ID: b4d2f6a8c013
+Revises: 3c7e9a1b2d40
+Create Date: 2026-10-19 11:20:05.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d2f6a8c013'
+down_revision: Union[str, None] = '3c7e9a1b2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'changes',
+        sa.Column('revision', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('resource', sa.String(length=50), nullable=False),
+        sa.Column('resource_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(length=10), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('revision'),
+    )
+    op.create_index('ix_changes_resource_resource_id', 'changes', ['resource', 'resource_id'], unique=False)
+
+    # Global counter shared by all resources (see services.changes.record_change)
+    conn = op.get_bind()
+    conn.execute(text("INSERT INTO revisions (resource, revision) VALUES ('changes', 0)"))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("DELETE FROM revisions WHERE resource = 'changes'"))
+    op.drop_index('ix_changes_resource_resource_id', table_name='changes')
+    op.drop_table('changes')
@@ -0,0 +1,32 @@
+"""create seed_checksums table (init_app skips unchanged seeds)
+
+Revision ID: b8e4f2a6c915
+Revises: a5d1e9c3b742
+Create Date: 2026-10-19 21:12:08.563190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f2a6c915'
+down_revision: Union[str, None] = 'a5d1e9c3b742'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seed_checksums',
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('checksum', sa.String(length=64), nullable=False),
+        sa.Column('loaded_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('source'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_checksums')
@@ -0,0 +1,41 @@
+"""create slow_queries table (slow-query log)
+
+Revision ID: e7a9c2d4f105
+Revises: b4d2f6a8c013
+Create Date: 2026-10-19 15:02:44.120931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9c2d4f105'
+down_revision: Union[str, None] = 'b4d2f6a8c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'slow_queries',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=16), nullable=False),
+        sa.Column('statement', sa.Text(), nullable=False),
+        sa.Column('parameters', sa.Text(), nullable=True),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('plan', sa.Text(), nullable=True),
+        sa.Column('path', sa.String(length=200), nullable=True),
+        sa.Column('captured_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_slow_queries_fingerprint'), 'slow_queries', ['fingerprint'], unique=False)
+    op.create_index(op.f('ix_slow_queries_captured_at'), 'slow_queries', ['captured_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_slow_queries_captured_at'), table_name='slow_queries')
+    op.drop_index(op.f('ix_slow_queries_fingerprint'), table_name='slow_queries')
+    op.drop_table('slow_queries')
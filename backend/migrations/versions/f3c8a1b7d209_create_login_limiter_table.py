@@ -0,0 +1,39 @@
+"""create login_limiter table (shared login rate limiter state)
+
+Revision ID: f3c8a1b7d209
+Revises: e7a9c2d4f105
+Create Date: 2026-10-19 16:40:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1b7d209'
+down_revision: Union[str, None] = 'e7a9c2d4f105'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'login_limiter',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('fail_count', sa.Integer(), nullable=False),
+        sa.Column('first_fail', sa.Float(), nullable=False),
+        sa.Column('blocked_until', sa.Float(), nullable=False),
+        sa.Column('last', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(op.f('ix_login_limiter_last'), 'login_limiter', ['last'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        # Throttling state: no WAL (faster writes), truncated after a crash
+        op.execute('ALTER TABLE login_limiter SET UNLOGGED')
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_login_limiter_last'), table_name='login_limiter')
+    op.drop_table('login_limiter')
@@ -0,0 +1,346 @@
+"""Seed engine: streams each source into a staging table, then merges it on a natural key.
+
+- Sources (CSV / JSON Lines) are read row by row and sent in batches: nothing is held whole
+  in memory or in an ORM session.
+- Staging: COPY ... FROM STDIN on Postgres (psycopg2), batched executemany elsewhere (SQLite).
+- Merge: rows whose natural key exists are updated when a column differs, the others are
+  inserted, so re-running a seed is a no-op. Duplicate keys in a source: the first row wins.
+- Independent tables load in parallel, one connection each (sequentially on SQLite: a
+  single writer at a time), and each changed table bumps its revision (caches / ETags).
+- The checksum of each loaded source is kept in seed_checksums: unless forced, a source
+  that has not changed since its last load is skipped without being read into the database.
+
+    python -m seeds.seed_all [--only dictionnaire,articles] [--parallel 4] [--force]
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import Column, Index, Integer, MetaData, Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models import Article, Carte, Dictionnaire, Histoire, SeedChecksum
+from app.services import revisions as revisions_service
+
+SEEDS_DIR = Path(__file__).resolve().parent
+BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    path: Path
+    table: Table
+    columns: tuple[str, ...]  # loaded from the source
+    key: tuple[str, ...]  # natural key (subset of columns)
+    read: Callable[[Path], Iterator[dict]]
+    resource: str  # revision counter bumped when rows change
+    on_insert: Callable[[], dict] = dict  # extra values for new rows
+    on_update: Callable[[], dict] = dict  # extra values for changed rows
+
+
+def read_jsonl(path: Path) -> Iterator[dict]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# CSV headers -> dictionnaire columns (exported sheet, latin-1, ";"-separated)
+_DICTIONNAIRE_HEADERS = {
+    "Mot francais": "mots_francais",
+    "Synonyme francais": "synonymes_francais",
+    "Traduction": "mots_provencal",
+    "TradEG": "eg_provencal",
+    "TradD": "d_provencal",
+    "TradA": "a_provencal",
+    "TradH": "h_provencal",
+    "TradAv": "av_provencal",
+    "TradP": "p_provencal",
+    "TradX": "x_provencal",
+    "Thème": "theme",
+    "Catégorie": "categorie",
+    "Description": "description",
+}
+
+
+def read_dictionnaire_csv(path: Path) -> Iterator[dict]:
+    with path.open(encoding="latin-1", newline="") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            yield {column: row.get(header) for header, column in _DICTIONNAIRE_HEADERS.items()}
+
+
+def _now() -> dict:
+    return {"updated_at": datetime.now(timezone.utc)}
+
+
+def _new_article() -> dict:
+    return {"date_ajout": date.today(), **_now()}
+
+
+SOURCES = {
+    s.name: s
+    for s in (
+        Source(
+            "dictionnaire",
+            SEEDS_DIR / "src_dict.csv",
+            Dictionnaire.__table__,
+            columns=tuple(_DICTIONNAIRE_HEADERS.values()),
+            key=("theme", "categorie", "mots_francais", "mots_provencal"),
+            read=read_dictionnaire_csv,
+            resource=revisions_service.DICTIONNAIRE,
+        ),
+        Source(
+            "articles",
+            SEEDS_DIR / "articles.jsonl",
+            Article.__table__,
+            columns=("titre", "description", "image_url", "source_url"),
+            key=("titre",),
+            read=read_jsonl,
+            resource=revisions_service.ARTICLES,
+            on_insert=_new_article,
+            on_update=_now,
+        ),
+        Source(
+            "cartes",
+            SEEDS_DIR / "cartes.jsonl",
+            Carte.__table__,
+            columns=("titre", "iframe_url", "legende"),
+            key=("titre",),
+            read=read_jsonl,
+            resource=revisions_service.CARTES,
+        ),
+        Source(
+            "histoires",
+            SEEDS_DIR / "histoires.jsonl",
+            Histoire.__table__,
+            columns=("titre", "typologie", "periode", "description_courte", "description_longue", "source_url"),
+            key=("titre",),
+            read=read_jsonl,
+            resource=revisions_service.HISTOIRES,
+        ),
+    )
+}
+
+
+def checksum(source: Source) -> str:
+    """sha256 of the source file and of its mapping (a mapping change forces a reload)."""
+    digest = hashlib.sha256(repr((source.name, source.columns, source.key)).encode("utf-8"))
+    with source.path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stored_checksum(conn: Connection, source: Source) -> Optional[str]:
+    return conn.execute(select(SeedChecksum.checksum).where(SeedChecksum.source == source.name)).scalar()
+
+
+def _store_checksum(conn: Connection, source: Source, value: str) -> None:
+    values = {"checksum": value, "loaded_at": datetime.now(timezone.utc)}
+    table = SeedChecksum.__table__
+    if not conn.execute(table.update().where(table.c.source == source.name).values(**values)).rowcount:
+        conn.execute(table.insert().values(source=source.name, **values))
+
+
+# ==========================
+# Staging
+# ==========================
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _staging_table(source: Source) -> Table:
+    columns = [Column(name, source.table.c[name].type) for name in source.columns]
+    # target_id: id of the existing row with the same natural key (NULL: new row)
+    return Table(
+        f"_seed_{source.name}",
+        MetaData(),
+        Column("seq", Integer),
+        Column("target_id", Integer),
+        *columns,
+        Index(f"_seed_{source.name}_key", *source.key),
+        prefixes=["TEMPORARY"],
+    )
+
+
+def _csv_value(value) -> str:
+    # COPY csv: an unquoted empty field is NULL, a quoted one is the empty string
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_batch(conn: Connection, staging: Table, columns: Sequence[str], batch: list[tuple]) -> None:
+    buf = io.StringIO()
+    for values in batch:
+        buf.write(",".join(_csv_value(v) for v in values))
+        buf.write("\n")
+    buf.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+    finally:
+        cursor.close()
+
+
+def _can_copy(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        return hasattr(cursor, "copy_expert")
+    finally:
+        cursor.close()
+
+
+def stage(conn: Connection, source: Source, *, batch_size: int = BATCH_SIZE) -> tuple[Table, int]:
+    staging = _staging_table(source)
+    staging.create(conn)
+    columns = ("seq", *source.columns)
+    use_copy = _can_copy(conn)
+    count = 0
+    for batch in _batches(source.read(source.path), batch_size):
+        values = [(count + i, *(row.get(c) for c in source.columns)) for i, row in enumerate(batch)]
+        count += len(batch)
+        if use_copy:
+            _copy_batch(conn, staging, columns, values)
+        else:
+            conn.execute(insert(staging), [dict(zip(columns, v)) for v in values])
+    # Duplicate natural keys in the source: keep the first occurrence
+    first = select(func.min(staging.c.seq)).group_by(*(staging.c[k] for k in source.key))
+    conn.execute(staging.delete().where(staging.c.seq.not_in(first.scalar_subquery())))
+    return staging, count
+
+
+# ==========================
+# Merge
+# ==========================
+def _same(conn: Connection, a: str, b: str) -> str:
+    # NULL-safe equality
+    return f"{a} IS NOT DISTINCT FROM {b}" if conn.dialect.name == "postgresql" else f"{a} IS {b}"
+
+
+def _same_key(conn: Connection, a: str, b: str) -> str:
+    # Postgres cannot hash-join on IS NOT DISTINCT FROM (nested loop over both tables):
+    # compare text keys with NULL folded into ''. SQLite probes the staging key index with IS.
+    return f"COALESCE({a}, '') = COALESCE({b}, '')" if conn.dialect.name == "postgresql" else f"{a} IS {b}"
+
+
+def merge(conn: Connection, source: Source, staging: Table) -> tuple[int, int]:
+    """(inserted, updated) rows."""
+    target = source.table.name
+    match = " AND ".join(_same_key(conn, f"t.{k}", f"{staging.name}.{k}") for k in source.key)
+    conn.execute(text(f"UPDATE {staging.name} SET target_id = t.id FROM {target} t WHERE {match}"))
+
+    updated = 0
+    others = [c for c in source.columns if c not in source.key]
+    if others:
+        extra = source.on_update()
+        assignments = [f"{c} = s.{c}" for c in others] + [f"{c} = :u_{c}" for c in extra]
+        changed = " OR ".join(f"NOT ({_same(conn, f'{target}.{c}', f's.{c}')})" for c in others)
+        updated = conn.execute(
+            text(
+                f"UPDATE {target} SET {', '.join(assignments)} FROM {staging.name} s "
+                f"WHERE {target}.id = s.target_id AND ({changed})"
+            ),
+            {f"u_{c}": v for c, v in extra.items()},
+        ).rowcount
+
+    extra = source.on_insert()
+    columns = [*source.columns, *extra]
+    selected = [f"s.{c}" for c in source.columns] + [f":i_{c}" for c in extra]
+    inserted = conn.execute(
+        text(
+            f"INSERT INTO {target} ({', '.join(columns)}) SELECT {', '.join(selected)} FROM {staging.name} s "
+            f"WHERE s.target_id IS NULL ORDER BY s.seq"
+        ),
+        {f"i_{c}": v for c, v in extra.items()},
+    ).rowcount
+    return inserted, updated
+
+
+# ==========================
+# Load
+# ==========================
+def load_source(engine: Engine, source: Source, *, batch_size: int = BATCH_SIZE, force: bool = True) -> dict:
+    start = time.perf_counter()
+    digest = checksum(source)
+    with engine.begin() as conn:
+        if not force and _stored_checksum(conn, source) == digest:
+            return {
+                "source": source.name,
+                "skipped": True,
+                "rows": 0,
+                "inserted": 0,
+                "updated": 0,
+                "seconds": round(time.perf_counter() - start, 3),
+                "rows_per_second": None,
+            }
+        staging, rows = stage(conn, source, batch_size=batch_size)
+        inserted, updated = merge(conn, source, staging)
+        staging.drop(conn)
+        if inserted or updated:
+            with Session(bind=conn) as db:  # joins the loader's transaction
+                revisions_service.mark_changed(db, source.resource)
+                db.flush()
+        _store_checksum(conn, source, digest)
+    seconds = time.perf_counter() - start
+    return {
+        "source": source.name,
+        "skipped": False,
+        "rows": rows,
+        "inserted": inserted,
+        "updated": updated,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+    }
+
+
+def load_all(
+    engine: Engine,
+    names: Optional[Sequence[str]] = None,
+    *,
+    parallel: int = 4,
+    batch_size: int = BATCH_SIZE,
+    force: bool = False,
+) -> list[dict]:
+    """Load the sources (all by default); unchanged ones are skipped unless `force`."""
+    sources = [SOURCES[n] for n in (names or SOURCES)]
+
+    def load(source: Source) -> dict:
+        return load_source(engine, source, batch_size=batch_size, force=force)
+
+    if engine.dialect.name == "sqlite":
+        parallel = 1
+    if parallel <= 1 or len(sources) <= 1:
+        return [load(s) for s in sources]
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="seed") as pool:
+        return list(pool.map(load, sources))
+
+
+def format_report(report: dict) -> str:
+    if report["skipped"]:
+        return f"{report['source']:14s} inchangé (checksum)"
+    return (
+        f"{report['source']:14s} {report['rows']:7d} lignes  +{report['inserted']} ~{report['updated']}  "
+        f"{report['seconds']:.3f}s  {report['rows_per_second'] or 0} lignes/s"
+    )
@@ -1,13 +1,29 @@
+import argparse
+import sys
 
-from seeds.seed_articles import seed_articles
-from seeds.seed_cartes import seed_cartes
-from seeds.seed_histoires import seed_histoires
-from seeds.seed_dictionnaire import seed_dictionnaire
+from seeds.loader import SOURCES, format_report, load_all
+
+
+def main(argv=None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="Charge les données initiales (idempotent).")
+    parser.add_argument("--only", default="", help=f"sources séparées par des virgules ({', '.join(SOURCES)})")
+    parser.add_argument("--parallel", type=int, default=4, help="tables chargées en parallèle (1 sur SQLite)")
+    parser.add_argument("--force", action="store_true", help="recharger aussi les sources inchangées (checksum)")
+    args = parser.parse_args(argv)
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or None
+    unknown = sorted(set(names or ()) - set(SOURCES))
+    if unknown:
+        parser.error(f"sources inconnues : {', '.join(unknown)}")
+
+    from app.database import engine
 
-if __name__ == "__main__":
     print("🚀 Initialisation des données...")
-    seed_articles()
-    seed_cartes()
-    seed_histoires()
-    seed_dictionnaire()
-    print("✅ Toutes les données ont été ajoutées avec succès !")
+    reports = load_all(engine, names, parallel=args.parallel, force=args.force)
+    for r in reports:
+        print(f"  {format_report(r)}", file=sys.stderr)
+    print("✅ Toutes les données sont à jour !")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
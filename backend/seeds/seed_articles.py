@@ -1,27 +1,12 @@
+from app.database import engine
+from seeds.loader import SOURCES, load_source
 
-from app.database import SessionLocal
-from app.models import Article
 
-def seed_articles():
-    db = SessionLocal()
-    articles = [
-        Article(
-            titre="Découverte de la Provence",
-            description="Un voyage au cœur des paysages provençaux.",
-            image_url="https://via.placeholder.com/150",
-            source_url="https://example.com/article1"
-        ),
-        Article(
-            titre="Cuisine Provençale",
-            description="Les saveurs authentiques de la région.",
-            image_url="https://via.placeholder.com/150",
-            source_url="https://example.com/article2"
-        )
-    ]
-    db.add_all(articles)
-    db.commit()
-    db.close()
-    print("✅ Articles ajoutés avec succès !")
+def seed_articles() -> dict:
+    report = load_source(engine, SOURCES["articles"])
+    print(f"✅ Articles ajoutés : {report['inserted']} nouveaux, {report['updated']} mis à jour.")
+    return report
+
 
 if __name__ == "__main__":
     seed_articles()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# app.core.config fails fast without DATABASE_URL; tests never need a real Postgres.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Any endpoint running more statements than this in a test fails (catches N+1 regressions).
+os.environ.setdefault("SQL_QUERY_BUDGET", "20")
+os.environ.setdefault("SQL_QUERY_BUDGET_STRICT", "1")
+# Cheapest bcrypt work factor: tests exercise the flow, not the cost.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+@pytest.fixture(autouse=True)
+def _clear_response_cache():
+    """Each test gets its own database: never serve a response cached by a previous test."""
+    from app.utils import response_cache
+
+    response_cache.clear()
+
+
+@pytest.fixture
+def db_session():
+    """Fresh in-memory SQLite session with all tables created."""
+    from app.database import Base
+    import app.models  # noqa: F401  (registers models on Base.metadata)
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+    db = Session()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db_session):
+    """TestClient on the app, every request using `db_session` (get_db overridden)."""
+    from fastapi.testclient import TestClient
+
+    from app.database import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def async_app(tmp_path):
+    """The app in async mode (DATABASE_ASYNC=1): AsyncSession per request on sqlite+aiosqlite.
+
+    Drive it with httpx.AsyncClient(transport=httpx.ASGITransport(app=async_app)) to send
+    concurrent requests on one event loop, or through the `async_client` TestClient.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.database import Base, get_db
+    from app.main import app
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_async_db
+    try:
+        yield app
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def async_client(async_app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(async_app) as client:
+        yield client
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.schemas import ArticleCreate, ArticleUpdate
+from app.services import articles as articles_service
+from app.services.errors import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _create(db, titre):
+    return articles_service.create_article_service(db, article_in=ArticleCreate(titre=titre))
+
+
+def test_cursor_roundtrip():
+    ts = datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+
+def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(ValidationError):
+        articles_service.list_articles_changed_service(db_session, since=None, cursor="%%%", limit=10)
+
+
+def test_since_returns_only_changes_in_stable_order(db_session):
+    a = _create(db_session, "A")
+    b = _create(db_session, "B")
+    c = _create(db_session, "C")
+    assert a.updated_at is not None
+
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    items, cursor = articles_service.list_articles_changed_service(db_session, since=since, cursor=None, limit=2)
+    assert [x.titre for x in items] == ["A", "B"]
+
+    items, cursor = articles_service.list_articles_changed_service(db_session, since=since, cursor=cursor, limit=2)
+    assert [x.titre for x in items] == ["C"]
+
+    # Nothing new: the incoming cursor is echoed back
+    items, same = articles_service.list_articles_changed_service(db_session, since=None, cursor=cursor, limit=2)
+    assert items == [] and same == cursor
+
+    # Modifying A moves it after the cursor
+    articles_service.update_article_service(db_session, article_id=a.id, article_in=ArticleUpdate(titre="A2"))
+    items, _ = articles_service.list_articles_changed_service(db_session, since=None, cursor=cursor, limit=10)
+    assert [x.titre for x in items] == ["A2"]
+    assert b.id not in [x.id for x in items] and c.id not in [x.id for x in items]
@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_database_url, run_db
+from app.utils.security import create_access_token
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql+psycopg2://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+    assert async_database_url("sqlite:///./local.db") == "sqlite+aiosqlite:///./local.db"
+
+
+def test_routes_run_services_through_async_session(async_client):
+    token = create_access_token({"sub": "editor"})
+    resp = async_client.post(
+        "/histoires/",
+        json={"titre": "La Chèvre d'or", "typologie": "Légende", "periode": "Moyen Âge"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 201, resp.text
+
+    resp = async_client.get("/histoires/menu")
+    assert resp.status_code == 200
+    assert resp.json()["Légende"]["Moyen Âge"][0]["titre"] == "La Chèvre d'or"
+    assert async_client.get("/changes/").json()["lastRevision"] == 1
+    assert async_client.get("/health").json()["db"] == "ok"
+
+
+def test_run_db_uses_run_sync_for_async_sessions():
+    class FakeAsyncSession(AsyncSession):
+        def __init__(self):
+            pass
+
+        async def run_sync(self, fn, *args, **kwargs):
+            return ("run_sync", fn("sync-session", *args, **kwargs))
+
+    result = asyncio.run(run_db(FakeAsyncSession(), lambda s, x: (s, x), 1))
+    assert result == ("run_sync", ("sync-session", 1))
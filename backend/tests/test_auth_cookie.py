@@ -3,13 +3,21 @@ from app.main import app
 
 
 def test_login_sets_access_token_cookie(monkeypatch):
-    # Monkeypatch the login_service to avoid DB dependency
+    # Monkeypatch the login steps to avoid DB and bcrypt dependencies
     import app.routes.auth as auth_routes
 
-    def fake_login_service(db, username, password):
+    def fake_get_login_hash_service(db, username):
+        return username, "stored-hash"
+
+    async def fake_verify(password, hashed):
+        return True, None
+
+    def fake_complete_login_service(db, username, new_hash=None):
         return {"access_token": "fake-token-123", "token_type": "bearer"}
 
-    monkeypatch.setattr(auth_routes.auth_service, "login_service", fake_login_service)
+    monkeypatch.setattr(auth_routes.auth_service, "get_login_hash_service", fake_get_login_hash_service)
+    monkeypatch.setattr(auth_routes, "verify_and_update_password_async", fake_verify)
+    monkeypatch.setattr(auth_routes.auth_service, "complete_login_service", fake_complete_login_service)
 
     client = TestClient(app)
     resp = client.post("/auth/login", data={"username": "u", "password": "p"})
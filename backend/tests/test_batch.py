@@ -0,0 +1,118 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.database import get_db
+from app.main import app
+from app.routes import auth as auth_routes
+from app.routes import batch as batch_routes
+from app.schemas import DictionnaireCreate, HistoireCreate
+from app.services import dictionnaire as dict_service
+from app.services import histoires as histoires_service
+from app.utils import response_cache
+from app.utils.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.utils.security import create_access_token
+
+PAGE = [
+    {"id": "themes", "path": "/dictionnaire/themes"},
+    {"id": "categories", "path": "/dictionnaire/categories?theme=Cuisine"},
+    {"id": "page", "path": "/dictionnaire/?page=1&limit=2"},
+    {"id": "menu", "path": "/histoires/menu"},
+]
+
+
+@pytest.fixture
+def seeded(db_session):
+    for mot, theme, categorie in (("Ail", "Cuisine", "Légumes"), ("Oli", "Cuisine", "Huiles"), ("Mistrau", "Nature", "Vent")):
+        dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais=mot, theme=theme, categorie=categorie))
+    histoires_service.create_histoire_service(
+        db_session, histoire_in=HistoireCreate(titre="La Tarasque", typologie="Légende", periode="Moyen Âge")
+    )
+    previous = response_cache.get_backend()
+    response_cache.set_backend(None)
+    try:
+        yield db_session
+    finally:
+        response_cache.set_backend(previous)
+
+
+def test_batch_returns_each_sub_response_in_order(seeded, client):
+    resp = client.post("/batch", json={"requests": PAGE})
+    assert resp.status_code == 200
+    responses = resp.json()["responses"]
+    assert [r["id"] for r in responses] == ["themes", "categories", "page", "menu"]
+    for item, sub in zip(PAGE, responses):
+        direct = client.get(item["path"])
+        assert (sub["status"], sub["body"]) == (direct.status_code, direct.json())
+        assert sub["headers"]["etag"] == direct.headers["etag"]
+
+
+def test_batch_uses_a_single_session(seeded, monkeypatch):
+    opened = []
+    factory = sessionmaker(bind=seeded.get_bind(), autoflush=False, future=True)
+    monkeypatch.setattr(database, "SessionLocal", lambda: opened.append(1) or factory())
+
+    resp = TestClient(app).post("/batch", json={"requests": PAGE})
+    assert [r["status"] for r in resp.json()["responses"]] == [200, 200, 200, 200]
+    assert opened == [1]
+
+
+def test_sub_request_errors_and_headers(seeded, client):
+    etag = client.get("/dictionnaire/themes").headers["etag"]
+    token = create_access_token({"sub": "editor"})
+    requests = [
+        {"path": "/dictionnaire/themes", "ifNoneMatch": etag},
+        {"path": "/histoires/999999"},
+        {"path": "/admin/slow-queries"},
+    ]
+
+    anonymous = client.post("/batch", json={"requests": requests}).json()["responses"]
+    assert [r["status"] for r in anonymous] == [304, 404, 401]
+    assert anonymous[0]["body"] is None
+    assert anonymous[1]["body"]["detail"]["code"] == "not_found"
+
+    authenticated = client.post("/batch", json={"requests": requests}, headers={"Authorization": f"Bearer {token}"})
+    assert authenticated.json()["responses"][2]["status"] == 200
+
+
+@pytest.mark.parametrize(
+    "requests",
+    [
+        [{"path": "/batch"}],
+        [{"path": "https://example.org/articles/"}],
+        [{"path": "/articles/"}] * 11,
+        [],
+    ],
+)
+def test_invalid_batches_are_rejected(seeded, client, requests):
+    resp = client.post("/batch", json={"requests": requests})
+    assert resp.status_code in (400, 422)
+
+
+def test_sub_requests_are_rate_limited_per_forwarded_client(monkeypatch):
+    monkeypatch.setattr(auth_routes, "_TRUST_PROXY_HEADERS", True)
+    api = FastAPI()
+
+    @api.get("/items/")
+    async def items():
+        return []
+
+    async def no_db():
+        yield None
+
+    api.include_router(batch_routes.router, prefix="/batch")
+    api.dependency_overrides[get_db] = no_db
+    # burst 2 = one list read per client
+    api.add_middleware(RateLimitMiddleware, limiter=TokenBucketLimiter(rate=0.01, burst=2), client_ip=auth_routes._client_ip)
+    client = TestClient(api)
+
+    def batch(ip):
+        resp = client.post("/batch", json={"requests": [{"id": "a", "path": "/items/"}]}, headers={"X-Forwarded-For": ip})
+        assert resp.status_code == 200
+        return resp.json()["responses"][0]["status"]
+
+    # All come through the same proxy: each client has its own bucket
+    assert [batch(ip) for ip in ("1.1.1.1", "2.2.2.2", "3.3.3.3")] == [200, 200, 200]
+    assert batch("1.1.1.1") == 429
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from benchmarks import compare
+from benchmarks.datasets import Scale, ensure_dataset
+from benchmarks.run import endpoints, run_inprocess, sample_ids
+
+
+def test_suite_drives_every_endpoint_on_a_tiny_dataset(tmp_path):
+    # Concurrent requests: one session each (a Session is not thread-safe), like get_db
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}", connect_args={"check_same_thread": False}, future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+    def session_per_request():
+        with Session() as db:
+            yield db
+
+    scale = Scale(dictionnaire=50, histoires=5, articles=2, cartes=2, image_bytes=100)
+    assert ensure_dataset(engine, scale)["reused"] is False
+    assert ensure_dataset(engine, scale)["reused"] is True
+
+    app.dependency_overrides[get_db] = session_per_request
+    try:
+        report = asyncio.run(
+            run_inprocess(app, endpoints(sample_ids(engine)), requests=3, concurrency=2, warmup=0)
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+    for name, result in report.items():
+        assert result["statuses"] == {"200": 3}, name
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
+        assert result["throughput_rps"] > 0
+
+    before = tmp_path / "before.json"
+    after = tmp_path / "after.json"
+    before.write_text(json.dumps({"endpoints": report}))
+    slower = {name: {**r, "p95_ms": r["p95_ms"] * 2} for name, r in report.items()}
+    after.write_text(json.dumps({"endpoints": slower}))
+    assert compare.main([str(before), str(before), "--fail"]) == 0
+    assert compare.main([str(before), str(after), "--fail", "--json"]) == 1
@@ -0,0 +1,88 @@
+import json
+import threading
+
+from app.crud import changes as changes_crud
+from app.schemas import DictionnaireCreate
+from app.services import changes as changes_service
+from app.services import dictionnaire as dict_service
+from app.utils.pg_listener import CacheInvalidationListener
+
+
+def _payload(revision, resource="articles", node="other"):
+    return json.dumps({"resource": resource, "id": 1, "op": "update", "revision": revision, "node": node})
+
+
+def _listener(events, **kwargs):
+    return CacheInvalidationListener(
+        "postgresql://u:p@localhost/db",
+        channel="cache_invalidation",
+        node_id="me",
+        on_change=lambda resource: events.append(("change", resource)),
+        on_flush=lambda: events.append(("flush",)),
+        **kwargs,
+    )
+
+
+def test_write_notifies_other_nodes_in_the_transaction(db_session, monkeypatch):
+    sent = []
+    monkeypatch.setattr(changes_crud, "notify", lambda db, *, channel, payload: sent.append((channel, json.loads(payload))))
+
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail"))
+    assert sent == []  # SQLite: no NOTIFY
+
+    monkeypatch.setattr(db_session.get_bind().dialect, "name", "postgresql")
+    mot = dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Olive"))
+    assert sent == [(
+        "cache_invalidation",
+        {"resource": "dictionnaire", "id": mot.id, "op": "create", "revision": 2, "node": changes_service.NODE_ID},
+    )]
+
+
+def test_listener_invalidates_on_other_nodes_changes_and_flushes_on_gaps():
+    events = []
+    listener = _listener(events)
+
+    listener.handle(_payload(5, node="me"))  # own write: caches already invalidated locally
+    listener.handle(_payload(6, resource="cartes"))
+    listener.handle(_payload(9))  # 7 and 8 were missed
+    listener.handle("not json")
+
+    assert events == [("change", "cartes"), ("flush",), ("change", "articles")]
+    assert listener.last_revision == 9
+
+
+def test_listener_reconnects_and_flushes():
+    events = []
+    connects = []
+    done = threading.Event()
+
+    class FlakyListener(CacheInvalidationListener):
+        def _connect(self):
+            connects.append(1)
+            if len(connects) == 2:
+                raise OSError("connection refused")
+            return object()
+
+        def _wait(self, conn, timeout):
+            if len(connects) == 1:
+                raise OSError("server closed the connection")
+            done.set()
+            self._stop.wait(timeout)
+            return [_payload(1)]
+
+    listener = FlakyListener(
+        "postgresql://u:p@localhost/db",
+        channel="cache_invalidation",
+        node_id="me",
+        on_change=lambda resource: events.append(("change", resource)),
+        on_flush=lambda: events.append(("flush",)),
+        poll_seconds=0.01,
+        min_backoff_seconds=0.01,
+        max_backoff_seconds=0.01,
+    )
+    listener.start()
+    assert done.wait(5)
+    listener.stop()
+
+    assert len(connects) == 3
+    assert events[0] == ("flush",)  # reconnected: notifications may have been missed
@@ -0,0 +1,33 @@
+from app.schemas import CarteCreate, CarteUpdate, DictionnaireCreate
+from app.services import cartes as cartes_service
+from app.services import dictionnaire as dict_service
+
+
+def test_changes_feed_with_compaction(client, db_session):
+    carte = cartes_service.create_carte_service(db_session, carte_in=CarteCreate(titre="Arles", iframe_url="https://x"))
+    mot = dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail"))
+    cartes_service.update_carte_service(db_session, carte_id=carte.id, carte_in=CarteUpdate(legende="Camargue"))
+
+    page = client.get("/changes/").json()
+    # The carte create was superseded by its update: one entry per object, in revision order
+    assert [(c["resource"], c["resourceId"], c["operation"]) for c in page["items"]] == [
+        ("dictionnaire", mot.id, "create"),
+        ("cartes", carte.id, "update"),
+    ]
+    assert page["lastRevision"] == 3
+    assert page["hasMore"] is False
+
+    dict_service.delete_mot_service(db_session, mot_id=mot.id)
+    page = client.get(f"/changes/?after={page['lastRevision']}").json()
+    assert [(c["resource"], c["operation"], c["revision"]) for c in page["items"]] == [("dictionnaire", "delete", 4)]
+
+
+def test_changes_paging(client, db_session):
+    for i in range(3):
+        dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais=f"mot{i}"))
+
+    page = client.get("/changes/?limit=2").json()
+    assert len(page["items"]) == 2 and page["hasMore"] is True
+    page = client.get(f"/changes/?after={page['lastRevision']}&limit=2").json()
+    assert len(page["items"]) == 1 and page["hasMore"] is False
+    assert client.get(f"/changes/?after={page['lastRevision']}").json()["items"] == []
@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import threading
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.schemas import DictionnaireCreate
+from app.services import dictionnaire as dict_service
+from app.utils import response_cache
+from app.utils.compression import ENCODINGS, Compression, CompressionMiddleware
+from app.utils.http_cache import negotiate_encoding
+from app.utils.response_cache import MemoryBackend
+
+
+@pytest.fixture
+def client(client, db_session):
+    previous = response_cache.get_backend()
+    response_cache.set_backend(MemoryBackend(max_bytes=1 << 20))
+    for i in range(40):
+        dict_service.create_mot_service(
+            db_session, mot_in=DictionnaireCreate(mots_francais=f"Mot {i}", mots_provencal=f"Mot prouvençau {i}", theme="Cuisine")
+        )
+    try:
+        yield client
+    finally:
+        response_cache.set_backend(previous)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("*", "br"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept, expected):
+    assert negotiate_encoding(accept, ("br", "gzip")) == expected
+
+
+def test_cached_list_is_compressed_once_and_served_in_each_encoding(client, monkeypatch):
+    calls = []
+    original = Compression.compress
+    monkeypatch.setattr(Compression, "compress", lambda self, body, enc: calls.append(enc) or original(self, body, enc))
+
+    identity = client.get("/dictionnaire/", params={"limit": 40}, headers={"Accept-Encoding": "identity"})
+    assert identity.headers["x-cache"] == "MISS"
+    assert "content-encoding" not in identity.headers
+    assert "Accept-Encoding" in identity.headers["vary"]
+    assert sorted(calls) == sorted(ENCODINGS)
+
+    for encoding in ENCODINGS:
+        resp = client.get("/dictionnaire/", params={"limit": 40}, headers={"Accept-Encoding": encoding})
+        assert (resp.headers["x-cache"], resp.headers["content-encoding"]) == ("HIT", encoding)
+        assert resp.content == identity.content
+        assert int(resp.headers["content-length"]) < len(identity.content)
+        assert resp.headers["etag"] == "W/" + identity.headers["etag"].removeprefix("W/")
+    assert sorted(calls) == sorted(ENCODINGS)  # never compressed again
+
+    not_modified = client.get(
+        "/dictionnaire/", params={"limit": 40}, headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+
+
+def test_uncached_responses_go_through_the_middleware(client):
+    response_cache.set_backend(None)
+    resp = client.get("/dictionnaire/themes", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers  # below the minimum size
+
+    page = client.get("/dictionnaire/", params={"limit": 40, "search": "Mot"}, headers={"Accept-Encoding": "gzip"})
+    assert page.headers["content-encoding"] == "gzip"
+    assert "x-cache" not in page.headers
+    assert page.json()["total"] == 40
+
+
+def test_streamed_and_offloaded_bodies():
+    body = "lou soulèu me fai canta ".encode() * 2000
+    mini = FastAPI()
+
+    @mini.get("/stream")
+    def stream():
+        return StreamingResponse((body[i : i + 5000] for i in range(0, len(body), 5000)), media_type="text/plain")
+
+    for encoding in ENCODINGS:
+        resp = TestClient(CompressionMiddleware(mini, compression=Compression())).get(
+            "/stream", headers={"Accept-Encoding": encoding}
+        )
+        assert resp.headers["content-encoding"] == encoding
+        assert resp.content == body
+
+    threads = []
+    original = Compression.compress
+
+    class Recording(Compression):
+        def compress(self, data, encoding):
+            threads.append(threading.get_ident())
+            return original(self, data, encoding)
+
+    c = Recording(offload_size=len(body))
+    assert gzip.decompress(asyncio.run(c.compress_async(body, "gzip"))) == body
+    assert brotli.decompress(asyncio.run(c.compress_async(body[:100], "br"))) == body[:100]
+    assert threads[0] != threading.get_ident()  # large body: threadpool
+    assert threads[1] == threading.get_ident()  # small body: inline
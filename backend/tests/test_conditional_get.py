@@ -0,0 +1,39 @@
+from app.routes import dictionnaire as dictionnaire_routes
+from app.schemas import DictionnaireCreate, DictionnaireUpdate
+from app.services import dictionnaire as dict_service
+
+
+def test_list_returns_304_without_running_the_query(client, db_session, monkeypatch):
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail", theme="Nature"))
+
+    resp = client.get("/dictionnaire/?page=1&limit=20")
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    def boom(*args, **kwargs):
+        raise AssertionError("list query must not run on a matching If-None-Match")
+
+    monkeypatch.setattr(dictionnaire_routes.dict_service, "list_mots_service", boom)
+    resp = client.get("/dictionnaire/?limit=20&page=1", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+
+def test_etag_depends_on_query_and_revision(client, db_session):
+    mot = dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Aneth"))
+
+    etag_p1 = client.get("/dictionnaire/?page=1").headers["etag"]
+    etag_p2 = client.get("/dictionnaire/?page=2").headers["etag"]
+    assert etag_p1 != etag_p2
+
+    dict_service.update_mot_service(db_session, mot_id=mot.id, mot_in=DictionnaireUpdate(theme="Nature"))
+    resp = client.get("/dictionnaire/?page=1", headers={"If-None-Match": etag_p1})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag_p1
+
+
+def test_detail_and_menu_emit_validators(client):
+    assert client.get("/histoires/menu").headers["etag"]
+    resp = client.get("/articles/999")
+    assert resp.status_code == 404
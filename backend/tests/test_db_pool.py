@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc as sa_exc, text
+
+from app.utils.db_pool import InstrumentedQueuePool, instrument_engine, pool_kwargs, pool_status
+
+
+def _settings(**overrides):
+    base = dict(
+        db_pool_size=1,
+        db_max_overflow=0,
+        db_pool_timeout=0.05,
+        db_pool_recycle=1800,
+        db_pool_pre_ping=False,
+        db_pool_idle_check_seconds=30,
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    eng = create_engine(url, **pool_kwargs(url, _settings(), use_async=False))
+    yield eng
+    eng.dispose()
+
+
+def test_memory_sqlite_keeps_default_pool():
+    assert "poolclass" not in pool_kwargs("sqlite://", _settings(), use_async=False)
+
+
+def test_checkout_timeouts_and_wait_are_recorded(engine):
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    stats = instrument_engine(engine, name="t", idle_check_seconds=30, pre_ping=False)
+
+    held = engine.connect()
+    with pytest.raises(sa_exc.TimeoutError):
+        engine.connect()
+    held.close()
+
+    status = pool_status(engine, stats)
+    assert status["timeouts"] == 1
+    assert status["wait_count"] == 2
+    assert status["checked_out"] == 0 and status["size"] == 1
+
+    engine.dispose()  # the recreated pool keeps reporting into the same stats
+    assert engine.pool.stats is stats
+
+
+def test_only_idle_connections_are_pinged(engine, monkeypatch):
+    stats = instrument_engine(engine, name="t", idle_check_seconds=30, pre_ping=False)
+    pings = []
+
+    def fake_ping(dbapi_conn):
+        pings.append(dbapi_conn)
+        return len(pings) > 1  # first ping: the idle connection is dead
+
+    monkeypatch.setattr(engine.dialect, "do_ping", fake_ping)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:  # recently checked in: no ping
+        conn.execute(text("SELECT 1"))
+    assert pings == []
+
+    # Age the pooled connection past the idle threshold
+    rec = engine.pool._pool.queue[0]
+    rec.info["last_checkin"] -= 60
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert stats.invalidated.value == 1
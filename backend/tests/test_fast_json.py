@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.schemas import (
+    ArticleCreate,
+    ArticleOut,
+    CarteCreate,
+    CarteOut,
+    DictionnaireCreate,
+    HistoireCreate,
+    HistoireOut,
+    PaginatedDictionnaire,
+)
+from app.services import articles as articles_service
+from app.services import cartes as cartes_service
+from app.services import dictionnaire as dict_service
+from app.services import histoires as histoires_service
+from app.utils import response_cache
+
+
+@pytest.fixture
+def client(client):
+    previous = response_cache.get_backend()
+    response_cache.set_backend(None)
+    try:
+        yield client
+    finally:
+        response_cache.set_backend(previous)
+
+
+def _default_body(annotation, content) -> bytes:
+    # What FastAPI renders for response_model=annotation from ORM objects.
+    adapter = TypeAdapter(annotation)
+    value = adapter.validate_python(content, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json", by_alias=True)).body
+
+
+def test_articles_and_cartes_match_default_serialization(client, db_session):
+    a = articles_service.create_article_service(
+        db_session, article_in=ArticleCreate(titre="Lou mistrau « fort »", description=None, date_ajout=date(2024, 5, 1))
+    )
+    articles_service.create_article_service(db_session, article_in=ArticleCreate(titre="Calanques", image_url="https://x/é.png"))
+    articles_service.set_article_image_service(db_session, article_id=a.id, image_data=b"\x89PNG", image_mime="image/png")
+    c = cartes_service.create_carte_service(db_session, carte_in=CarteCreate(titre="Camargue", legende="Étangs"))
+    cartes_service.set_carte_image_service(db_session, carte_id=c.id, image_data=b"\x89PNG", image_mime="image/png")
+    cartes_service.create_carte_service(db_session, carte_in=CarteCreate(titre="Luberon"))
+
+    articles = articles_service.list_articles_service(db_session, skip=0, limit=100)
+    assert client.get("/articles/").content == _default_body(list[ArticleOut], articles)
+    assert [x["imageStored"] for x in client.get("/articles/").json()] == [a.image_stored for a in articles]
+
+    cartes = cartes_service.list_cartes_service(db_session, skip=0, limit=100)
+    assert client.get("/cartes/").content == _default_body(list[CarteOut], cartes)
+
+
+def test_dictionnaire_and_histoires_match_default_serialization(client, db_session):
+    for mot in ("Ail", "Òli", "Çò"):
+        dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais=mot, mots_provencal=f"{mot} 🫒"))
+    histoires_service.create_histoire_service(
+        db_session, histoire_in=HistoireCreate(titre="La Tarasque", typologie="Légende", periode="Moyen Âge")
+    )
+
+    resp = client.get("/dictionnaire/", params={"limit": 2, "sort": "mots_francais"})
+    page = dict_service.list_mots_service(
+        db_session, theme=None, categorie=None, lettre=None, search=None, page=1, limit=2, sort="mots_francais", order="asc"
+    )
+    assert resp.content == _default_body(PaginatedDictionnaire, page)
+    assert "etag" in resp.headers
+
+    histoires = histoires_service.list_histoires_service(db_session, page=1, limit=5)
+    assert client.get("/histoires/").content == _default_body(list[HistoireOut], histoires)
+    assert client.get("/histoires/menu").json() == {
+        "Légende": {"Moyen Âge": [{"id": histoires[0].id, "titre": "La Tarasque", "description_courte": ""}]}
+    }
@@ -0,0 +1,120 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.models import Change
+from app.schemas import ArticleCreate, HistoireCreate
+from app.services import articles as articles_service
+from app.services import feeds as feeds_service
+from app.services import histoires as histoires_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_feeds():
+    feeds_service.invalidate_feeds("articles")
+    feeds_service.invalidate_feeds("histoires")
+
+
+def test_rss_feed_conditional_get(client, db_session):
+    articles_service.create_article_service(db_session, article_in=ArticleCreate(titre="Fête de la lavande"))
+
+    resp = client.get("/feeds/articles.xml", headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/rss+xml")
+    assert "Fête de la lavande" in resp.text
+    etag = resp.headers["etag"]
+
+    resp = client.get("/feeds/articles.xml", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    resp = client.get("/feeds/articles.xml", headers={"If-Modified-Since": resp.headers["last-modified"]})
+    assert resp.status_code == 304
+
+
+def test_article_deletion_advances_last_modified(client, db_session):
+    kept = articles_service.create_article_service(db_session, article_in=ArticleCreate(titre="Santons"))
+    gone = articles_service.create_article_service(db_session, article_in=ArticleCreate(titre="Corrida"))
+    # Written an hour ago: a later deletion falls in another second of Last-Modified
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    for article in (kept, gone):
+        article.updated_at = past
+    db_session.query(Change).update({Change.changed_at: past})
+    db_session.commit()
+
+    first = client.get("/feeds/articles.xml", headers={"Accept-Encoding": "identity"})
+    assert "Corrida" in first.text
+
+    articles_service.delete_article_service(db_session, article_id=gone.id)
+    resp = client.get("/feeds/articles.xml", headers={"If-Modified-Since": first.headers["last-modified"], "Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert "Corrida" not in resp.text and "Santons" in resp.text
+    assert resp.headers["last-modified"] != first.headers["last-modified"]
+
+
+def test_feed_is_regenerated_after_write(client, db_session):
+    etag = client.get("/feeds/histoires.json").headers["etag"]
+
+    histoires_service.create_histoire_service(
+        db_session, histoire_in=HistoireCreate(titre="La Tarasque", typologie="Légende", periode="Moyen Âge")
+    )
+
+    resp = client.get("/feeds/histoires.json", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    doc = resp.json()
+    assert doc["version"] == "https://jsonfeed.org/version/1.1"
+    assert doc["items"][0]["title"] == "La Tarasque"
+    assert doc["items"][0]["url"].endswith(f"/histoire-legendes/{doc['items'][0]['id'].split('-')[1]}")
+    # Built from settings, not from whichever request rendered the cached body
+    assert doc["feed_url"] == f"{get_settings().feeds_url}/histoires.json"
+
+
+def test_histoires_feed_is_identical_across_rebuilds(client, db_session):
+    histoires_service.create_histoire_service(
+        db_session, histoire_in=HistoireCreate(titre="La Tarasque", typologie="Légende", periode="Moyen Âge")
+    )
+    first = client.get("/feeds/histoires.xml", headers={"Accept-Encoding": "identity"})
+    # Another worker, or this one after FEEDS_MAX_AGE_SECONDS: same bytes, so still a 304
+    feeds_service.invalidate_feeds("histoires")
+    resp = client.get("/feeds/histoires.xml", headers={"If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 304
+    assert resp.headers["last-modified"] == first.headers["last-modified"]
+    resp = client.get("/feeds/histoires.xml", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert resp.status_code == 304
+
+
+def test_concurrent_cold_feed_requests_share_one_build_in_async_mode(async_app, monkeypatch):
+    builds = []
+    build = feeds_service._build
+    monkeypatch.setattr(feeds_service, "_build", lambda *args, **kwargs: builds.append(args[1:]) or build(*args, **kwargs))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=async_app), base_url="http://test") as http:
+            return await asyncio.wait_for(asyncio.gather(*(http.get("/feeds/histoires.xml") for _ in range(5))), 10)
+
+    responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({r.headers["etag"] for r in responses}) == 1
+    assert builds == [("histoires", "xml")]
+
+
+def test_feed_served_precompressed(client, db_session):
+    feed = feeds_service.get_feed_service(db_session, resource="articles", fmt="json")
+    assert json.loads(gzip.decompress(feed.body_gzip)) == json.loads(feed.body)
+
+    resp = client.get("/feeds/articles.json", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    # Different bytes from the identity body: not the same strong validator
+    identity = client.get("/feeds/articles.json", headers={"Accept-Encoding": "identity"})
+    assert resp.headers["etag"] == f"W/{identity.headers['etag']}"
+    assert client.get("/feeds/articles.json", headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+def test_unknown_feed_is_404(client):
+    assert client.get("/feeds/cartes.xml").status_code == 404
@@ -0,0 +1,31 @@
+from alembic import command
+from sqlalchemy import create_engine, func, select
+
+import app.database
+import init_app
+from app.database import Base
+from app.models import Dictionnaire
+
+
+def test_warm_database_skips_migrations_and_unchanged_seeds(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'init.db'}", future=True)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        command.stamp(init_app._alembic_config(conn), "head")
+    monkeypatch.setattr(app.database, "engine", engine)
+    try:
+        cold = init_app.main([])
+        assert cold["migrated"] is False
+        assert not any(r["skipped"] for r in cold["seeds"])
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(Dictionnaire)).scalar() > 0
+
+        warm = init_app.main([])
+        assert all(r["skipped"] for r in warm["seeds"])
+        assert set(warm["timings"]) == {"total", "engine", "connexion", "migrations", "seeds"}
+        assert warm["timings"]["seeds"] < cold["timings"]["seeds"]
+
+        forced = init_app.main(["--force-seeds"])
+        assert [(r["skipped"], r["inserted"], r["updated"]) for r in forced["seeds"]] == [(False, 0, 0)] * len(forced["seeds"])
+    finally:
+        engine.dispose()
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import security
+from app.utils.security import VerifiedTokenCache, create_access_token, token_subject
+
+
+def test_verified_tokens_are_cached_until_expiry(monkeypatch):
+    security.TOKEN_CACHE.clear()
+    calls = []
+    decode = security.decode_access_token
+    monkeypatch.setattr(security, "decode_access_token", lambda t: calls.append(t) or decode(t))
+
+    token = create_access_token({"sub": "alice"})
+    assert [token_subject(token) for _ in range(3)] == ["alice"] * 3
+    assert len(calls) == 1
+
+    assert token_subject("not-a-token") is None
+    assert token_subject("not-a-token") is None
+    assert len(calls) == 3  # invalid tokens are never cached
+
+    expired = create_access_token({"sub": "bob"}, expires_delta=timedelta(seconds=-1))
+    assert token_subject(expired) is None
+
+    # A cached entry past its `exp` is dropped, not served
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("t1", "alice", exp=100.0)
+    assert cache.get("t1", now=99.0) == "alice"
+    assert cache.get("t1", now=100.0) is None
+    for i in range(3):
+        cache.put(f"t{i}", "alice", exp=200.0)
+    assert list(cache._entries) == ["t1", "t2"]
+
+
+def test_logout_revokes_the_token():
+    security.TOKEN_CACHE.clear()
+    token = create_access_token({"sub": "alice"})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+
+    assert client.get("/auth/me", headers=headers).json() == {"username": "alice"}
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    resp = client.get("/auth/me", headers=headers)
+    assert resp.status_code == 401
+    assert resp.json()["detail"]["code"] == "auth_invalid"
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {create_access_token({'sub': 'alice'}, timedelta(minutes=5))}"}).status_code == 200
@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+
+import pytest
+
+from app.utils import login_limiter
+from app.utils.login_limiter import DatabaseBackend, LoginPolicy, MemoryBackend, MmapBackend, RedisBackend
+
+POLICY = LoginPolicy(window_seconds=300, max_attempts=3, lockout_seconds=900, base_delay_seconds=1, max_delay_seconds=30)
+KEYS = ("ip:10.0.0.1", "user:alice")
+
+
+@pytest.fixture(params=["memory", "mmap", "postgres", "redis"])
+def limiter(request, tmp_path, db_session):
+    if request.param == "memory":
+        return MemoryBackend(POLICY)
+    if request.param == "mmap":
+        return MmapBackend(POLICY, path=str(tmp_path / "limiter.bin"), slots=256)
+    if request.param == "postgres":
+        return DatabaseBackend(POLICY, engine=db_session.get_bind(), prune_every=2)
+    url = os.getenv("TEST_REDIS_URL")
+    if not url:
+        pytest.skip("TEST_REDIS_URL not set")
+    import redis
+
+    client = redis.Redis.from_url(url)
+    client.flushdb()
+    return RedisBackend(POLICY, client=client)
+
+
+def test_backoff_lockout_and_clear(limiter):
+    now = 1_000_000.0
+    assert limiter.blocked_seconds(KEYS, now) == 0
+
+    limiter.register_failure(KEYS, now)
+    assert limiter.blocked_seconds(KEYS, now) == 2  # 1s delay, rounded up
+    limiter.register_failure(KEYS, now + 2)
+    assert limiter.blocked_seconds(KEYS, now + 2) == 3  # 2s delay
+    limiter.register_failure(KEYS, now + 5)
+    assert limiter.blocked_seconds(KEYS, now + 5) == 901  # lockout
+    assert limiter.blocked_seconds(("user:alice",), now + 5) == 901
+    assert limiter.blocked_seconds(("ip:10.0.0.2",), now + 5) == 0
+
+    limiter.clear(KEYS)
+    assert limiter.blocked_seconds(KEYS, now + 5) == 0
+
+    # Failures older than the window start a new count
+    limiter.register_failure(KEYS, now)
+    limiter.register_failure(KEYS, now + 2)
+    limiter.register_failure(KEYS, now + 400)
+    assert limiter.blocked_seconds(KEYS, now + 400) == 2
+
+
+def test_policy_matches_sql_upsert(db_session):
+    # The UPSERT re-implements the policy in SQL: both must agree step by step
+    policy = LoginPolicy(window_seconds=10, max_attempts=8, lockout_seconds=60, base_delay_seconds=0.5, max_delay_seconds=5)
+    backend = DatabaseBackend(policy, engine=db_session.get_bind())
+    count, first, blocked = 0, 0.0, 0.0
+    for now in (100.0, 100.5, 101.0, 103.0, 104.0, 106.0, 107.0, 108.0, 109.0, 125.0, 126.0):
+        count, first, blocked = policy.after_failure(count, first, blocked, now)
+        backend.register_failure(("k",), now)
+        assert backend.blocked_seconds(("k",), now) == login_limiter.wait_seconds(blocked, now), now
+
+
+def _fail_in_child(path: str, n: int) -> None:
+    backend = MmapBackend(POLICY, path=path, slots=256)
+    for _ in range(n):
+        backend.register_failure(("ip:10.0.0.9",), 1_000_000.0)
+
+
+def test_mmap_state_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "limiter.bin")
+    parent = MmapBackend(POLICY, path=path, slots=256)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_fail_in_child, args=(path, 1)) for _ in range(3)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert parent.blocked_seconds(("ip:10.0.0.9",), 1_000_000.0) == 901  # 3 failures across workers
+    assert parent.size() == 1
+
+
+def test_mmap_table_full_evicts_oldest(tmp_path):
+    backend = MmapBackend(POLICY, path=str(tmp_path / "limiter.bin"), slots=64)
+    for i in range(200):
+        backend.register_failure((f"ip:{i}",), 1_000_000.0 + i)
+    assert backend.size() == 64
+    assert backend.blocked_seconds(("ip:199",), 1_000_199.0) == 2
+
+
+def test_memory_expires_incrementally_and_caps_keys():
+    backend = MemoryBackend(POLICY, max_keys=3)
+    for i in range(5):
+        backend.register_failure((f"ip:{i}",), 1_000_000.0 + i)
+    assert list(backend._state) == ["ip:2", "ip:3", "ip:4"]  # least recently failed evicted
+
+    backend.register_failure(("ip:2",), 1_000_010.0)
+    assert list(backend._state) == ["ip:3", "ip:4", "ip:2"]
+
+    # ip:3 and ip:4 are stale (ttl after their last failure), ip:2 is not yet
+    backend.blocked_seconds(("ip:9",), 1_000_004.0 + POLICY.ttl_seconds + 1)
+    assert list(backend._state) == ["ip:2"]
+
+
+def test_backoff_delay_is_capped_for_long_running_keys():
+    assert POLICY.delay(10_000) == POLICY.max_delay_seconds
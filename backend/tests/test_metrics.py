@@ -0,0 +1,87 @@
+import dataclasses
+import json
+import subprocess
+import sys
+
+import pytest
+
+import app.main
+from app.schemas import ArticleCreate
+from app.services import articles as articles_service
+from app.utils.metrics import Registry
+from app.utils.prometheus import collect, render
+
+
+def _value(text, prefix):
+    line = next(l for l in text.splitlines() if l.startswith(prefix))
+    return float(line.rsplit(" ", 1)[1])
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(app.main, "settings", dataclasses.replace(app.main.settings, metrics_token="scrape-secret"))
+    return {"Authorization": "Bearer scrape-secret"}
+
+
+def test_metrics_requires_the_token(client, metrics_token, monkeypatch):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers=metrics_token).status_code == 200
+
+    monkeypatch.setattr(app.main, "settings", dataclasses.replace(app.main.settings, metrics_token=""))
+    assert client.get("/metrics", headers=metrics_token).status_code == 404
+
+
+def test_metrics_endpoint_exposes_route_metrics(client, db_session, metrics_token):
+    articles_service.create_article_service(db_session, article_in=ArticleCreate(titre="Santons"))
+    before = client.get("/metrics", headers=metrics_token).text
+    sel = 'http_requests_total{method="GET",route="/articles/{article_id}",status="200"}'
+    start = _value(before, sel) if sel in before else 0
+
+    client.get("/articles/1")
+    client.get("/articles/1")
+    client.get("/feeds/articles.xml")
+    client.get("/feeds/articles.xml")
+    client.get("/does-not-exist")
+
+    resp = client.get("/metrics", headers=metrics_token)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert _value(text, sel) == start + 2
+    assert 'route="<unmatched>",status="404"' in text
+    assert 'http_request_duration_seconds_bucket{le="+Inf",method="GET",route="/articles/{article_id}"}' in text
+    assert "# TYPE http_response_size_bytes histogram" in text
+    assert _value(text, "http_requests_in_flight") == 1  # the /metrics request itself
+    assert 'db_pool_checkout_wait_seconds_count{pool="primary"}' in text
+    assert "app_login_limiter_keys 0" in text
+    assert 0 < _value(text, 'app_cache_hit_ratio{cache="feeds"}') < 1
+
+
+def test_snapshots_are_merged_across_workers(tmp_path):
+    # A worker that has exited: its counters still count, its gauges do not.
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    (tmp_path / f"metrics_{dead.pid}.json").write_text(json.dumps({
+        "pid": dead.pid,
+        "metrics": {
+            "jobs_total": {"type": "counter", "help": "Jobs.", "samples": [[{"kind": "a"}, 5]]},
+            "busy": {"type": "gauge", "help": "Busy.", "samples": [[{}, 7]]},
+            "lat": {"type": "histogram", "help": "Latency.", "samples": [[{}, {
+                "buckets": {"0.1": 1, "+Inf": 2}, "sum": 0.5, "count": 2,
+            }]]},
+        },
+    }))
+
+    registry = Registry()
+    registry.counter("jobs_total", "Jobs.", ("kind",)).labels("a").inc(2)
+    registry.gauge("busy", "Busy.").labels().set(1)
+    registry.histogram("lat", "Latency.", buckets=(0.1,)).labels().observe(0.05)
+
+    merged = collect(str(tmp_path), registry)
+    text = render(merged)
+    assert 'jobs_total{kind="a"} 7' in text
+    assert "busy 1" in text
+    assert 'lat_bucket{le="0.1"} 2' in text
+    assert 'lat_bucket{le="+Inf"} 3' in text
+    assert "lat_count 3" in text
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from passlib.context import CryptContext
+
+from app.crud import users as users_crud
+from app.utils import security
+from app.utils.security import PasswordHasherPool, PasswordPoolBusy
+
+
+def test_pool_rejects_when_saturated():
+    pool = PasswordHasherPool(workers=1, max_queue=1)
+    release = threading.Event()
+    results = []
+    # one hash running, one queued behind it
+    threads = [threading.Thread(target=lambda: results.append(pool.run(release.wait, 5))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for _ in range(500):
+        if pool.pending == 2:
+            break
+        time.sleep(0.01)
+
+    with pytest.raises(PasswordPoolBusy):
+        pool.run(lambda: "rejected")
+    assert pool.rejected == 1
+
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == [True, True] and pool.pending == 0
+    assert pool.run(lambda: "ok") == "ok"
+
+
+def test_login_rehashes_outdated_cost_and_503_when_busy(client, db_session, monkeypatch):
+    old = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4).hash("secret")
+    users_crud.create_user(db_session, username="alice", hashed_password=old)
+    db_session.commit()
+    monkeypatch.setattr(
+        security, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=5, bcrypt__min_rounds=5)
+    )
+    resp = client.post("/auth/login", data={"username": "alice", "password": "secret"})
+    assert resp.status_code == 200
+    user = users_crud.get_user_by_username(db_session, username="alice")
+    assert user.password.startswith("$2b$05$") and security.pwd_context.verify("secret", user.password)
+
+    def busy(*args):
+        raise PasswordPoolBusy()
+
+    monkeypatch.setattr(security.PASSWORD_POOL, "submit", busy)
+    resp = client.post("/auth/login", data={"username": "alice", "password": "secret"})
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+    assert resp.json()["detail"]["code"] == "unavailable"
+
+
+def test_login_keeps_the_event_loop_responsive_in_async_mode(async_app, monkeypatch):
+    class SlowContext:
+        # bcrypt stand-in: holds its PASSWORD_POOL thread, never the event loop
+        def hash(self, password):
+            return "hashed:" + password
+
+        def verify_and_update(self, plain, hashed):
+            time.sleep(0.5)
+            return hashed == "hashed:" + plain, None
+
+    monkeypatch.setattr(security, "pwd_context", SlowContext())
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=async_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            assert (await ac.post("/auth/register", json={"username": "alice", "password": "secret"})).status_code < 300
+            start = time.perf_counter()
+            login = asyncio.create_task(ac.post("/auth/login", data={"username": "alice", "password": "secret"}))
+            await asyncio.sleep(0.1)  # the login is now waiting on its hash
+            health = await ac.get("/health")
+            elapsed = time.perf_counter() - start
+            return health, elapsed, login.done(), await login
+
+    health, elapsed, login_done, login = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert health.status_code == 200 and elapsed < 0.4
+    assert not login_done
+    assert login.status_code == 200 and login.json()["access_token"]
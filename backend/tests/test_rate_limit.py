@@ -0,0 +1,67 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes.auth import _client_ip
+from app.utils.rate_limit import THROTTLED, RateLimitMiddleware, TokenBucketLimiter, route_class
+
+
+def test_bucket_refills_and_reports_wait():
+    limiter = TokenBucketLimiter(rate=1.0, burst=3, shards=1)
+    key = ("10.0.0.1", "list")
+    assert [limiter.acquire(key, 1, 100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire(key, 2, 100.0) == 2.0
+    assert limiter.acquire(key, 2, 102.0) == 0.0  # 2 tokens back after 2s
+    assert limiter.acquire(("10.0.0.2", "list"), 3, 102.0) == 0.0  # other clients unaffected
+    assert limiter.size() == 2
+
+    # Idle buckets are full again: dropped (per shard), and the key count is capped
+    assert limiter.acquire(key, 99, 200.0) == 0.0  # costs above the burst are capped
+    assert limiter.size() == 1
+    capped = TokenBucketLimiter(rate=1.0, burst=3, shards=1, max_keys=2)
+    for i in range(5):
+        capped.acquire((f"10.0.0.{i}", "item"), 1, 100.0)
+    assert capped.size() == 2
+
+
+def test_route_classes():
+    assert route_class("/dictionnaire/", b"search=ail&page=1") == "search"
+    assert route_class("/dictionnaire/", b"page=2&search=") == "list"
+    assert route_class("/articles/12/image", b"") == "item"
+    assert route_class("/histoires/menu", b"") == "list"
+    assert route_class("/health", b"") is None
+    assert route_class("/auth/me", b"") is None
+
+
+def test_middleware_returns_429_with_retry_after():
+    api = FastAPI()
+
+    @api.get("/items/")
+    async def items():
+        return []
+
+    @api.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    api.add_middleware(
+        RateLimitMiddleware,
+        limiter=TokenBucketLimiter(rate=0.1, burst=6),
+        client_ip=_client_ip,
+        costs={"search": 3},
+    )
+    before = {k: THROTTLED.labels(k).value for k in ("search", "item")}
+    client = TestClient(api)
+
+    assert client.get("/items/", params={"search": "a"}).status_code == 200
+    assert client.get("/items/", params={"search": "b"}).status_code == 200
+    resp = client.get("/items/", params={"search": "c"})
+    assert resp.status_code == 429
+    assert resp.json()["detail"]["code"] == "rate_limited"
+    assert 1 <= int(resp.headers["retry-after"]) <= 30
+
+    # Route classes have their own buckets; writes are not throttled
+    assert [client.get("/items/1").status_code for _ in range(7)] == [200] * 6 + [429]
+    assert client.post("/items/").status_code == 405
+
+    assert THROTTLED.labels("search").value - before["search"] == 1
+    assert THROTTLED.labels("item").value - before["item"] == 1
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app import database
+from app.database import READ_PIN_COOKIE, Base, ReplicaSet, ReadYourWritesMiddleware, get_read_db
+
+
+def _request(cookies: str = "") -> Request:
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def _read_db_bind(request: Request, primary="primary"):
+    async def run():
+        gen = get_read_db(request, primary)
+        db = await gen.__anext__()
+        try:
+            return db if db == "primary" else str(db.bind.engine.url)
+        finally:
+            await gen.aclose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def replica_set(tmp_path, monkeypatch):
+    urls = (f"sqlite:///{tmp_path / 'r1.db'}", f"sqlite:///{tmp_path / 'r2.db'}")
+    rs = ReplicaSet(urls, selection="round_robin", retry_seconds=30, use_async=False)
+    monkeypatch.setattr(database, "replicas", rs)
+    return rs
+
+
+def test_round_robin_and_least_connections(replica_set):
+    first = [replica_set.candidates(0)[0].url for _ in range(4)]
+    assert first[0] != first[1] and first[0] == first[2]
+
+    replica_set.selection = "least_connections"
+    conn = replica_set.replicas[0].engine.connect()
+    try:
+        assert replica_set.candidates(0)[0] is replica_set.replicas[1]
+    finally:
+        conn.close()
+
+
+def test_reads_use_replica_and_fall_back_when_down(replica_set, tmp_path):
+    assert _read_db_bind(_request()).endswith((".db"))
+
+    # Make every replica unreachable: both are marked down and the primary is used
+    for r in replica_set.replicas:
+        r.engine.dispose()
+        r.engine = database.create_engine(f"sqlite:///{tmp_path / 'missing' / 'x.db'}")
+    assert _read_db_bind(_request()) == "primary"
+    assert all(r.down_until > time.monotonic() for r in replica_set.replicas)
+    assert replica_set.candidates(time.monotonic()) == []
+
+
+def test_read_pin_cookie_routes_to_primary(replica_set):
+    assert _read_db_bind(_request(f"{READ_PIN_COOKIE}={time.time() + 5}")) == "primary"
+    assert _read_db_bind(_request(f"{READ_PIN_COOKIE}={time.time() - 5}")) != "primary"
+
+
+def test_middleware_sets_pin_cookie_after_successful_write(replica_set):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    mw = ReadYourWritesMiddleware(app, pin_seconds=10)
+    asyncio.run(mw({"type": "http", "method": "POST", "path": "/articles/"}, None, send))
+    cookies = [v.decode() for k, v in sent[0]["headers"] if k == b"set-cookie"]
+    assert cookies and cookies[0].startswith(f"{READ_PIN_COOKIE}=")
+
+    sent.clear()
+    asyncio.run(mw({"type": "http", "method": "GET", "path": "/articles/"}, None, send))
+    assert not [k for k, _ in sent[0]["headers"] if k == b"set-cookie"]
+
+    sent.clear()
+    for path in ("/batch", "/auth/login", "/auth/refresh"):
+        asyncio.run(mw({"type": "http", "method": "POST", "path": path}, None, send))
+    assert not [k for m in sent if m["type"] == "http.response.start" for k, _ in m["headers"] if k == b"set-cookie"]
+
+
+def test_batch_does_not_pin_reads_to_primary(replica_set, client):
+    for r in replica_set.replicas:
+        Base.metadata.create_all(r.engine)
+    resp = client.post("/batch", json={"requests": [{"id": "themes", "path": "/dictionnaire/themes"}]})
+    assert resp.status_code == 200 and resp.json()["responses"][0]["status"] == 200
+    assert READ_PIN_COOKIE not in resp.headers.get("set-cookie", "")
+    assert client.cookies.get(READ_PIN_COOKIE) is None
@@ -0,0 +1,48 @@
+import pytest
+
+from app.crud import users as users_crud
+from app.models import RefreshToken
+from app.utils import security
+
+
+@pytest.fixture
+def alice(db_session):
+    users_crud.create_user(db_session, username="alice", hashed_password=security.pwd_context.hash("secret"))
+    db_session.commit()
+
+
+def test_refresh_rotates_without_password(alice, client, db_session, monkeypatch):
+    resp = client.post("/auth/login", data={"username": "alice", "password": "secret"})
+    assert resp.status_code == 200 and "refresh_token" not in resp.json()
+    first = client.cookies.get("refresh_token")
+    assert first and "HttpOnly" in resp.headers["set-cookie"]
+    assert db_session.query(RefreshToken).one().token_hash == security.hash_refresh_token(first)
+
+    def no_bcrypt(*args):
+        raise AssertionError("refresh must not verify the password")
+
+    monkeypatch.setattr(security.PASSWORD_POOL, "submit", no_bcrypt)
+    resp = client.post("/auth/refresh")
+    assert resp.status_code == 200
+    second = client.cookies.get("refresh_token")
+    assert second != first
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {resp.json()['access_token']}"}).status_code == 200
+
+    # Replaying the rotated token revokes the whole session, current token included
+    client.cookies.set("refresh_token", first, path="/auth")
+    resp = client.post("/auth/refresh")
+    assert resp.status_code == 401 and resp.json()["detail"]["code"] == "auth_invalid"
+    client.cookies.clear()
+    client.cookies.set("refresh_token", second, path="/auth")
+    assert client.post("/auth/refresh").status_code == 401
+
+    client.cookies.clear()
+    assert client.post("/auth/refresh").status_code == 401
+
+
+def test_logout_revokes_refresh_token(alice, client):
+    client.post("/auth/login", data={"username": "alice", "password": "secret"})
+    token = client.cookies.get("refresh_token")
+    assert client.post("/auth/logout").status_code == 200
+    client.cookies.set("refresh_token", token, path="/auth")
+    assert client.post("/auth/refresh").status_code == 401
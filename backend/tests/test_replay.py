@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import httpx
+
+from app.schemas import DictionnaireCreate
+from app.services import dictionnaire as dict_service
+from benchmarks import replay
+
+LOG = """\
+2024-05-01 12:00:00,000 INFO:     10.0.0.1:51000 - "GET /dictionnaire/?search=ail&page=1 HTTP/1.1" 200 OK
+2024-05-01 12:00:00,250 INFO:     10.0.0.2:51001 - "GET /histoires/menu HTTP/1.1" 200 OK
+2024-05-01 12:00:00,500 INFO:     10.0.0.1:51000 - "GET /articles/12/image?access_token=abc HTTP/1.1" 404 Not Found
+2024-05-01 12:00:00,750 INFO:     10.0.0.3:51002 - "POST /auth/login HTTP/1.1" 200 OK
+INFO:     Application startup complete.
+10.0.0.4 - - [01/May/2024:12:00:01 +0000] "GET /dictionnaire/themes HTTP/1.1" 200 57 "-" "Mozilla/5.0"
+"""
+
+
+def test_logs_are_parsed_anonymized_and_retimed(tmp_path):
+    entries = replay.parse_logs(LOG.splitlines(), salt="s")
+    assert [(e.method, e.route, e.status) for e in entries] == [
+        ("GET", "/dictionnaire/", 200),
+        ("GET", "/histoires/menu", 200),
+        ("GET", "/articles/{id}/image", 404),
+        ("POST", "/auth/login", 200),
+        ("GET", "/dictionnaire/themes", 200),
+    ]
+    assert [e.offset for e in entries] == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert entries[2].target == "/articles/12/image?access_token=redacted"
+    assert entries[0].target == "/dictionnaire/?search=ail&page=1"
+    assert entries[0].client == entries[2].client != entries[1].client
+    assert not any("10.0.0" in json.dumps(e.__dict__) for e in entries)
+
+    # Without timestamps: re-timed at --rate
+    bare = [line.split(" INFO:", 1)[1] for line in LOG.splitlines()[:3]]
+    assert [e.offset for e in replay.parse_logs(bare, rate=4)] == [0.0, 0.25, 0.5]
+
+    log = tmp_path / "access.log"
+    log.write_text(LOG)
+    trace = tmp_path / "trace.jsonl"
+    replay.main(["prepare", str(log), "-o", str(trace), "--salt", "s"])
+    assert replay.read_trace(trace) == entries
+
+    # Rotated logs given newest first (access.log before access.log.1): timed from the oldest line
+    older = tmp_path / "access.log.1"
+    older.write_text(LOG)
+    log.write_text(LOG.replace("2024-05-01 12:00:00", "2024-05-01 12:00:10").replace("12:00:01 +0000", "12:00:11 +0000"))
+    rotated = replay.load([log, older], rate=10, salt="s")
+    assert [e.offset for e in rotated] == [0.0, 0.25, 0.5, 0.75, 1.0, 10.0, 10.25, 10.5, 10.75, 11.0]
+
+    # Default salt: random per run, so the ids are not sha256(ip) digests anyone can recompute
+    assert replay.parse_logs(LOG.splitlines())[0].client != replay.parse_logs(LOG.splitlines())[0].client
+
+
+def test_replay_reports_per_route(client, db_session):
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail", theme="Cuisine"))
+    entries = list(replay.parse_logs(LOG.splitlines()))
+
+    async def run():
+        # client.app: the app with get_db overridden, driven here through httpx's ASGI transport
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=client.app), base_url="http://replay") as http:
+            return await replay.replay(http, entries, speed=50, concurrency=4)
+
+    report = asyncio.run(run())
+
+    assert report["requests"] == 4  # the POST is not replayed
+    assert set(report["routes"]) == {"/dictionnaire/", "/histoires/menu", "/articles/{id}/image", "/dictionnaire/themes"}
+    image = report["routes"]["/articles/{id}/image"]
+    assert (image["statuses"], image["error_rate"], image["status_mismatches"]) == ({"404": 1}, 0.0, 0)
+    assert report["routes"]["/dictionnaire/"]["statuses"] == {"200": 1}
+    assert report["duration_seconds"] >= 1.0 / 50
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import database
+from app.database import READ_PIN_COOKIE, Base, ReplicaSet
+from app.models import Dictionnaire
+from app.routes import dictionnaire as dictionnaire_routes
+from app.schemas import DictionnaireCreate
+from app.services import dictionnaire as dict_service
+from app.utils import response_cache
+from app.utils.response_cache import MemoryBackend, RedisBackend
+from app.utils.security import create_access_token
+
+
+class LocalRedis:
+    """Local stand-in for a Redis server: the subset of the redis-py client used by RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value, expires_at = self.data.get(key, (None, None))
+            return None if expires_at is not None and expires_at <= time.monotonic() else value
+
+    def mget(self, keys):
+        return [self.get(k) for k in keys]
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def incr(self, key):
+        with self.lock:
+            value = int(self.data.get(key, (0, None))[0] or 0) + 1
+            self.data[key] = (str(value).encode(), None)
+            return value
+
+    def pipeline(self, transaction=True):
+        redis, calls = self, []
+
+        class Pipeline:
+            def incr(self, key):
+                calls.append(lambda: redis.incr(key))
+
+            def set(self, key, value, ex=None):
+                calls.append(lambda: redis.set(key, value, ex=ex))
+
+            def execute(self):
+                return [call() for call in calls]
+
+        return Pipeline()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def client(request, client):
+    backend = MemoryBackend(max_bytes=1 << 20) if request.param == "memory" else RedisBackend(LocalRedis())
+    previous = response_cache.get_backend()
+    response_cache.set_backend(backend)
+    try:
+        yield client
+    finally:
+        response_cache.set_backend(previous)
+
+
+def test_hit_skips_the_endpoint_until_a_write_invalidates(client, db_session, monkeypatch):
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail", theme="Cuisine"))
+
+    first = client.get("/dictionnaire/themes")
+    assert (first.status_code, first.headers["x-cache"], first.json()) == (200, "MISS", ["Cuisine"])
+
+    calls = []
+    original = dict_service.list_themes_service
+    monkeypatch.setattr(dictionnaire_routes.dict_service, "list_themes_service", lambda db: calls.append(1) or original(db))
+
+    hit = client.get("/dictionnaire/themes")
+    assert (hit.headers["x-cache"], hit.json(), hit.headers["etag"]) == ("HIT", ["Cuisine"], first.headers["etag"])
+    assert calls == []
+
+    token = create_access_token({"sub": "editor"})
+    resp = client.post("/dictionnaire/", json={"motsFrancais": "Olive", "theme": "Nature"}, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+
+    after = client.get("/dictionnaire/themes")
+    assert after.headers["x-cache"] == "MISS"
+    assert sorted(after.json()) == ["Cuisine", "Nature"]
+    assert calls == [1]
+
+
+def test_query_string_is_normalized_and_if_none_match_is_honoured(client, db_session):
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail"))
+
+    first = client.get("/dictionnaire/?page=1&limit=20")
+    assert first.headers["x-cache"] == "MISS"
+    assert client.get("/dictionnaire/?limit=20&page=1").headers["x-cache"] == "HIT"
+
+    resp = client.get("/dictionnaire/?limit=20&page=1", headers={"If-None-Match": first.headers["etag"]})
+    assert (resp.status_code, resp.headers["x-cache"], resp.headers["etag"]) == (304, "HIT", first.headers["etag"])
+
+
+def test_errors_are_not_cached(client):
+    assert client.get("/dictionnaire/?sort=nope").status_code == 400
+    assert client.get("/dictionnaire/?sort=nope").headers["x-cache"] == "MISS"
+
+
+def test_memory_backend_evicts_least_recently_used_within_byte_budget():
+    backend = MemoryBackend(max_bytes=250)
+    for name in ("a", "b", "c"):
+        key, _ = backend.lookup(name, ("t",))
+        backend.store(key, b"x" * 100, ttl=60)
+    assert backend.size_bytes == 200  # "a" was evicted to make room for "c"
+    assert backend.lookup("a", ("t",))[1] is None
+    assert backend.lookup("c", ("t",))[1] is not None
+
+    key, _ = backend.lookup("d", ("t",))
+    backend.store(key, b"y", ttl=0)  # already expired
+    assert backend.lookup("d", ("t",))[1] is None
+
+    backend.bump(("t",))
+    assert backend.lookup("c", ("t",))[1] is None
+
+
+def test_lagging_replica_reads_are_not_cached_after_a_write(client, db_session, tmp_path, monkeypatch):
+    # The replica has not replayed the write below yet: it only knows "Cuisine"
+    replica_set = ReplicaSet((f"sqlite:///{tmp_path / 'replica.db'}",), selection="round_robin", retry_seconds=30, use_async=False)
+    engine = replica_set.replicas[0].engine
+    Base.metadata.create_all(engine)
+    with Session(engine) as replica_db:
+        replica_db.add(Dictionnaire(mots_francais="Ail", theme="Cuisine"))
+        replica_db.commit()
+    monkeypatch.setattr(database, "replicas", replica_set)
+    dict_service.create_mot_service(db_session, mot_in=DictionnaireCreate(mots_francais="Ail", theme="Cuisine"))
+
+    token = create_access_token({"sub": "editor"})
+    resp = client.post("/dictionnaire/", json={"motsFrancais": "Olive", "theme": "Nature"}, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 201
+    pin = client.cookies.get(READ_PIN_COOKIE)
+    assert pin
+
+    # Another client reads from the lagging replica: served, but not stored
+    client.cookies.clear()
+    stale = client.get("/dictionnaire/themes")
+    assert (stale.json(), stale.headers["x-cache"]) == (["Cuisine"], "MISS")
+
+    # The writer, pinned to the primary, sees its write
+    client.cookies.set(READ_PIN_COOKIE, pin)
+    fresh = client.get("/dictionnaire/themes")
+    assert sorted(fresh.json()) == ["Cuisine", "Nature"]
+    assert fresh.headers["x-cache"] == "MISS"
+    engine.dispose()
+
+
+def test_backends_report_recent_bumps():
+    for backend in (MemoryBackend(max_bytes=1 << 10), RedisBackend(LocalRedis())):
+        assert not backend.bumped_within(("t",), 60)
+        backend.bump(("t",))
+        assert backend.bumped_within(("t", "u"), 60)
+        assert not backend.bumped_within(("u",), 60)
+        assert not backend.bumped_within(("t",), 0)
@@ -0,0 +1,73 @@
+import dataclasses
+import json
+
+from sqlalchemy import create_engine, func, select
+
+from app.database import Base
+from app.models import Article, Dictionnaire, Revision
+from seeds import loader
+
+
+def _engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}", future=True)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _count(engine, model):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model)).scalar()
+
+
+def _revision(engine, resource):
+    with engine.connect() as conn:
+        return conn.execute(select(Revision.revision).where(Revision.resource == resource)).scalar()
+
+
+def test_all_sources_load_once_and_rerun_is_a_noop(tmp_path):
+    engine = _engine(tmp_path)
+    try:
+        first = {r["source"]: r for r in loader.load_all(engine)}
+        assert set(first) == set(loader.SOURCES)
+        assert first["dictionnaire"]["rows"] == first["dictionnaire"]["inserted"] + 1  # one duplicate line
+        assert _count(engine, Dictionnaire) == first["dictionnaire"]["inserted"]
+        assert _count(engine, Article) == first["articles"]["inserted"] == 2
+        assert all(r["rows_per_second"] for r in first.values())
+
+        again = loader.load_all(engine, force=True)
+        assert [(r["inserted"], r["updated"]) for r in again] == [(0, 0)] * len(loader.SOURCES)
+        assert not any(r["skipped"] for r in again)
+        # Unchanged files (same checksum): not even staged
+        assert all(r["skipped"] for r in loader.load_all(engine))
+        assert _count(engine, Dictionnaire) == first["dictionnaire"]["inserted"]
+        assert _revision(engine, "dictionnaire") == 1  # nothing changed: caches stay valid
+    finally:
+        engine.dispose()
+
+
+def test_changed_rows_are_updated_on_their_natural_key(tmp_path):
+    engine = _engine(tmp_path)
+    path = tmp_path / "articles.jsonl"
+    rows = [
+        {"titre": "A", "description": "un"},
+        {"titre": "B", "description": "deux"},
+        {"titre": "A", "description": "doublon ignoré"},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    source = dataclasses.replace(loader.SOURCES["articles"], path=path)
+    try:
+        report = loader.load_source(engine, source, batch_size=2)
+        assert (report["rows"], report["inserted"], report["updated"]) == (3, 2, 0)
+
+        rows[1]["description"] = "deux bis"
+        rows.append({"titre": "C"})
+        path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+        report = loader.load_source(engine, source, batch_size=2)
+        assert (report["inserted"], report["updated"]) == (1, 1)
+
+        with engine.connect() as conn:
+            found = dict(conn.execute(select(Article.titre, Article.description).order_by(Article.titre)).all())
+        assert found == {"A": "un", "B": "deux bis", "C": None}
+        assert _revision(engine, "articles") == 2
+    finally:
+        engine.dispose()
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.services import slow_queries as slow_queries_service
+from app.utils.security import create_access_token
+from app.utils.slow_queries import SlowQueryLog, fingerprint, redact_parameters
+
+
+def test_fingerprint_ignores_literals_and_in_list_sizes():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == fingerprint("select *  from t where id in (?)")
+    assert fingerprint("SELECT * FROM t WHERE a = 'x' AND b = 3") == fingerprint("SELECT * FROM t WHERE a = %(a)s AND b = %(b)s")
+    assert fingerprint("SELECT a FROM t") != fingerprint("SELECT b FROM t")
+
+
+def test_parameters_are_redacted():
+    assert redact_parameters({"mot": "secret", "id": 3, "flag": None}) == {"mot": "<str:6>", "id": "<int>", "flag": None}
+    assert redact_parameters(("secret",)) == ["<str:6>"]
+    assert redact_parameters([("a",), ("b",)], executemany=True) == "<2 parameter sets>"
+
+
+def test_slow_statements_are_stored_with_plan(tmp_path):
+    import app.models  # noqa: F401
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}", future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, future=True)
+
+    def store(entry):
+        with Session() as db:
+            slow_queries_service.record_slow_query_service(db, entry=entry, keep=2)
+
+    log = SlowQueryLog(threshold_ms=0, store=store)
+    log.install()
+    try:
+        with engine.connect() as conn:
+            for titre in ("Calissons", "Tapenade", "Pistou"):
+                conn.execute(text("SELECT id FROM articles WHERE titre = :titre"), {"titre": titre})
+        log.flush()
+    finally:
+        log.uninstall()
+
+    with Session() as db:
+        top = slow_queries_service.top_slow_queries_service(db, limit=10)
+    assert len(top) == 1  # same shape; only the last 2 entries are kept
+    stat = top[0]
+    assert stat["calls"] == 2
+    assert stat["parameters"] == ["<str:6>"]
+    assert any("articles" in str(step) for step in stat["plan"])
+    engine.dispose()
+
+
+def test_admin_lists_top_offenders_by_total_time(client, db_session):
+    now = datetime.now(timezone.utc)
+    for statement, duration in (("SELECT a", 300.0), ("SELECT b", 250.0), ("SELECT b", 250.0)):
+        slow_queries_service.record_slow_query_service(
+            db_session,
+            entry={
+                "fingerprint": fingerprint(statement),
+                "statement": statement,
+                "parameters": "[]",
+                "duration_ms": duration,
+                "plan": '[{"Plan": {"Node Type": "Seq Scan"}}]',
+                "path": "/dictionnaire/",
+                "captured_at": now,
+            },
+            keep=100,
+        )
+
+    assert client.get("/admin/slow-queries").status_code == 401
+
+    token = create_access_token({"sub": "editor"})
+    resp = client.get("/admin/slow-queries?limit=5", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [(r["statement"], r["calls"], r["totalMs"]) for r in body] == [("SELECT b", 2, 500.0), ("SELECT a", 1, 300.0)]
+    assert body[0]["plan"][0]["Plan"]["Node Type"] == "Seq Scan"
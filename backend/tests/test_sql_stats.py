@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.schemas import ArticleCreate
+from app.services import articles as articles_service
+from app.utils.sql_stats import QueryBudgetExceeded, SqlTimingMiddleware, query_budget
+
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+')
+
+
+def _article(db, n):
+    return articles_service.create_article_service(
+        db, article_in=ArticleCreate(titre=f"Article {n}")
+    )
+
+
+def test_server_timing_counts_queries_run_in_the_threadpool(client, db_session):
+    _article(db_session, 1)
+
+    resp = client.get("/articles/?skip=0&limit=20")
+    assert resp.status_code == 200
+    match = SERVER_TIMING.fullmatch(resp.headers["server-timing"])
+    assert match and int(match.group(1)) >= 1
+
+
+def test_query_budget_fails_on_per_row_queries(db_session):
+    ids = [_article(db_session, n).id for n in range(3)]
+    db_session.expire_all()
+
+    with query_budget(1) as stats:
+        articles_service.list_articles_service(db_session, skip=0, limit=20)
+    assert stats.count == 1
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(2):
+            for article_id in ids:  # one SELECT per row
+                db_session.expire_all()
+                articles_service.get_article_service(db_session, article_id=article_id)
+
+
+def test_queries_in_async_run_sync_are_counted(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}", poolclass=NullPool)
+        try:
+            with query_budget(5) as stats:
+                async with engine.connect() as conn:
+                    await conn.run_sync(lambda c: c.execute(text("SELECT 1")))
+                    await conn.execute(text("SELECT 2"))
+            return stats.count
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == 2
+
+
+def _n_plus_one_app(db_session, **middleware_kwargs):
+    mini = FastAPI()
+
+    @mini.get("/loop")
+    def loop():
+        for i in range(4):
+            db_session.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    mini.add_middleware(SqlTimingMiddleware, **middleware_kwargs)
+    return TestClient(mini)
+
+
+def test_repeated_statement_is_logged_as_possible_n_plus_one(db_session, caplog):
+    client = _n_plus_one_app(db_session, budget=3, repeat_threshold=4)
+    with caplog.at_level(logging.INFO, logger="app.utils.sql_stats"):
+        resp = client.get("/loop")
+
+    assert resp.status_code == 200
+    assert SERVER_TIMING.fullmatch(resp.headers["server-timing"]).group(1) == "4"
+    request_log = next(r for r in caplog.records if r.levelno == logging.INFO)
+    assert (request_log.db_queries, request_log.http_path, request_log.http_status) == (4, "/loop", 200)
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert any("ran 4 queries (budget 3)" in m for m in warnings)
+    assert any("Possible N+1" in m and "executed 4 times" in m for m in warnings)
+
+
+def test_strict_budget_fails_the_request(db_session):
+    client = _n_plus_one_app(db_session, budget=3, strict=True)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/loop")